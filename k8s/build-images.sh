@@ -20,6 +20,9 @@ docker build -t career-advisor/conversations-service:latest -f microservices/ser
 echo "📦 Building prompts-service..."
 docker build -t career-advisor/prompts-service:latest -f microservices/services/prompts-service/Dockerfile .
 
+echo "📦 Building llm-service..."
+docker build -t career-advisor/llm-service:latest -f microservices/services/llm-service/Dockerfile .
+
 echo "✅ All Docker images built successfully!"
 echo ""
 echo "📋 Built images:"
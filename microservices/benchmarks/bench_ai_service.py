@@ -0,0 +1,110 @@
+"""
+Load benchmark for conversations-service AIService against a local fake LLM.
+
+Fires N concurrent get_career_advice calls at increasing concurrency levels and
+reports wall time and throughput. With the async client the wall time stays
+close to a single round-trip; the ``--blocking`` baseline reproduces the old
+synchronous OpenAI client, where every call queues behind the previous one.
+
+Usage:
+    python bench_ai_service.py --latency 0.5 --concurrency 1 10 50 100
+    python bench_ai_service.py --latency 0.5 --concurrency 1 5 10 --blocking
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../shared"))
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "../services/conversations-service/src")
+)
+
+from openai import AsyncOpenAI, OpenAI
+
+from career_prompts import build_career_prompt
+from concurrency import AdaptiveConcurrencyLimiter
+from fake_llm_server import FakeLLMServer
+from services.ai_service import AIService
+
+PROFILE = {
+    "skills": ["Python", "FastAPI", "PostgreSQL"],
+    "years_experience": 3,
+    "career_goals": "Become a tech lead",
+}
+
+
+class BlockingAIService(AIService):
+    """Baseline: the pre-async implementation calling a sync client in a coroutine."""
+
+    def __init__(self, base_url: str):
+        super().__init__(AsyncOpenAI(api_key="fake", base_url=base_url))
+        self.sync_client = OpenAI(api_key="fake", base_url=base_url)
+
+    async def get_career_advice(self, user_profile, question=None):
+        response = self.sync_client.chat.completions.create(
+            model="fake-model",
+            messages=[
+                {"role": "user", "content": build_career_prompt(user_profile, question)}
+            ],
+        )
+        return {"success": True, "response": response.choices[0].message.content}
+
+
+async def run_level(service: AIService, concurrency: int) -> dict:
+    latencies = []
+
+    async def one_call(i: int) -> None:
+        start = time.perf_counter()
+        result = await service.get_career_advice(PROFILE, f"Question {i}")
+        latencies.append(time.perf_counter() - start)
+        assert result["success"], result
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_call(i) for i in range(concurrency)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "wall": wall,
+        "throughput": concurrency / wall,
+        "p50": statistics.median(latencies),
+        "p95": latencies[max(0, int(len(latencies) * 0.95) - 1)],
+    }
+
+
+async def main(args) -> None:
+    with FakeLLMServer(port=args.port, latency=args.latency) as server:
+        if args.blocking:
+            service = BlockingAIService(server.base_url)
+        else:
+            # No adaptive limit, so every level reaches the fake provider at once
+            limit = max(args.concurrency)
+            service = AIService(
+                AsyncOpenAI(api_key="fake", base_url=server.base_url),
+                limiter=AdaptiveConcurrencyLimiter(initial_limit=limit, max_limit=limit),
+            )
+
+        mode = "blocking (sync client)" if args.blocking else "async client"
+        print(f"AIService {mode}, fake LLM latency {args.latency:.2f}s")
+        print(f"{'concurrency':>11} {'wall s':>8} {'req/s':>8} {'p50 s':>8} {'p95 s':>8}")
+        for level in args.concurrency:
+            r = await run_level(service, level)
+            print(
+                f"{r['concurrency']:>11} {r['wall']:>8.2f} {r['throughput']:>8.1f}"
+                f" {r['p50']:>8.2f} {r['p95']:>8.2f}"
+            )
+        print(f"max in-flight at fake server: {server.app.state.max_in_flight}")
+        await service.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--blocking", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""
+Sustained overload of AIService against a fake provider with limited capacity,
+with and without the adaptive concurrency limit.
+
+N closed-loop callers ask for career advice back to back for a fixed time.
+The fake provider serves up to --capacity requests at once (each one in flight
+slowing the others down) and answers the rest with 429. Without a limit every
+caller hits the provider and its retries pile onto the overload; with the
+adaptive limit the pod settles near the provider's capacity and the excess
+waits in the limiter's queue instead.
+
+Usage:
+    python bench_concurrency_limiter.py --callers 100 --capacity 20 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../shared"))
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "../services/conversations-service/src")
+)
+
+from openai import AsyncOpenAI
+
+from concurrency import AdaptiveConcurrencyLimiter
+from fake_llm_server import FakeLLMServer
+from services.ai_service import AIService
+
+PROFILE = {"skills": ["Python"], "years_experience": 3, "career_goals": "Tech lead"}
+
+
+async def run(service: AIService, callers: int, duration: float) -> dict:
+    latencies = []
+    failures = 0
+    deadline = time.perf_counter() + duration
+
+    async def caller(i: int) -> None:
+        nonlocal failures
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            result = await service.get_career_advice(PROFILE, f"Question {i}")
+            if result["success"]:
+                latencies.append(time.perf_counter() - start)
+            else:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(callers)))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "ok/s": len(latencies) / wall,
+        "failed": failures,
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p95": latencies[int(len(latencies) * 0.95)] if latencies else float("nan"),
+    }
+
+
+async def main(args) -> None:
+    modes = {
+        "no limit": AdaptiveConcurrencyLimiter(
+            initial_limit=args.callers, max_limit=args.callers, backoff_ratio=1.0
+        ),
+        "adaptive": AdaptiveConcurrencyLimiter(
+            initial_limit=args.initial_limit,
+            max_limit=args.callers,
+            max_queue=args.callers,
+        ),
+    }
+    print(
+        f"{args.callers} callers for {args.duration:.0f}s, provider capacity "
+        f"{args.capacity}, latency {args.latency:.2f}s"
+    )
+    print(
+        f"{'mode':>9} {'ok/s':>7} {'failed':>7} {'p50 s':>7} {'p95 s':>7}"
+        f" {'429s':>6} {'peak':>5} {'limit':>6}"
+    )
+    for port, (mode, limiter) in enumerate(modes.items(), start=args.port):
+        with FakeLLMServer(
+            port=port, latency=args.latency, capacity=args.capacity
+        ) as server:
+            service = AIService(
+                AsyncOpenAI(api_key="fake", base_url=server.base_url),
+                limiter=limiter,
+            )
+            r = await run(service, args.callers, args.duration)
+            await service.close()
+            print(
+                f"{mode:>9} {r['ok/s']:>7.1f} {r['failed']:>7} {r['p50']:>7.2f}"
+                f" {r['p95']:>7.2f} {server.app.state.rate_limited:>6}"
+                f" {server.app.state.max_in_flight:>5} {limiter.stats()['limit']:>6}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9110)
+    parser.add_argument("--callers", type=int, default=100)
+    parser.add_argument("--capacity", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--initial-limit", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
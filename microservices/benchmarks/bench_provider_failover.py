@@ -0,0 +1,121 @@
+"""
+LLM gateway routing across fake providers with different latencies, through
+an outage of the fastest one.
+
+N closed-loop callers send chat completions through LLMGateway for a fixed
+time, split into three phases: all providers up, the fastest provider
+answering 503, and the fastest provider back. Compared with pinning every
+request to one provider (the single xai_* provider before the registry),
+latency-based routing keeps the traffic on the fastest healthy provider
+and fails over to the next one during the outage.
+
+Usage:
+    python bench_provider_failover.py --callers 20 --phase 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "../services/llm-service/src"))
+
+from fake_llm_server import FakeLLMServer
+from gateway import LLMGateway, NoProviderAvailable
+from providers import Provider, ProviderRegistry
+
+# name -> latency in seconds; "fast" goes down in the second phase
+LATENCIES = {"medium": 0.15, "fast": 0.05, "slow": 0.4}
+PHASES = ("all up", "fast down", "fast back")
+
+
+async def run_phase(gateway: LLMGateway, callers: int, duration: float) -> dict:
+    latencies = []
+    served = {name: 0 for name in LATENCIES}
+    failures = 0
+    deadline = time.perf_counter() + duration
+
+    async def caller() -> None:
+        nonlocal failures
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await gateway.chat_completion(
+                    {"messages": [{"role": "user", "content": "Next step?"}]}
+                )
+            except NoProviderAvailable:
+                response = None
+            if response is None or response.status_code != 200:
+                failures += 1
+                await asyncio.sleep(0.05)
+                continue
+            latencies.append(time.perf_counter() - start)
+            served[response.json()["model"].removesuffix("-model")] += 1
+
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    latencies.sort()
+    return {
+        "ok/s": len(latencies) / duration,
+        "failed": failures,
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p95": latencies[int(len(latencies) * 0.95)] if latencies else float("nan"),
+        "served": served,
+    }
+
+
+async def main(args) -> None:
+    servers = {
+        name: FakeLLMServer(port=args.port + i, latency=latency, jitter=latency / 5)
+        for i, (name, latency) in enumerate(LATENCIES.items())
+    }
+    for server in servers.values():
+        server.__enter__()
+    try:
+        print(
+            f"{args.callers} callers, {args.phase:.0f}s per phase, providers "
+            + ", ".join(f"{n} {l * 1000:.0f} ms" for n, l in LATENCIES.items())
+        )
+        print(
+            f"{'mode':>8} {'phase':>10} {'ok/s':>7} {'failed':>7} {'p50 s':>7}"
+            f" {'p95 s':>7}  served by"
+        )
+        for mode in ("pinned", "routed"):
+            names = ["fast"] if mode == "pinned" else list(LATENCIES)
+            providers = [
+                Provider.from_config(
+                    {
+                        "name": name,
+                        "base_url": servers[name].base_url,
+                        "model": f"{name}-model",
+                    }
+                )
+                for name in names
+            ]
+            for provider in providers:
+                # Shorter than a phase, so the recovery shows in the last one
+                provider.circuit_breaker.recovery_timeout = args.recovery_timeout
+            gateway = LLMGateway(registry=ProviderRegistry(providers))
+            for phase in PHASES:
+                servers["fast"].app.state.down = phase == "fast down"
+                r = await run_phase(gateway, args.callers, args.phase)
+                served = ", ".join(f"{n} {c}" for n, c in r["served"].items() if c)
+                print(
+                    f"{mode:>8} {phase:>10} {r['ok/s']:>7.1f} {r['failed']:>7}"
+                    f" {r['p50']:>7.3f} {r['p95']:>7.3f}  {served}"
+                )
+            await gateway.close()
+    finally:
+        for server in servers.values():
+            server.__exit__()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9120)
+    parser.add_argument("--callers", type=int, default=20)
+    parser.add_argument("--phase", type=float, default=5.0)
+    parser.add_argument("--recovery-timeout", type=float, default=2.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,100 @@
+"""
+Serialization microbenchmark for the conversation messages list endpoint.
+
+Compares the per-message cost of rendering a MessageListResponse body:
+
+* ``pydantic``: the previous path; ``MessageBase.model_validate`` per ORM row,
+  FastAPI re-validating the returned model against the response annotation
+  (``serialize_response``) and the stdlib-JSON ``JSONResponse``.
+* ``orjson``: the current path; ``project_all`` copies the columns into dicts
+  and ``ORJSONResponse`` renders them directly.
+
+Rows are transient ``Message`` objects, so no database is needed.
+
+Usage:
+    python bench_serialization.py --sizes 10 100 1000 --repeat 200
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../shared"))
+sys.path.append(
+    os.path.join(os.path.dirname(__file__), "../services/conversations-service/src")
+)
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from models import Message
+from responses import ORJSONResponse, project_all
+from schemas import MessageBase, MessageListResponse
+
+RESPONSE_FIELD = create_model_field("Response_get_messages", MessageListResponse)
+
+
+def make_messages(count: int) -> list:
+    conversation_id = uuid4()
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        Message(
+            id=uuid4(),
+            conversation_id=conversation_id,
+            is_human=i % 2 == 0,
+            content=f"Message {i}: " + "some career advice text " * 10,
+            created_at=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+async def render_pydantic(messages: list) -> bytes:
+    response = MessageListResponse(
+        success=True,
+        messages=[MessageBase.model_validate(msg) for msg in messages],
+    )
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=response)
+    return JSONResponse(content).body
+
+
+async def render_orjson(messages: list) -> bytes:
+    return ORJSONResponse(
+        {"success": True, "messages": project_all(messages, MessageBase)}
+    ).body
+
+
+async def time_per_call(render, messages: list, repeat: int) -> float:
+    await render(messages)  # warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await render(messages)
+    return (time.perf_counter() - start) / repeat
+
+
+async def main(args) -> None:
+    print(
+        f"{'messages':>8} {'pydantic ms':>12} {'orjson ms':>10}"
+        f" {'pydantic us/msg':>16} {'orjson us/msg':>14} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        messages = make_messages(size)
+        slow = await time_per_call(render_pydantic, messages, args.repeat)
+        fast = await time_per_call(render_orjson, messages, args.repeat)
+        print(
+            f"{size:>8} {slow * 1e3:>12.3f} {fast * 1e3:>10.3f}"
+            f" {slow / size * 1e6:>16.2f} {fast / size * 1e6:>14.2f}"
+            f" {slow / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
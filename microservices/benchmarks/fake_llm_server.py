@@ -0,0 +1,116 @@
+"""
+Local fake of an OpenAI-compatible LLM provider for benchmarks.
+
+Serves POST /v1/chat/completions with a configurable artificial latency, so
+client-side concurrency can be measured without calling Grok. With
+``--capacity`` it behaves like a provider under load: latency grows with
+the number of requests in flight, and requests beyond the capacity get a
+429 with Retry-After. Setting ``app.state.down`` makes it answer 503, to
+simulate an outage.
+
+Usage:
+    python fake_llm_server.py --port 9100 --latency 1.0
+"""
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+def create_app(latency: float = 1.0, jitter: float = 0.0, capacity: int = 0) -> FastAPI:
+    """Build the fake provider app with the given response latency (seconds)
+    and, if capacity > 0, the number of requests it serves at once."""
+    app = FastAPI(title="Fake LLM Server")
+    app.state.in_flight = 0
+    app.state.max_in_flight = 0
+    app.state.rate_limited = 0
+    app.state.down = False
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if app.state.down:
+            return JSONResponse(
+                status_code=503, content={"error": {"message": "Service unavailable"}}
+            )
+        if capacity and app.state.in_flight >= capacity:
+            app.state.rate_limited += 1
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit exceeded"}},
+                headers={"retry-after": "1"},
+            )
+        app.state.in_flight += 1
+        app.state.max_in_flight = max(app.state.max_in_flight, app.state.in_flight)
+        try:
+            # Requests share the provider's compute: each one in flight
+            # slows the others down
+            load = app.state.in_flight / capacity if capacity else 0.0
+            await asyncio.sleep(latency * (1 + load) + random.uniform(0, jitter))
+        finally:
+            app.state.in_flight -= 1
+
+        content = "Fake career advice for: " + body["messages"][-1]["content"][:40]
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake-model"),
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    return app
+
+
+class FakeLLMServer:
+    """Run the fake provider in a background thread with its own event loop."""
+
+    def __init__(self, port: int = 9100, **app_kwargs):
+        self.port = port
+        self.app = create_app(**app_kwargs)
+        self.server = uvicorn.Server(
+            uvicorn.Config(self.app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self) -> "FakeLLMServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--capacity", type=int, default=0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(latency=args.latency, jitter=args.jitter, capacity=args.capacity),
+        host="127.0.0.1",
+        port=args.port,
+    )
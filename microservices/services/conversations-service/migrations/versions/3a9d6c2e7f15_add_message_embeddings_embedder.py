@@ -0,0 +1,38 @@
+"""add message embeddings embedder
+
+Revision ID: 3a9d6c2e7f15
+Revises: c5e82f1a9d47
+Create Date: 2026-10-18 10:12:31.528104
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3a9d6c2e7f15"
+down_revision: Union[str, None] = "c5e82f1a9d47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Rows written before the embedder was recorded may come from either the
+    # model or the hashing fallback, so no search matches them
+    op.add_column(
+        "message_embeddings",
+        sa.Column(
+            "embedder",
+            sa.String(length=200),
+            server_default="unknown",
+            nullable=False,
+        ),
+    )
+    op.alter_column("message_embeddings", "embedder", server_default=None)
+
+
+def downgrade() -> None:
+    op.drop_column("message_embeddings", "embedder")
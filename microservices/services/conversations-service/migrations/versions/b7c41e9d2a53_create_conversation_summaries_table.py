@@ -0,0 +1,52 @@
+"""create conversation summaries table
+
+Revision ID: b7c41e9d2a53
+Revises: e4373b0dbaca
+Create Date: 2026-10-17 21:40:12.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c41e9d2a53"
+down_revision: Union[str, None] = "e4373b0dbaca"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "conversation_summaries",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("conversation_id", sa.UUID(), nullable=False),
+        sa.Column("summary_text", sa.Text(), nullable=False),
+        sa.Column("covered_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("covered_seq", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_conversation_summaries_conversation_id",
+        "conversation_summaries",
+        ["conversation_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_conversation_summaries_conversation_id",
+        table_name="conversation_summaries",
+    )
+    op.drop_table("conversation_summaries")
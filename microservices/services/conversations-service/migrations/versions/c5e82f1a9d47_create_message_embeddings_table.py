@@ -0,0 +1,64 @@
+"""create message embeddings table
+
+Revision ID: c5e82f1a9d47
+Revises: b7c41e9d2a53
+Create Date: 2026-10-17 22:35:48.104663
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5e82f1a9d47"
+down_revision: Union[str, None] = "b7c41e9d2a53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.create_table(
+        "message_embeddings",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("conversation_id", sa.UUID(), nullable=False),
+        sa.Column("message_id", sa.UUID(), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("is_human", sa.Boolean(), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("embedding", Vector(384), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_message_embeddings_user_id", "message_embeddings", ["user_id"]
+    )
+    # Approximate nearest neighbour index for cosine distance
+    op.create_index(
+        "ix_message_embeddings_embedding_hnsw",
+        "message_embeddings",
+        ["embedding"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"embedding": "vector_cosine_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_message_embeddings_embedding_hnsw", table_name="message_embeddings"
+    )
+    op.drop_index("ix_message_embeddings_user_id", table_name="message_embeddings")
+    op.drop_table("message_embeddings")
+    # The vector extension is left installed; other database objects may use it
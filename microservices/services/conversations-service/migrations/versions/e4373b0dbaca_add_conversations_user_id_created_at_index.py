@@ -0,0 +1,42 @@
+"""add conversations user_id created_at index
+
+Revision ID: e4373b0dbaca
+Revises: fd63136f9ddb
+Create Date: 2026-10-17 21:05:42.118734
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4373b0dbaca"
+down_revision: Union[str, None] = "fd63136f9ddb"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves "conversations of a user, newest first" without a scan and sort.
+    # Built concurrently so a live conversations table keeps taking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_conversations_user_id_created_at",
+            "conversations",
+            ["user_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_conversations_user_id_created_at",
+            table_name="conversations",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,83 @@
+"""add messages keyset index
+
+Revision ID: fd63136f9ddb
+Revises: 5d4d6d32b260
+Create Date: 2026-10-17 20:52:10.412398
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "fd63136f9ddb"
+down_revision: Union[str, None] = "5d4d6d32b260"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Rows numbered per transaction while backfilling seq
+BACKFILL_BATCH_SIZE = 10000
+
+
+def upgrade() -> None:
+    # Insertion sequence used as the keyset tie-breaker: rows written in one
+    # transaction share created_at, and random UUIDs would reorder them.
+    # Adding a nullable column and a default for new rows does not rewrite
+    # the table, unlike adding an identity column, so writes are only
+    # blocked for a moment
+    op.add_column("messages", sa.Column("seq", sa.BigInteger(), nullable=True))
+    op.execute("CREATE SEQUENCE messages_seq_seq OWNED BY messages.seq")
+    op.execute(
+        "ALTER TABLE messages ALTER COLUMN seq SET DEFAULT nextval('messages_seq_seq')"
+    )
+
+    with op.get_context().autocommit_block():
+        # Number existing rows in short transactions. seq only orders rows
+        # with the same created_at, so the order within a batch is free
+        connection = op.get_bind()
+        while connection.execute(
+            sa.text(
+                "UPDATE messages SET seq = nextval('messages_seq_seq') "
+                "WHERE id IN ("
+                "SELECT id FROM messages WHERE seq IS NULL "
+                "ORDER BY created_at, id LIMIT :batch_size)"
+            ),
+            {"batch_size": BACKFILL_BATCH_SIZE},
+        ).rowcount:
+            pass
+
+        # Validating a CHECK constraint scans the table without blocking
+        # writes, and lets SET NOT NULL skip its own scan under the lock
+        op.execute(
+            "ALTER TABLE messages ADD CONSTRAINT messages_seq_not_null "
+            "CHECK (seq IS NOT NULL) NOT VALID"
+        )
+        op.execute("ALTER TABLE messages VALIDATE CONSTRAINT messages_seq_not_null")
+        op.alter_column("messages", "seq", nullable=False)
+        op.drop_constraint("messages_seq_not_null", "messages", type_="check")
+
+        # Build the index without locking out writes on a live messages table
+        op.create_index(
+            "ix_messages_conversation_id_created_at_seq",
+            "messages",
+            ["conversation_id", "created_at", "seq"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_messages_conversation_id_created_at_seq",
+            table_name="messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    # Drops the sequence it owns as well
+    op.drop_column("messages", "seq")
@@ -4,19 +4,108 @@ Dependency injection functions for the conversations service.
 
 import sys
 import os
+from typing import Optional
 
 # Add shared directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../shared"))
 
+from career_prompts import CAREER_ADVISOR_SYSTEM_PROMPT
 from services.ai_service import AIService
+from services.response_cache import ResponseCache, load_embedder
+from config import settings
+from services.context_builder import ContextBuilder
+from services.summarizer import ConversationSummarizer
+from services.embeddings import load_message_embedder
+from services.embedding_indexer import MessageIndexer
+from services.retrieval import PastMessageRetriever
 from feign_clients.users_client import UsersClient
 
 
+_users_client: Optional[UsersClient] = None
+_ai_service: Optional[AIService] = None
+_context_builder: Optional[ContextBuilder] = None
+_summarizer: Optional[ConversationSummarizer] = None
+_message_embedder = None
+_message_indexer: Optional[MessageIndexer] = None
+_retriever: Optional[PastMessageRetriever] = None
+
+
 def get_users_client() -> UsersClient:
-    """Dependency to get UsersClient instance."""
-    return UsersClient()
+    """Dependency to get the process-wide UsersClient instance."""
+    global _users_client
+    if _users_client is None:
+        _users_client = UsersClient()
+    return _users_client
 
 
 def get_ai_service() -> AIService:
-    """Dependency to get AIService instance."""
-    return AIService()
+    """Dependency to get the process-wide AIService instance."""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService(
+            response_cache=ResponseCache(
+                CAREER_ADVISOR_SYSTEM_PROMPT,
+                embedder=load_embedder(settings.response_cache_embedding_model),
+            )
+        )
+    return _ai_service
+
+
+def get_context_builder() -> ContextBuilder:
+    """Dependency to get the process-wide ContextBuilder instance."""
+    global _context_builder
+    if _context_builder is None:
+        _context_builder = ContextBuilder()
+    return _context_builder
+
+
+def get_summarizer() -> ConversationSummarizer:
+    """Dependency to get the process-wide ConversationSummarizer instance."""
+    global _summarizer
+    if _summarizer is None:
+        _summarizer = ConversationSummarizer(get_ai_service(), get_context_builder())
+    return _summarizer
+
+
+def get_message_embedder():
+    """The process-wide embedding model shared by indexing and retrieval."""
+    global _message_embedder
+    if _message_embedder is None:
+        _message_embedder = load_message_embedder()
+    return _message_embedder
+
+
+def get_message_indexer() -> MessageIndexer:
+    """Dependency to get the process-wide MessageIndexer instance."""
+    global _message_indexer
+    if _message_indexer is None:
+        _message_indexer = MessageIndexer(get_message_embedder())
+    return _message_indexer
+
+
+def get_retriever() -> PastMessageRetriever:
+    """Dependency to get the process-wide PastMessageRetriever instance."""
+    global _retriever
+    if _retriever is None:
+        _retriever = PastMessageRetriever(get_message_embedder())
+    return _retriever
+
+
+async def stop_message_indexer() -> None:
+    """Stop the background embedding worker, if it was started."""
+    if _message_indexer is not None:
+        await _message_indexer.stop()
+
+
+async def stop_summarizer() -> None:
+    """Stop the background summarization worker, if it was started."""
+    if _summarizer is not None:
+        await _summarizer.stop()
+
+
+async def close_ai_service() -> None:
+    """Close the shared AIService connection pool, if it was created."""
+    global _ai_service
+    if _ai_service is not None:
+        await _ai_service.close()
+        _ai_service = None
@@ -9,19 +9,44 @@ sys.path.append(os.path.dirname(__file__))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import close_engine
-from routers import conversations_router, messages_router
+from database import close_engine, pool_stats
+from routers import conversations_router, messages_router, internal_router
+from dependencies import (
+    close_ai_service,
+    get_ai_service,
+    get_context_builder,
+    get_message_indexer,
+    get_summarizer,
+    get_users_client,
+    stop_message_indexer,
+    stop_summarizer,
+)
+from metrics import register_metrics, router as metrics_router
+from feign_clients.http_client import get_http_client, close_http_client
+from responses import ORJSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Database migrations are handled by alembic upgrade head in startup script
+    get_http_client()  # Open the pooled client for service-to-service calls
+    get_summarizer().start()  # Background worker for conversation summaries
+    get_message_indexer().start()  # Background worker for message embeddings
     yield
+    await stop_message_indexer()
+    await stop_summarizer()
+    await close_http_client()
+    await close_ai_service()
     await close_engine()  # Properly close the database engine
 
 
-app = FastAPI(title="Conversations Service", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="Conversations Service",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # CORS middleware
 origins = [
@@ -40,6 +65,24 @@ app.add_middleware(
 # Include routers
 app.include_router(conversations_router, prefix="/api", tags=["conversations"])
 app.include_router(messages_router, prefix="/api", tags=["messages"])
+# Service-to-service endpoints, not routed through the API gateway
+app.include_router(internal_router, prefix="/internal", tags=["internal"])
+app.include_router(metrics_router, tags=["metrics"])
+
+register_metrics("db_pool", pool_stats)
+register_metrics(
+    "user_profile_cache", lambda: get_users_client().profile_cache.stats()
+)
+register_metrics("users_client", lambda: get_users_client().stats())
+register_metrics("context_cache", lambda: get_context_builder().cache.stats())
+register_metrics("summarizer", lambda: get_summarizer().stats())
+register_metrics(
+    "response_cache", lambda: get_ai_service().response_cache.stats()
+)
+register_metrics("llm_concurrency", lambda: get_ai_service().limiter.stats())
+register_metrics("llm_retries", lambda: get_ai_service().retry_policy.stats())
+register_metrics("llm_circuit", lambda: get_ai_service().circuit_breaker.stats())
+register_metrics("message_indexer", lambda: get_message_indexer().stats())
 
 
 @app.get("/health")
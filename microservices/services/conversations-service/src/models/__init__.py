@@ -1,4 +1,6 @@
 from .conversations import Conversation
 from .messages import Message
+from .summaries import ConversationSummary
+from .embeddings import MessageEmbedding
 
-__all__ = ["Conversation", "Message"]
+__all__ = ["Conversation", "Message", "ConversationSummary", "MessageEmbedding"]
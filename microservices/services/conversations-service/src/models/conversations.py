@@ -3,13 +3,18 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from base import BaseModel
 
 
 class Conversation(BaseModel):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index(
+            "ix_conversations_user_id_created_at", "user_id", text("created_at DESC")
+        ),
+    )
 
     user_id = Column(UUID(as_uuid=True), nullable=False)
     title = Column(String(255), nullable=False)
@@ -0,0 +1,41 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Boolean, Column, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from base import BaseModel
+
+# Width of the embedding column; all-MiniLM-L6-v2 and other small
+# sentence-transformers models produce 384 dimensions
+EMBEDDING_DIMENSIONS = 384
+
+
+class MessageEmbedding(BaseModel):
+    """One chunk of a message and its embedding, for retrieval across a user's
+    conversations."""
+
+    __tablename__ = "message_embeddings"
+    __table_args__ = (
+        Index(
+            "ix_message_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    # No foreign keys for microservices
+    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    conversation_id = Column(UUID(as_uuid=True), nullable=False)
+    message_id = Column(UUID(as_uuid=True), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    is_human = Column(Boolean, nullable=False)
+    content = Column(Text, nullable=False)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS), nullable=False)
+    # Name of the embedder that produced `embedding`; vectors of different
+    # models share the column but are not comparable
+    embedder = Column(String(200), nullable=False)
@@ -3,16 +3,28 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 
-from sqlalchemy import Column, Boolean, Text
+from sqlalchemy import BigInteger, Column, Boolean, Index, Sequence, Text
 from sqlalchemy.dialects.postgresql import UUID
-from base import BaseModel
+from base import Base, BaseModel
+
+messages_seq = Sequence("messages_seq_seq", metadata=Base.metadata)
 
 
 class Message(BaseModel):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index(
+            "ix_messages_conversation_id_created_at_seq",
+            "conversation_id",
+            "created_at",
+            "seq",
+        ),
+    )
 
     conversation_id = Column(
         UUID(as_uuid=True), nullable=False
     )  # No foreign key for microservices
     is_human = Column(Boolean, nullable=False)  # True for user, False for assistant
     content = Column(Text, nullable=False)
+    # Insertion order, breaks created_at ties for keyset pagination
+    seq = Column(BigInteger, server_default=messages_seq.next_value(), nullable=False)
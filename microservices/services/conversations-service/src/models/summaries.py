@@ -0,0 +1,22 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+from sqlalchemy import BigInteger, Column, DateTime, Text
+from sqlalchemy.dialects.postgresql import UUID
+from base import BaseModel
+
+
+class ConversationSummary(BaseModel):
+    """Rolling summary of a conversation's older messages, one per conversation."""
+
+    __tablename__ = "conversation_summaries"
+
+    conversation_id = Column(
+        UUID(as_uuid=True), nullable=False, unique=True, index=True
+    )  # No foreign key for microservices
+    summary_text = Column(Text, nullable=False)
+    # Keyset position (created_at, seq) of the newest message the summary covers
+    covered_created_at = Column(DateTime(timezone=True), nullable=False)
+    covered_seq = Column(BigInteger, nullable=False)
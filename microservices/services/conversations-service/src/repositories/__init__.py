@@ -1,4 +1,12 @@
 from .conversations import ConversationRepository
-from .messages import MessageRepository
+from .messages import MessageRepository, MessageCursor
+from .summaries import SummaryRepository
+from .embeddings import EmbeddingRepository
 
-__all__ = ["ConversationRepository", "MessageRepository"]
+__all__ = [
+    "ConversationRepository",
+    "MessageRepository",
+    "MessageCursor",
+    "SummaryRepository",
+    "EmbeddingRepository",
+]
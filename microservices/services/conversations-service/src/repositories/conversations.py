@@ -4,42 +4,60 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from uuid import UUID
+from datetime import datetime, timezone
+from sqlalchemy import Row, insert, select
+from uuid import UUID, uuid4
 from typing import List
 from fastapi import Depends
 
-from database import get_db
+from database import get_db, get_read_db
 from models.conversations import Conversation
 
+# Columns of ConversationBase, selected as plain rows for list reads
+CONVERSATION_LIST_COLUMNS = (
+    Conversation.id,
+    Conversation.title,
+    Conversation.created_at,
+    Conversation.user_id,
+)
+
 
 class ConversationRepository:
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        read_db: AsyncSession = Depends(get_read_db),
+    ):
         self.db = db
-
-    async def get_conversations(self, user_id: UUID) -> List[Conversation]:
-        """Get all conversations for a specific user."""
-        result = await self.db.scalars(
-            select(Conversation)
+        self.read_db = read_db
+
+    async def get_conversations(self, user_id: UUID) -> List[Row]:
+        """
+        Get all conversations for a specific user as read-only rows of the
+        listed columns, skipping ORM entity construction and identity tracking.
+        """
+        result = await self.read_db.execute(
+            select(*CONVERSATION_LIST_COLUMNS)
             .where(Conversation.user_id == user_id)
             .order_by(Conversation.created_at.desc())
         )
-        return list(result)
-
-    async def conversation_exists(self, conversation_id: UUID, user_id: UUID) -> bool:
-        """Check if a conversation exists and belongs to the user."""
-        result = await self.db.execute(
-            select(Conversation)
-            .where(Conversation.id == conversation_id)
-            .where(Conversation.user_id == user_id)
-        )
-        return result.scalars().first() is not None
+        return result.all()
 
     async def create_conversation(
         self, user_id: UUID, title: str = "New Conversation"
-    ) -> Conversation:
-        """Create a new conversation."""
-        conversation = Conversation(user_id=user_id, title=title)
-        self.db.add(conversation)
-        await self.db.flush()  # Get the ID without committing
-        return conversation
+    ) -> Row:
+        """
+        Create a new conversation without committing and return it as a
+        read-only row built by RETURNING, so it never needs a refresh.
+        """
+        result = await self.db.execute(
+            insert(Conversation)
+            .values(
+                id=uuid4(),
+                user_id=user_id,
+                title=title,
+                created_at=datetime.now(timezone.utc),
+            )
+            .returning(*CONVERSATION_LIST_COLUMNS)
+        )
+        return result.one()
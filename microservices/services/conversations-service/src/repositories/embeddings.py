@@ -0,0 +1,77 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, insert, select, text
+from uuid import UUID
+from typing import Any, Dict, List, Optional, Sequence
+from fastapi import Depends
+
+from database import get_db, get_read_db
+from models.embeddings import MessageEmbedding
+
+
+class EmbeddingRepository:
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        read_db: AsyncSession = Depends(get_read_db),
+    ):
+        self.db = db
+        self.read_db = read_db
+
+    async def add_embeddings(self, chunks: List[Dict[str, Any]]) -> None:
+        """Insert embedded message chunks in one batched statement, without committing."""
+        if chunks:
+            await self.db.execute(insert(MessageEmbedding), chunks)
+
+    async def search(
+        self,
+        user_id: UUID,
+        embedder: str,
+        embedding: Sequence[float],
+        limit: int,
+        exclude_conversation_id: Optional[UUID] = None,
+        max_distance: Optional[float] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Row]:
+        """
+        Get the user's message chunks embedded by `embedder` nearest to
+        `embedding` by cosine distance, nearest first, as read-only rows of content, is_human,
+        conversation_id and distance.
+
+        For users with few chunks Postgres reads them through the user_id
+        index and sorts exactly; for heavy users it walks the HNSW index
+        and filters by user afterwards, where `ef_search` (candidates per
+        scan, pgvector's default is 40) bounds how many of theirs it finds.
+        """
+        if ef_search is not None:
+            # Transaction-scoped, so it never leaks to other pooled sessions
+            await self.read_db.execute(
+                text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}")
+            )
+        distance = MessageEmbedding.embedding.cosine_distance(embedding)
+        query = (
+            select(
+                MessageEmbedding.content,
+                MessageEmbedding.is_human,
+                MessageEmbedding.conversation_id,
+                distance.label("distance"),
+            )
+            .where(
+                MessageEmbedding.user_id == user_id,
+                MessageEmbedding.embedder == embedder,
+            )
+            .order_by(distance)
+            .limit(limit)
+        )
+        if exclude_conversation_id is not None:
+            query = query.where(
+                MessageEmbedding.conversation_id != exclude_conversation_id
+            )
+        rows = (await self.read_db.execute(query)).all()
+        if max_distance is not None:
+            rows = [row for row in rows if row.distance <= max_distance]
+        return rows
@@ -3,38 +3,208 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 
+import base64
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from uuid import UUID
-from typing import List
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy import DateTime, Row, and_, insert, literal, select, tuple_
+from uuid import UUID, uuid4
+from typing import List, NamedTuple, Optional, Tuple, Union
 from fastapi import Depends
 
-from database import get_db
+from database import get_db, get_read_db
+from models.conversations import Conversation
 from models.messages import Message
 
+# Columns of MessageBase plus the keyset tie-breaker, selected as plain rows
+MESSAGE_LIST_COLUMNS = (
+    Message.id,
+    Message.is_human,
+    Message.content,
+    Message.created_at,
+    Message.conversation_id,
+    Message.seq,
+)
+
+
+class MessageCursor(NamedTuple):
+    """Keyset position of a message: its (created_at, seq) sort key."""
+
+    created_at: datetime
+    seq: int
+
+    @classmethod
+    def of(cls, message: Union[Message, Row]) -> "MessageCursor":
+        return cls(message.created_at, message.seq)
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.seq}".encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "MessageCursor":
+        """Parse an opaque cursor, raising ValueError if it is malformed."""
+        try:
+            created_at, seq = base64.urlsafe_b64decode(cursor).decode().split("|")
+            return cls(datetime.fromisoformat(created_at), int(seq))
+        except Exception as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
 
 class MessageRepository:
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        read_db: AsyncSession = Depends(get_read_db),
+    ):
         self.db = db
+        self.read_db = read_db
 
-    async def get_messages_by_conversation_id(
-        self, conversation_id: UUID
-    ) -> List[Message]:
-        """Get all messages for a specific conversation."""
-        result = await self.db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
+    @staticmethod
+    def _keyset(
+        before: Optional[MessageCursor], after: Optional[MessageCursor]
+    ) -> Tuple[list, tuple]:
+        """Filter conditions and ordering for a page on (created_at, seq)."""
+        sort_key = tuple_(Message.created_at, Message.seq)
+        if after is not None:
+            order_by = (Message.created_at.asc(), Message.seq.asc())
+            return [sort_key > tuple_(*after)], order_by
+        conditions = [sort_key < tuple_(*before)] if before is not None else []
+        return conditions, (Message.created_at.desc(), Message.seq.desc())
+
+    @staticmethod
+    def _to_page(
+        messages: List[Row], limit: int, after: Optional[MessageCursor]
+    ) -> Tuple[List[Row], bool]:
+        # One extra row was fetched to learn whether another page exists
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if after is None:
+            messages.reverse()
+        return messages, has_more
+
+    async def get_messages_page(
+        self,
+        conversation_id: UUID,
+        limit: int,
+        before: Optional[MessageCursor] = None,
+        after: Optional[MessageCursor] = None,
+    ) -> Tuple[List[Row], bool]:
+        """
+        Get one page of a conversation's messages in chronological order using
+        keyset pagination on (created_at, seq): the `limit` messages right
+        after `after`, right before `before`, or the most recent ones.
+        Returns the page as read-only rows and whether more messages exist
+        past it.
+        """
+        conditions, order_by = self._keyset(before, after)
+        result = await self.read_db.execute(
+            select(*MESSAGE_LIST_COLUMNS)
+            .where(Message.conversation_id == conversation_id, *conditions)
+            .order_by(*order_by)
+            .limit(limit + 1)
         )
-        return result.scalars().all()
+        return self._to_page(list(result.all()), limit, after)
+
+    async def get_oldest_messages(
+        self,
+        conversation_id: UUID,
+        limit: int,
+        after: Optional[MessageCursor] = None,
+    ) -> List[Row]:
+        """
+        Get up to `limit` of a conversation's messages in chronological order,
+        from the first message or from right after `after`, as read-only rows.
+        """
+        conditions = (
+            [tuple_(Message.created_at, Message.seq) > tuple_(*after)]
+            if after is not None
+            else []
+        )
+        result = await self.read_db.execute(
+            select(*MESSAGE_LIST_COLUMNS)
+            .where(Message.conversation_id == conversation_id, *conditions)
+            .order_by(Message.created_at.asc(), Message.seq.asc())
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_owned_messages_page(
+        self,
+        conversation_id: UUID,
+        user_id: UUID,
+        limit: int,
+        before: Optional[MessageCursor] = None,
+        after: Optional[MessageCursor] = None,
+    ) -> Optional[Tuple[List[Row], bool]]:
+        """
+        Like get_messages_page, but checks in the same query that the
+        conversation belongs to the user. Returns None if it does not.
+        """
+        conditions, order_by = self._keyset(before, after)
+        # The outer join keeps one all-NULL row for an owned conversation
+        # without (matching) messages, so no rows at all means not owned
+        result = await self.read_db.execute(
+            select(*MESSAGE_LIST_COLUMNS)
+            .select_from(Conversation)
+            .outerjoin(
+                Message,
+                and_(Message.conversation_id == Conversation.id, *conditions),
+            )
+            .where(Conversation.id == conversation_id)
+            .where(Conversation.user_id == user_id)
+            .order_by(*order_by)
+            .limit(limit + 1)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        messages = [row for row in rows if row.id is not None]
+        return self._to_page(messages, limit, after)
 
     async def create_message(
         self, conversation_id: UUID, is_human: bool, content: str
-    ) -> Message:
-        """Create a new message."""
-        message = Message(
-            conversation_id=conversation_id, is_human=is_human, content=content
+    ) -> Row:
+        """
+        Create a new message without committing and return it as a read-only
+        row. ID and timestamp are generated here and RETURNING supplies seq,
+        so the row never needs a refresh after commit.
+        """
+        result = await self.db.execute(
+            insert(Message)
+            .values(
+                id=uuid4(),
+                conversation_id=conversation_id,
+                is_human=is_human,
+                content=content,
+                created_at=datetime.now(timezone.utc),
+            )
+            .returning(*MESSAGE_LIST_COLUMNS)
+        )
+        return result.one()
+
+    async def create_owned_message(
+        self, conversation_id: UUID, user_id: UUID, is_human: bool, content: str
+    ) -> Optional[Row]:
+        """
+        Create a new message only if the conversation belongs to the user,
+        checking ownership in the same INSERT ... SELECT statement. Returns
+        the message as a read-only row, or None if the conversation is not
+        the user's.
+        """
+        owned_conversation = select(
+            literal(uuid4(), PG_UUID(as_uuid=True)),
+            Conversation.id,
+            literal(is_human),
+            literal(content),
+            literal(datetime.now(timezone.utc), DateTime(timezone=True)),
+        ).where(Conversation.id == conversation_id, Conversation.user_id == user_id)
+        result = await self.db.execute(
+            insert(Message)
+            .from_select(
+                ["id", "conversation_id", "is_human", "content", "created_at"],
+                owned_conversation,
+            )
+            .returning(*MESSAGE_LIST_COLUMNS)
         )
-        self.db.add(message)
-        await self.db.flush()  # Get the ID without committing
-        return message
+        return result.one_or_none()
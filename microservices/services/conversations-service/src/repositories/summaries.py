@@ -0,0 +1,83 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import Row, select, tuple_
+from uuid import UUID, uuid4
+from typing import Optional
+from fastapi import Depends
+
+from database import get_db, get_read_db
+from models.summaries import ConversationSummary
+from repositories.messages import MessageCursor
+
+SUMMARY_COLUMNS = (
+    ConversationSummary.summary_text,
+    ConversationSummary.covered_created_at,
+    ConversationSummary.covered_seq,
+)
+
+
+class SummaryRepository:
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        read_db: AsyncSession = Depends(get_read_db),
+    ):
+        self.db = db
+        self.read_db = read_db
+
+    @staticmethod
+    def covered_cursor(summary: Row) -> MessageCursor:
+        """Keyset position of the newest message covered by a summary row."""
+        return MessageCursor(summary.covered_created_at, summary.covered_seq)
+
+    async def get_summary(self, conversation_id: UUID) -> Optional[Row]:
+        """Get the conversation's rolling summary as a read-only row, if any."""
+        result = await self.read_db.execute(
+            select(*SUMMARY_COLUMNS).where(
+                ConversationSummary.conversation_id == conversation_id
+            )
+        )
+        return result.one_or_none()
+
+    async def save_summary(
+        self, conversation_id: UUID, summary_text: str, covered: MessageCursor
+    ) -> None:
+        """
+        Create or replace the conversation's summary without committing,
+        in a single upsert on the unique conversation_id. A summary covering
+        fewer messages than the stored one never replaces it.
+        """
+        now = datetime.now(timezone.utc)
+        statement = insert(ConversationSummary).values(
+            id=uuid4(),
+            conversation_id=conversation_id,
+            summary_text=summary_text,
+            covered_created_at=covered.created_at,
+            covered_seq=covered.seq,
+            created_at=now,
+        )
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ConversationSummary.conversation_id],
+                set_={
+                    "summary_text": statement.excluded.summary_text,
+                    "covered_created_at": statement.excluded.covered_created_at,
+                    "covered_seq": statement.excluded.covered_seq,
+                    "updated_at": now,
+                },
+                where=tuple_(
+                    ConversationSummary.covered_created_at,
+                    ConversationSummary.covered_seq,
+                )
+                < tuple_(
+                    statement.excluded.covered_created_at,
+                    statement.excluded.covered_seq,
+                ),
+            )
+        )
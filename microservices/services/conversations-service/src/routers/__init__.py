@@ -1,4 +1,5 @@
 from .conversations import router as conversations_router
 from .messages import router as messages_router
+from .internal import router as internal_router
 
-__all__ = ["messages_router", "conversations_router"]
+__all__ = ["messages_router", "conversations_router", "internal_router"]
@@ -1,3 +1,8 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from uuid import UUID
 
@@ -8,6 +13,7 @@ from schemas import (
     ConversationResponse,
 )
 from repositories import ConversationRepository
+from responses import ORJSONResponse, project_all
 
 router = APIRouter()
 
@@ -22,11 +28,13 @@ async def get_conversations(
     try:
         conversations = await repository.get_conversations(user_id)
 
-        return ConversationListResponse(
-            success=True,
-            conversations=[
-                ConversationBase.model_validate(conv) for conv in conversations
-            ],
+        # Rows already match ConversationBase; serialize them without
+        # building and re-validating a model per row
+        return ORJSONResponse(
+            {
+                "success": True,
+                "conversations": project_all(conversations, ConversationBase),
+            }
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
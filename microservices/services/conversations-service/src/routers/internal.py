@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from uuid import UUID
+
+from feign_clients.users_client import UsersClient
+from dependencies import get_users_client
+
+router = APIRouter()
+
+
+@router.delete("/users/{user_id}/profile-cache")
+async def invalidate_user_profile_cache(
+    user_id: UUID, users_client: UsersClient = Depends(get_users_client)
+) -> dict:
+    """
+    Drop the cached profile of a user (called by the Users Service on profile changes)
+    """
+    invalidated = users_client.invalidate_user_profile(user_id)
+    return {"success": True, "invalidated": invalidated}
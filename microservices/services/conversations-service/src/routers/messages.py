@@ -6,7 +6,10 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 # Add current directory to path for local imports
 sys.path.append(os.path.dirname(__file__))
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Any, Awaitable, Dict, List, Optional, Tuple
 from uuid import UUID
 
 from schemas import (
@@ -17,39 +20,101 @@ from schemas import (
     MessageWithConversationResponse,
     ConversationBase,
 )
-from repositories import ConversationRepository, MessageRepository
+from repositories import (
+    ConversationRepository,
+    MessageRepository,
+    MessageCursor,
+    SummaryRepository,
+    EmbeddingRepository,
+)
 from services.ai_service import AIService
+from services.context_builder import ContextBuilder
+from services.summarizer import ConversationSummarizer
+from services.embedding_indexer import MessageIndexer
+from services.retrieval import PastMessageRetriever
 from feign_clients.users_client import UsersClient
-from dependencies import get_users_client, get_ai_service
+from dependencies import (
+    get_users_client,
+    get_ai_service,
+    get_context_builder,
+    get_summarizer,
+    get_message_indexer,
+    get_retriever,
+)
+from responses import ORJSONResponse, project_all
+from concurrency import gather_or_cancel
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+AI_ERROR_MESSAGE = "I apologize, but I'm having trouble generating a response right now. Please try again later."
+
+
+def format_sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
 
 @router.get("/users/{user_id}/conversations/{conversation_id}/messages")
 async def get_conversation_messages(
     user_id: UUID,
     conversation_id: UUID,
-    conversation_repository: ConversationRepository = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
     message_repository: MessageRepository = Depends(),
 ) -> MessageListResponse:
     """
-    Get all messages for a specific conversation
+    Get a page of messages for a specific conversation, oldest first.
+    Without a cursor this is the most recent page; use `prev_cursor` as
+    `before` to load older messages and `next_cursor` as `after` for newer ones.
     """
     try:
-        # Verify conversation exists and belongs to user
-        conversation_exists = await conversation_repository.conversation_exists(
-            conversation_id, user_id
+        if before and after:
+            raise HTTPException(
+                status_code=400, detail="Use either 'before' or 'after', not both"
+            )
+        try:
+            before_cursor = MessageCursor.decode(before) if before else None
+            after_cursor = MessageCursor.decode(after) if after else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # Fetch the page and verify the conversation belongs to the user in
+        # a single query
+        page = await message_repository.get_owned_messages_page(
+            conversation_id, user_id, limit, before=before_cursor, after=after_cursor
         )
 
-        if not conversation_exists:
+        if page is None:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        messages = await message_repository.get_messages_by_conversation_id(
-            conversation_id
-        )
-
-        return MessageListResponse(
-            success=True, messages=[MessageBase.model_validate(msg) for msg in messages]
+        messages, has_more = page
+
+        # Older messages exist if this page stopped short of them, or if we
+        # paged forward from a cursor; newer ones likewise in the other direction
+        has_older = has_more if after_cursor is None else True
+        has_newer = has_more if after_cursor is not None else before_cursor is not None
+
+        # Rows already match MessageBase; serialize them without building
+        # and re-validating a model per message
+        return ORJSONResponse(
+            {
+                "success": True,
+                "messages": project_all(messages, MessageBase),
+                "prev_cursor": (
+                    MessageCursor.of(messages[0]).encode()
+                    if messages and has_older
+                    else None
+                ),
+                "next_cursor": (
+                    MessageCursor.of(messages[-1]).encode()
+                    if messages and has_newer
+                    else None
+                ),
+            }
         )
 
     except HTTPException:
@@ -60,93 +125,229 @@ async def get_conversation_messages(
         )
 
 
+async def save_message_and_get_profile(
+    save_user_message: Awaitable[Optional[Any]],
+    message_repository: MessageRepository,
+    users_client: UsersClient,
+    user_id: UUID,
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Persist the user's message while the profile is fetched from the Users
+    Service, so the wait before the LLM call is the slower of the two rather
+    than their sum. `save_user_message` returns None if the conversation is
+    not the user's. The message is committed even if the profile is missing.
+    Returns what `save_user_message` returned and the profile.
+    """
+    user_message, user_profile = await gather_or_cancel(
+        save_user_message, users_client.get_user_profile(user_id)
+    )
+
+    if user_message is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+
+    # Commit the user message (and any new conversation) before the LLM call
+    await message_repository.db.commit()
+
+    # An empty profile is the degraded one used while the Users Service is
+    # down; only a missing profile stops the turn
+    if user_profile is None:
+        raise HTTPException(
+            status_code=404,
+            detail="User profile not found. Please complete your profile first.",
+        )
+
+    return user_message, user_profile
+
+
+async def answer_message(
+    conversation_id: UUID,
+    user_profile: Dict[str, Any],
+    message: str,
+    message_repository: MessageRepository,
+    ai_service: AIService,
+    history: Optional[List[Dict[str, str]]] = None,
+    related: Optional[List[Dict[str, str]]] = None,
+) -> MessageResponse:
+    """
+    Get AI career advice for a saved user message, given the earlier turns
+    of the conversation and related messages from past ones, and save the
+    answer.
+    """
+    ai_response = await ai_service.get_career_advice(
+        user_profile=user_profile,
+        question=message,
+        history=history,
+        related=related,
+    )
+
+    # Save the AI response, or the apology if the AI service failed, as the
+    # assistant message
+    success = ai_response.get("success", False)
+    ai_message = await message_repository.create_message(
+        conversation_id=conversation_id,
+        is_human=False,
+        content=ai_response["response"] if success else AI_ERROR_MESSAGE,
+    )
+    await message_repository.db.commit()
+
+    return MessageResponse(
+        success=success, message=MessageBase.model_validate(ai_message)
+    )
+
+
 @router.post("/users/{user_id}/conversations/{conversation_id}/message")
 async def create_conversation_message(
     user_id: UUID,
     conversation_id: UUID,
     message_request: CreateMessageRequest,
-    conversation_repository: ConversationRepository = Depends(),
     message_repository: MessageRepository = Depends(),
     users_client: UsersClient = Depends(get_users_client),
     ai_service: AIService = Depends(get_ai_service),
+    context_builder: ContextBuilder = Depends(get_context_builder),
+    summary_repository: SummaryRepository = Depends(),
+    summarizer: ConversationSummarizer = Depends(get_summarizer),
+    embedding_repository: EmbeddingRepository = Depends(),
+    retriever: PastMessageRetriever = Depends(get_retriever),
+    indexer: MessageIndexer = Depends(get_message_indexer),
 ) -> MessageResponse:
     """Send a message to a specific conversation and get AI career advice"""
     try:
-        # Verify conversation exists and belongs to user
-        conversation_exists = await conversation_repository.conversation_exists(
-            conversation_id, user_id
+        # Save the message if the conversation belongs to the user, while
+        # fetching the profile
+        user_message, user_profile = await save_message_and_get_profile(
+            message_repository.create_owned_message(
+                conversation_id, user_id, True, message_request.message
+            ),
+            message_repository,
+            users_client,
+            user_id,
         )
 
-        if not conversation_exists:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-
-        # Save user message
-        user_message = await message_repository.create_message(
-            conversation_id=conversation_id,
-            is_human=True,
-            content=message_request.message,
+        history = await context_builder.build(
+            message_repository,
+            conversation_id,
+            exclude_message_id=user_message.id,
+            summary_repository=summary_repository,
+        )
+        related = await retriever.retrieve(
+            embedding_repository,
+            user_id,
+            message_request.message,
+            exclude_conversation_id=conversation_id,
         )
 
-        # Commit the user message first
-        await message_repository.db.commit()
-        await message_repository.db.refresh(user_message)
-
-        # Get user profile from Users Service
-        response = await users_client.get_user_profile(user_id)
+        message_response = await answer_message(
+            conversation_id,
+            user_profile,
+            message_request.message,
+            message_repository,
+            ai_service,
+            history=history,
+            related=related,
+        )
 
-        user_profile = response.get("profile")
+        # Fold older turns into the summary and embed the new messages for
+        # later retrieval, both in the background
+        summarizer.enqueue(conversation_id)
+        indexer.enqueue(user_message, user_id)
+        indexer.enqueue(message_response.message, user_id)
 
-        print(response)
-        print(response.get("profile"))
+        return message_response
 
-        if not user_profile:
-            raise HTTPException(
-                status_code=404,
-                detail="User profile not found. Please complete your profile first.",
-            )
-
-        # Get AI career advice
-        ai_response = await ai_service.get_career_advice(
-            user_profile=user_profile, question=message_request.message
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error processing message: {str(e)}"
         )
 
-        # Save AI response as assistant message
-        if ai_response.get("success", False):
-            ai_message = await message_repository.create_message(
-                conversation_id=conversation_id,
-                is_human=False,
-                content=ai_response["response"],
-            )
-
-            # Commit the AI message
-            await message_repository.db.commit()
-            await message_repository.db.refresh(ai_message)
 
-            # Return the AI response message
-            return MessageResponse(
-                success=True, message=MessageBase.model_validate(ai_message)
-            )
-        else:
-            # If AI service failed, return error message
-            error_message = await message_repository.create_message(
+@router.post("/users/{user_id}/conversations/{conversation_id}/message/stream")
+async def stream_conversation_message(
+    user_id: UUID,
+    conversation_id: UUID,
+    message_request: CreateMessageRequest,
+    message_repository: MessageRepository = Depends(),
+    users_client: UsersClient = Depends(get_users_client),
+    ai_service: AIService = Depends(get_ai_service),
+    context_builder: ContextBuilder = Depends(get_context_builder),
+    summary_repository: SummaryRepository = Depends(),
+    summarizer: ConversationSummarizer = Depends(get_summarizer),
+    embedding_repository: EmbeddingRepository = Depends(),
+    retriever: PastMessageRetriever = Depends(get_retriever),
+    indexer: MessageIndexer = Depends(get_message_indexer),
+) -> StreamingResponse:
+    """
+    Send a message to a specific conversation and stream the AI career advice
+    as Server-Sent Events: a `token` event per content delta, then `done` with
+    the persisted assistant message (or `error` if generation failed).
+    """
+    # Save and commit the user message before streaming starts, if the
+    # conversation belongs to the user, while fetching the profile
+    user_message, user_profile = await save_message_and_get_profile(
+        message_repository.create_owned_message(
+            conversation_id, user_id, True, message_request.message
+        ),
+        message_repository,
+        users_client,
+        user_id,
+    )
+
+    history = await context_builder.build(
+        message_repository,
+        conversation_id,
+        exclude_message_id=user_message.id,
+        summary_repository=summary_repository,
+    )
+    related = await retriever.retrieve(
+        embedding_repository,
+        user_id,
+        message_request.message,
+        exclude_conversation_id=conversation_id,
+    )
+    indexer.enqueue(user_message, user_id)
+
+    async def event_stream():
+        chunks = []
+        try:
+            try:
+                async for delta in ai_service.stream_career_advice(
+                    user_profile=user_profile,
+                    question=message_request.message,
+                    history=history,
+                    related=related,
+                ):
+                    chunks.append(delta)
+                    yield format_sse_event("token", {"content": delta})
+                success = True
+            except Exception as e:
+                print(f"AI streaming error: {str(e)}")
+                success = False
+
+            # Persist the full answer (or the apology) as the assistant message
+            ai_message = await message_repository.create_message(
                 conversation_id=conversation_id,
                 is_human=False,
-                content="I apologize, but I'm having trouble generating a response right now. Please try again later.",
+                content="".join(chunks) if success else AI_ERROR_MESSAGE,
             )
-
             await message_repository.db.commit()
-            await message_repository.db.refresh(error_message)
+            summarizer.enqueue(conversation_id)
+            indexer.enqueue(ai_message, user_id)
 
-            return MessageResponse(
-                success=False, message=MessageBase.model_validate(error_message)
-            )
+            payload = MessageResponse(
+                success=success, message=MessageBase.model_validate(ai_message)
+            ).model_dump(mode="json")
+            yield format_sse_event("done" if success else "error", payload)
+        finally:
+            # Request-scoped dependencies have already exited once the body
+            # streams, so release the session's connection explicitly.
+            await message_repository.db.close()
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Error processing message: {str(e)}"
-        )
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/users/{user_id}/messages")
@@ -157,29 +358,46 @@ async def create_conversation_and_message(
     message_repository: MessageRepository = Depends(),
     users_client: UsersClient = Depends(get_users_client),
     ai_service: AIService = Depends(get_ai_service),
+    embedding_repository: EmbeddingRepository = Depends(),
+    retriever: PastMessageRetriever = Depends(get_retriever),
+    indexer: MessageIndexer = Depends(get_message_indexer),
 ) -> MessageWithConversationResponse:
     """Create a new conversation with the first message and get AI response"""
     try:
         # Always create new conversation
-        conversation = await conversation_repository.create_conversation(
-            user_id, "New Conversation"
+        async def save_conversation_and_message():
+            conversation = await conversation_repository.create_conversation(
+                user_id, "New Conversation"
+            )
+            user_message = await message_repository.create_message(
+                conversation_id=conversation.id,
+                is_human=True,
+                content=message_request.message,
+            )
+            return conversation, user_message
+
+        (conversation, user_message), user_profile = await save_message_and_get_profile(
+            save_conversation_and_message(),
+            message_repository,
+            users_client,
+            user_id,
+        )
+        related = await retriever.retrieve(
+            embedding_repository, user_id, message_request.message
         )
 
-        # Commit the conversation first
-        await conversation_repository.db.commit()
-        await conversation_repository.db.refresh(conversation)
-
-        # Use the existing create_conversation_message logic
-        message_response = await create_conversation_message(
-            user_id=user_id,
-            conversation_id=conversation.id,
-            message_request=message_request,
-            conversation_repository=conversation_repository,
-            message_repository=message_repository,
-            users_client=users_client,
-            ai_service=ai_service,
+        message_response = await answer_message(
+            conversation.id,
+            user_profile,
+            message_request.message,
+            message_repository,
+            ai_service,
+            related=related,
         )
 
+        indexer.enqueue(user_message, user_id)
+        indexer.enqueue(message_response.message, user_id)
+
         # Return both the conversation and the AI message
         return MessageWithConversationResponse(
             success=message_response.success,
@@ -16,6 +16,10 @@ class MessageBase(BaseModel):
 class MessageListResponse(BaseModel):
     success: bool
     messages: List[MessageBase]
+    # Pass as `before` to page to older messages; None when there are none
+    prev_cursor: Optional[str] = None
+    # Pass as `after` to page to newer messages; None when there are none
+    next_cursor: Optional[str] = None
 
 
 class CreateMessageRequest(BaseModel):
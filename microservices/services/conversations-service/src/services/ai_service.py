@@ -1,47 +1,141 @@
-from openai import OpenAI
-from typing import Dict, Any, Optional
+import httpx
+from contextlib import AsyncExitStack
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+)
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 
+from career_prompts import CAREER_ADVISOR_SYSTEM_PROMPT, build_career_prompt
+from concurrency import AdaptiveConcurrencyLimiter, LimiterSlot
 from config import settings
+from resilience import CircuitBreaker, RetryPolicy, parse_retry_after
+from services.response_cache import ResponseCache
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You summarize career advice conversations between a tech worker and their career advisor. "
+    "Write a concise summary (at most 200 words) that keeps the user's situation, goals, questions asked, "
+    "and the advice and action items given, so the conversation can continue without the full transcript."
+)
+
+# Upstream errors meaning the provider is over capacity
+OVERLOAD_ERRORS = (RateLimitError, APITimeoutError)
+# Upstream errors meaning the provider is down; connection errors include timeouts
+PROVIDER_FAILURES = (InternalServerError, APIConnectionError)
+# Transient errors worth another attempt
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, APIConnectionError)
+
+RELATED_CONTEXT_PREFIX = (
+    "Relevant excerpts from the user's earlier conversations "
+    "(use them for continuity; they may be outdated):\n"
+)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """The delay the provider asked for with a Retry-After header, if any."""
+    if isinstance(error, APIStatusError):
+        return parse_retry_after(error.response.headers.get("retry-after"))
+    return None
 
 
 class AIService:
     """Service class for handling AI-powered career advice requests"""
 
-    def __init__(self):
-        self.client = OpenAI(
+    def __init__(
+        self,
+        client: Optional[AsyncOpenAI] = None,
+        response_cache: Optional[ResponseCache] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        # One async client per process: its connection pool is shared by every
+        # in-flight completion, so a slow LLM call never blocks the event loop.
+        # With an llm-service gateway configured it is the endpoint instead
+        # of the provider, and the gateway holds the provider credentials.
+        self.client = client or AsyncOpenAI(
             api_key=settings.xai_api_key,
-            base_url=settings.xai_base_url,
+            base_url=(
+                f"{settings.llm_gateway_url.rstrip('/')}/v1"
+                if settings.llm_gateway_url
+                else settings.xai_base_url
+            ),
+            timeout=settings.xai_timeout,
+            # Retries are ours, so they share the circuit breaker and budget
+            max_retries=0,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.xai_max_connections,
+                    max_keepalive_connections=settings.xai_max_connections,
+                )
+            ),
+        )
+        # Answers to questions asked without history don't depend on the
+        # conversation, so users with the same profile and question share them
+        self.response_cache = response_cache
+        # Bounds simultaneous provider calls from this pod, adapting to the
+        # provider's capacity instead of overloading it in spikes
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(
+            initial_limit=settings.llm_concurrency_initial_limit,
+            min_limit=settings.llm_concurrency_min_limit,
+            max_limit=settings.llm_concurrency_max_limit,
+            backoff_ratio=settings.llm_concurrency_backoff_ratio,
+            latency_tolerance=settings.llm_concurrency_latency_tolerance,
+            max_queue=settings.llm_concurrency_max_queue,
+            queue_timeout=settings.llm_concurrency_queue_timeout,
+        )
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=settings.llm_retry_max_attempts,
+            base_delay=settings.llm_retry_base_delay,
+            max_delay=settings.llm_retry_max_delay,
+            budget=settings.llm_retry_budget,
+        )
+        # While the provider is down, fail at once instead of waiting out
+        # the client timeout on every request
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=settings.llm_circuit_failure_threshold,
+            recovery_timeout=settings.llm_circuit_recovery_timeout,
         )
 
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
     async def get_career_advice(
-        self, user_profile: Dict[str, Any], question: Optional[str] = None
+        self,
+        user_profile: Dict[str, Any],
+        question: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        related: Optional[List[Dict[str, str]]] = None,
     ) -> Dict[str, Any]:
-        """Get career advice from AI based on user profile and optional question"""
-        try:
-            # Build the prompt
-            prompt = self._build_career_prompt(user_profile, question)
-
-            print("AI Service - prompt: ", prompt)
-            print("AI Service - api_key: ", settings.xai_api_key)
+        """Get career advice from AI based on user profile, optional question,
+        earlier turns of the conversation and related past messages"""
+        if self.response_cache is not None and not history and not related:
+            return await self.response_cache.get_or_generate(
+                user_profile,
+                question,
+                lambda: self._get_career_advice(user_profile, question),
+            )
+        return await self._get_career_advice(
+            user_profile, question, history, related
+        )
 
+    async def _get_career_advice(
+        self,
+        user_profile: Dict[str, Any],
+        question: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        related: Optional[List[Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        try:
             # Make the AI request
-            response = self.client.chat.completions.create(
-                model=settings.xai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a career advisor for tech workers (software engineers, data scientists, DevOps engineers, etc.). "
-                        + "You specialize in helping Tech professionals navigate their careers in the current market, and you are here to help them make informed decisions. "
-                        + "Provide advice that is: \n"
-                        + "- Personalized to their specific skills, experience level, and goals\n"
-                        + "- Actionable with concrete next steps and timelines\n"
-                        + "- Realistic about current market conditions and industry trends (likely future market conditions)\n"
-                        + "- Structured: direct answer, specific recommendations, immediate action items\n"
-                        "- Keep it concise and to the point (short answers)\n"
-                        "Consider factors like remote work trends, AI impact on roles, startup vs enterprise dynamics, and emerging technologies when giving advice.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+            response = await self._create_completion(
+                messages=self._build_messages(user_profile, question, history, related),
                 temperature=0.7,
             )
 
@@ -55,29 +149,118 @@ class AIService:
                 "error": str(e),
             }
 
-    def _build_career_prompt(
-        self, user_profile: Dict[str, Any], question: Optional[str] = None
-    ) -> str:
-        """Build a detailed prompt for career advice based on user profile"""
+    async def stream_career_advice(
+        self,
+        user_profile: Dict[str, Any],
+        question: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        related: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """Stream career advice from AI, yielding content deltas as they arrive.
+
+        Unlike get_career_advice, errors are raised to the caller, which owns
+        the stream and decides how to report a failure mid-response.
+        """
+        async with AsyncExitStack() as stack:
+            # Only opening the stream is retried; once deltas were yielded
+            # a failure goes to the caller
+            slot, stream = await self._open_completion(
+                stack,
+                messages=self._build_messages(user_profile, question, history, related),
+                temperature=0.7,
+                stream=True,
+            )
+            async for chunk in stream:
+                # Time to first token, not how long the client took to read
+                slot.responded()
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def summarize_conversation(
+        self, messages: List[Dict[str, str]], previous_summary: Optional[str] = None
+    ) -> Optional[str]:
+        """Condense chat messages, and the summary of what came before them,
+        into a new rolling summary. Returns None if the AI request failed."""
+        transcript = "\n".join(
+            f"{message['role'].capitalize()}: {message['content']}"
+            for message in messages
+        )
+        if previous_summary:
+            transcript = f"Summary so far:\n{previous_summary}\n\nContinued:\n{transcript}"
+        try:
+            response = await self._create_completion(
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": transcript},
+                ],
+                temperature=0.2,
+            )
+            return response.choices[0].message.content
+
+        except Exception as e:
+            print(f"AI Service summarization error: {str(e)}")
+            return None
 
-        skills = user_profile.get("skills", [])
-        years_experience = user_profile.get("years_experience", "")
-        career_goals = user_profile.get("career_goals", '')
+    async def _create_completion(self, **params) -> Any:
+        """Request a chat completion; see _open_completion"""
+        async with AsyncExitStack() as stack:
+            _, response = await self._open_completion(stack, **params)
+        return response
 
-        prompt = f"""
-        I'm a tech worker seeking career advice. Here's my profile:
-        Years of Experience: {years_experience}
+    async def _open_completion(
+        self, stack: AsyncExitStack, **params
+    ) -> Tuple[LimiterSlot, Any]:
+        """Request a chat completion: retry transient errors with backoff,
+        fail fast while the circuit is open and report rate limits and
+        timeouts to the limiter. Each attempt holds its own concurrency slot,
+        so backoff waits hold none and the limiter only sees the latency of
+        single attempts; the successful attempt's slot stays held until
+        `stack` closes (e.g. after a stream is read)"""
 
-        Technical Skills:
-        {', '.join(skills) if skills else 'Not specified'}
+        async def attempt():
+            async with AsyncExitStack() as attempt_stack:
+                slot = await attempt_stack.enter_async_context(self.limiter.acquire())
+                try:
+                    response = await self.circuit_breaker.call(
+                        lambda: self.client.chat.completions.create(
+                            model=settings.xai_model, **params
+                        ),
+                        is_failure=lambda e: isinstance(e, PROVIDER_FAILURES),
+                    )
+                except OVERLOAD_ERRORS:
+                    slot.overloaded()
+                    raise
+                stack.push_async_exit(attempt_stack.pop_all())
+                return slot, response
 
-        Career Goals:
-        {career_goals if career_goals else 'Not specified'}
-        """
+        return await self.retry_policy.call(
+            attempt,
+            is_retryable=lambda e: isinstance(e, RETRYABLE_ERRORS),
+            retry_after=_retry_after,
+        )
 
-        if question:
-            prompt += f"\n\nSpecific Question: {question}"
-        else:
-            prompt += "\n\nPlease provide personalized career advice including potential career paths, skills to develop, and actionable next steps."
+    def _build_messages(
+        self,
+        user_profile: Dict[str, Any],
+        question: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+        related: Optional[List[Dict[str, str]]] = None,
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the model: the system prompt,
+        related excerpts from past conversations, the conversation so far
+        (oldest first), then the profile and question"""
+        return [
+            {"role": "system", "content": CAREER_ADVISOR_SYSTEM_PROMPT},
+            *([self._build_related_context(related)] if related else []),
+            *(history or []),
+            {"role": "user", "content": build_career_prompt(user_profile, question)},
+        ]
 
-        return prompt.strip()
+    def _build_related_context(self, related: List[Dict[str, str]]) -> Dict[str, str]:
+        """System message quoting related messages from past conversations"""
+        excerpts = "\n".join(
+            f"- {'User' if message['role'] == 'user' else 'Advisor'}: "
+            + message["content"]
+            for message in related
+        )
+        return {"role": "system", "content": RELATED_CONTEXT_PREFIX + excerpts}
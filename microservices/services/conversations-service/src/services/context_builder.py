@@ -0,0 +1,158 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from cache import TTLCache
+from config import settings
+from repositories import MessageCursor, MessageRepository, SummaryRepository
+
+# Rough per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+TRUNCATION_MARKER = " [...]"
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate: about four characters per token for English."""
+    return len(text) // 4 + 1
+
+
+@dataclass(frozen=True)
+class ContextEntry:
+    role: str
+    content: str
+    tokens: int
+
+    @classmethod
+    def of(cls, message) -> "ContextEntry":
+        content = message.content
+        return cls(
+            role="user" if message.is_human else "assistant",
+            content=content,
+            tokens=estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS,
+        )
+
+    @classmethod
+    def of_summary(cls, summary_text: str) -> "ContextEntry":
+        content = SUMMARY_PREFIX + summary_text
+        return cls(
+            role="system",
+            content=content,
+            tokens=estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS,
+        )
+
+
+@dataclass(frozen=True)
+class CachedContext:
+    """History already fitted to the budget, up to and including `cursor`."""
+
+    cursor: MessageCursor
+    entries: Tuple[ContextEntry, ...]
+    summary: Optional[ContextEntry] = None
+
+
+class ContextBuilder:
+    """
+    Builds the conversation history sent along with a question to the LLM:
+    the conversation's rolling summary, if one was stored, then the messages
+    after it, newest first until the token budget is spent. Older messages
+    are dropped and a message that only partly fits is truncated.
+
+    The fitted history is cached per conversation together with the keyset
+    cursor of its newest message, so a follow-up turn only loads and
+    estimates the messages written since.
+    """
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        max_messages: Optional[int] = None,
+        cache: Optional[TTLCache] = None,
+    ):
+        self.token_budget = token_budget or settings.context_token_budget
+        self.max_messages = max_messages or settings.context_max_messages
+        self.cache = cache or TTLCache(
+            max_size=settings.context_cache_max_size,
+            ttl=settings.context_cache_ttl,
+        )
+
+    async def build(
+        self,
+        message_repository: MessageRepository,
+        conversation_id: UUID,
+        exclude_message_id: Optional[UUID] = None,
+        summary_repository: Optional[SummaryRepository] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        Get the conversation's summary and recent history as chat messages,
+        oldest first, leaving out `exclude_message_id` (the question being
+        answered).
+        """
+        key = str(conversation_id)
+        cached: Optional[CachedContext] = self.cache.get(key)
+        entries: Tuple[ContextEntry, ...] = ()
+        summary: Optional[ContextEntry] = None
+
+        if cached is not None:
+            rows, has_more = await message_repository.get_messages_page(
+                conversation_id, self.max_messages, after=cached.cursor
+            )
+            if has_more:
+                # Too much happened since; the cached prefix is out of budget anyway
+                cached = None
+            else:
+                entries, summary = cached.entries, cached.summary
+        if cached is None:
+            covered = None
+            if summary_repository is not None:
+                stored = await summary_repository.get_summary(conversation_id)
+                if stored is not None:
+                    summary = ContextEntry.of_summary(stored.summary_text)
+                    covered = SummaryRepository.covered_cursor(stored)
+            rows, _ = await message_repository.get_messages_page(
+                conversation_id, self.max_messages
+            )
+            if covered is not None:
+                rows = [row for row in rows if MessageCursor.of(row) > covered]
+
+        rows = [row for row in rows if row.id != exclude_message_id]
+        if rows:
+            entries = self._fit(
+                entries + tuple(ContextEntry.of(row) for row in rows),
+                self.token_budget - (summary.tokens if summary else 0),
+            )
+            cached = CachedContext(MessageCursor.of(rows[-1]), entries, summary)
+        if cached is not None:
+            self.cache.set(key, cached)
+
+        history = (summary,) + entries if summary else entries
+        return [{"role": entry.role, "content": entry.content} for entry in history]
+
+    def invalidate(self, conversation_id: UUID) -> bool:
+        return self.cache.invalidate(str(conversation_id))
+
+    @staticmethod
+    def _fit(
+        entries: Tuple[ContextEntry, ...], budget: int
+    ) -> Tuple[ContextEntry, ...]:
+        """Keep the newest entries that fit the budget, truncating the oldest kept one."""
+        kept: List[ContextEntry] = []
+        remaining = budget
+        for entry in reversed(entries):
+            if entry.tokens <= remaining:
+                kept.append(entry)
+                remaining -= entry.tokens
+                continue
+            # Keep the start of a message that only partly fits, if enough room is left
+            room = remaining - MESSAGE_OVERHEAD_TOKENS - estimate_tokens(TRUNCATION_MARKER)
+            if room > 0:
+                content = entry.content[: room * 4].rstrip() + TRUNCATION_MARKER
+                kept.append(ContextEntry(entry.role, content, remaining))
+            break
+        kept.reverse()
+        return tuple(kept)
@@ -0,0 +1,144 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal
+from repositories import EmbeddingRepository
+from services.embeddings import chunk_text
+
+
+class MessageIndexer:
+    """
+    Background ingestion of messages into the embeddings table, off the
+    request path.
+
+    Requests enqueue saved messages; a worker task takes whatever is queued
+    (up to `batch_size` chunks), embeds all chunks in one model call on a
+    worker thread so the event loop keeps serving requests, and inserts
+    them in one batched statement with its own database session. The
+    queue is bounded; messages that do not fit are counted and skipped.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self.embedder = embedder
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.embedding_batch_size
+        self.queue_size = queue_size or settings.embedding_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.indexed_messages = 0
+        self.indexed_chunks = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the worker task on the running event loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the worker, dropping anything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+
+    def enqueue(self, message: Any, user_id: UUID) -> bool:
+        """
+        Queue a saved message (anything with id, conversation_id, is_human
+        and content) for embedding. Never waits; returns False if it was
+        dropped because the worker is not running or the queue is full.
+        """
+        if self._queue is None:
+            return False
+        try:
+            self._queue.put_nowait(
+                {
+                    "message_id": message.id,
+                    "conversation_id": message.conversation_id,
+                    "user_id": user_id,
+                    "is_human": message.is_human,
+                    "content": message.content,
+                }
+            )
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued message has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        while True:
+            messages = [await self._queue.get()]
+            # Take what else is already waiting, so bursts embed together
+            while not self._queue.empty() and len(messages) < self.batch_size:
+                messages.append(self._queue.get_nowait())
+            try:
+                await self.index(messages)
+            except Exception as e:
+                self.failed += len(messages)
+                print(f"Error indexing {len(messages)} messages: {str(e)}")
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
+
+    async def index(self, messages: List[Dict[str, Any]]) -> None:
+        """Chunk, embed and store a batch of messages."""
+        chunks = [
+            {**message, "content": chunk, "chunk_index": index}
+            for message in messages
+            for index, chunk in enumerate(chunk_text(message["content"]))
+        ]
+        if not chunks:
+            return
+        vectors = await asyncio.to_thread(
+            self.embedder.embed, [chunk["content"] for chunk in chunks]
+        )
+        for chunk, vector in zip(chunks, vectors):
+            chunk["id"] = uuid4()
+            chunk["embedding"] = vector
+            chunk["embedder"] = self.embedder.name
+
+        async with self.session_factory() as session:
+            await EmbeddingRepository(session, session).add_embeddings(chunks)
+            await session.commit()
+
+        self.batches += 1
+        self.indexed_messages += len(messages)
+        self.indexed_chunks += len(chunks)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "running": self._worker is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "indexed_messages": self.indexed_messages,
+            "indexed_chunks": self.indexed_chunks,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
@@ -0,0 +1,116 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+import hashlib
+import math
+import re
+from typing import List, Optional
+
+from config import settings
+from models.embeddings import EMBEDDING_DIMENSIONS
+
+_WORD = re.compile(r"\w+")
+
+
+def chunk_text(
+    text: str, max_chars: Optional[int] = None, overlap: Optional[int] = None
+) -> List[str]:
+    """
+    Split a message into chunks of at most `max_chars` characters, cut at
+    whitespace where possible, each repeating the last `overlap` characters
+    of the previous one so no sentence is only ever seen cut in half.
+    """
+    max_chars = max_chars or settings.embedding_chunk_chars
+    overlap = settings.embedding_chunk_overlap if overlap is None else overlap
+    text = text.strip()
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        if end < len(text):
+            cut = text.rfind(" ", start + overlap + 1, end)
+            if cut > start:
+                end = cut
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
+
+class HashingEmbedder:
+    """
+    Dependency-free fallback embedder: hashes words and word bigrams into a
+    fixed number of signed buckets and L2-normalizes the counts. Captures
+    lexical overlap only, but is deterministic and costs microseconds.
+    """
+
+    # Stored with each embedding, so retrieval only compares vectors of one model
+    name = "hashing"
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def _bucket(self, feature: str):
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dimensions, 1.0 if value >> 63 else -1.0
+
+    def embed_one(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        words = _WORD.findall(text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            index, sign = self._bucket(feature)
+            vector[index] += sign
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+class SentenceTransformerEmbedder:
+    """Local CPU sentence-transformers model producing normalized embeddings."""
+
+    def __init__(self, model, name: str):
+        self.model = model
+        self.name = name
+        self.dimensions = model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(
+            texts, batch_size=len(texts) or 1, normalize_embeddings=True
+        ).tolist()
+
+    @classmethod
+    def load(cls, model_name: str) -> Optional["SentenceTransformerEmbedder"]:
+        """Load the model, or None if sentence-transformers is not installed."""
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            print(f"sentence-transformers is not installed; cannot load {model_name}")
+            return None
+        return cls(SentenceTransformer(model_name, device="cpu"), model_name)
+
+
+def load_message_embedder(model_name: Optional[str] = None):
+    """
+    Embedder for message retrieval: the configured sentence-transformers
+    model if it is installed and fits the embedding column, otherwise the
+    hashing fallback. Each stored embedding records the embedder's name and
+    searches only match rows of the same one, so a pod that falls back
+    neither pollutes nor reads the model's vectors.
+    """
+    model_name = model_name or settings.embedding_model
+    if model_name:
+        embedder = SentenceTransformerEmbedder.load(model_name)
+        if embedder is not None and embedder.dimensions == EMBEDDING_DIMENSIONS:
+            return embedder
+        if embedder is not None:
+            print(
+                f"Embedding model {model_name} has {embedder.dimensions} dimensions, "
+                f"the embeddings table {EMBEDDING_DIMENSIONS}; using hashing embedder"
+            )
+    return HashingEmbedder()
@@ -0,0 +1,206 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+import asyncio
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from cache import TTLCache
+from config import settings
+from services.embeddings import SentenceTransformerEmbedder
+
+Embedder = Callable[[str], Sequence[float]]
+
+# Questions remembered per profile for the similarity tier
+MAX_QUESTIONS_PER_PROFILE = 256
+
+
+def normalize_text(text: Any) -> str:
+    """Case, whitespace and trailing punctuation insensitive form of a text."""
+    return " ".join(str(text).lower().split()).rstrip("?!. ")
+
+
+def normalize_profile(user_profile: Dict[str, Any]) -> Dict[str, Any]:
+    """The profile fields the career prompt is built from, in canonical form."""
+    goals = user_profile.get("career_goals") or ""
+    if isinstance(goals, (list, tuple)):
+        goals = sorted(normalize_text(goal) for goal in goals)
+    else:
+        goals = normalize_text(goals)
+    return {
+        "skills": sorted(
+            {normalize_text(skill) for skill in user_profile.get("skills") or []}
+        ),
+        "years_experience": normalize_text(user_profile.get("years_experience", "")),
+        "career_goals": goals,
+    }
+
+
+def _digest(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _unit(vector: Sequence[float]) -> Tuple[float, ...]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return tuple(x / norm for x in vector)
+
+
+def load_embedder(model_name: Optional[str]) -> Optional[Embedder]:
+    """
+    Load a local sentence-transformers model for the similarity tier, or
+    None if no model is configured or the package is not installed.
+    """
+    if not model_name:
+        return None
+    embedder = SentenceTransformerEmbedder.load(model_name)
+    if embedder is None:
+        return None
+    return lambda text: embedder.embed([text])[0]
+
+
+class _Uncacheable(Exception):
+    """Carries a failed AI response past the cache without storing it."""
+
+    def __init__(self, result: Dict[str, Any]):
+        self.result = result
+
+
+class ResponseCache:
+    """
+    Cache of career advice answers in front of the LLM.
+
+    The exact tier keys answers by a hash of the model, system prompt,
+    normalized profile fields and normalized question, so identical
+    questions from users with the same profile share one answer (and
+    concurrent ones a single LLM call). With an embedder, a similarity
+    tier also reuses an answer given for the same profile when the new
+    question's embedding is within `similarity_threshold` (cosine) of a
+    question already answered. Only successful answers are cached.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        embedder: Optional[Embedder] = None,
+        similarity_threshold: Optional[float] = None,
+        cache: Optional[TTLCache] = None,
+    ):
+        self.system_prompt = system_prompt
+        self.embedder = embedder
+        self.similarity_threshold = (
+            similarity_threshold or settings.response_cache_similarity_threshold
+        )
+        self.cache = cache or TTLCache(
+            max_size=settings.response_cache_max_size,
+            ttl=settings.response_cache_ttl,
+        )
+        # Profile key -> question key -> unit embedding of the question
+        self._questions: "OrderedDict[str, OrderedDict[str, Tuple[float, ...]]]" = (
+            OrderedDict()
+        )
+        self.similar_hits = 0
+        self.similar_misses = 0
+
+    def keys(
+        self, user_profile: Dict[str, Any], question: Optional[str]
+    ) -> Tuple[str, str]:
+        """Profile key and answer key for a question."""
+        profile_key = _digest(
+            settings.xai_model, self.system_prompt, normalize_profile(user_profile)
+        )
+        return profile_key, _digest(profile_key, normalize_text(question or ""))
+
+    async def get_or_generate(
+        self,
+        user_profile: Dict[str, Any],
+        question: Optional[str],
+        generate: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Get a cached answer to the question, or generate and cache it."""
+        profile_key, answer_key = self.keys(user_profile, question)
+
+        vector = None
+        if (
+            self.embedder is not None
+            and question
+            and self.cache.peek(answer_key) is None
+        ):
+            vector = _unit(await asyncio.to_thread(self.embedder, question))
+            similar = self._find_similar(profile_key, vector)
+            if similar is not None:
+                self.similar_hits += 1
+                return similar
+            self.similar_misses += 1
+
+        async def load() -> Dict[str, Any]:
+            result = await generate()
+            if not result.get("success", False):
+                raise _Uncacheable(result)
+            return result
+
+        try:
+            result = await self.cache.get_or_load(answer_key, load)
+        except _Uncacheable as e:
+            return e.result
+
+        if vector is not None:
+            self._remember(profile_key, answer_key, vector)
+        return result
+
+    def _find_similar(
+        self, profile_key: str, vector: Tuple[float, ...]
+    ) -> Optional[Dict[str, Any]]:
+        questions = self._questions.get(profile_key)
+        if not questions:
+            return None
+        best_key, best_score = None, self.similarity_threshold
+        for answer_key, other in list(questions.items()):
+            score = sum(a * b for a, b in zip(vector, other))
+            if score >= best_score:
+                best_key, best_score = answer_key, score
+        if best_key is None:
+            return None
+        answer = self.cache.peek(best_key)
+        if answer is None:
+            # Expired or evicted from the exact tier
+            del questions[best_key]
+        return answer
+
+    def _remember(
+        self, profile_key: str, answer_key: str, vector: Tuple[float, ...]
+    ) -> None:
+        questions = self._questions.setdefault(profile_key, OrderedDict())
+        self._questions.move_to_end(profile_key)
+        questions[answer_key] = vector
+        while len(questions) > MAX_QUESTIONS_PER_PROFILE:
+            questions.popitem(last=False)
+        # Keep as many profiles as the exact tier keeps answers at most
+        while len(self._questions) > self.cache.max_size:
+            self._questions.popitem(last=False)
+
+    def clear(self) -> None:
+        self.cache.clear()
+        self._questions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        stats = self.cache.stats()
+        exact_hits = stats["hits"] + stats["coalesced"]
+        lookups = exact_hits + stats["misses"] + self.similar_hits
+        stats.update(
+            {
+                "similarity_tier": self.embedder is not None,
+                "similar_hits": self.similar_hits,
+                "similar_misses": self.similar_misses,
+                "hit_rate": (
+                    (exact_hits + self.similar_hits) / lookups if lookups else 0.0
+                ),
+            }
+        )
+        return stats
@@ -0,0 +1,68 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+import asyncio
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from config import settings
+from repositories import EmbeddingRepository
+
+
+class PastMessageRetriever:
+    """
+    Finds the user's past messages most relevant to a question: embeds the
+    question with the same model as the indexer and runs a top-k cosine
+    search over the user's other conversations, among chunks that model
+    embedded.
+    """
+
+    def __init__(
+        self,
+        embedder,
+        top_k: Optional[int] = None,
+        max_distance: Optional[float] = None,
+        ef_search: Optional[int] = None,
+    ):
+        self.embedder = embedder
+        self.top_k = top_k or settings.rag_top_k
+        self.max_distance = max_distance or settings.rag_max_distance
+        self.ef_search = ef_search or settings.rag_ef_search
+
+    async def retrieve(
+        self,
+        embedding_repository: EmbeddingRepository,
+        user_id: UUID,
+        question: str,
+        exclude_conversation_id: Optional[UUID] = None,
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        Get up to `top_k` relevant chunks as role/content dicts, nearest
+        first, leaving out the conversation the question belongs to (its
+        own history is sent separately). Related messages only enrich the
+        prompt, so if the embedder or the search fails, returns None and
+        the turn is answered without them.
+        """
+        try:
+            [vector] = await asyncio.to_thread(self.embedder.embed, [question])
+            # In a savepoint, so a failed search does not abort the
+            # request's transaction when there is no separate read replica
+            async with embedding_repository.read_db.begin_nested():
+                rows = await embedding_repository.search(
+                    user_id,
+                    self.embedder.name,
+                    vector,
+                    self.top_k,
+                    exclude_conversation_id=exclude_conversation_id,
+                    max_distance=self.max_distance,
+                    ef_search=self.ef_search,
+                )
+        except Exception as e:
+            print(f"Error retrieving related messages for {user_id}: {str(e)}")
+            return None
+        return [
+            {"role": "user" if row.is_human else "assistant", "content": row.content}
+            for row in rows
+        ]
@@ -0,0 +1,171 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+
+import asyncio
+from typing import Any, Callable, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal
+from repositories import MessageCursor, MessageRepository, SummaryRepository
+from services.ai_service import AIService
+from services.context_builder import ContextBuilder
+
+
+class ConversationSummarizer:
+    """
+    Background stage that folds a conversation's older messages into its
+    rolling summary, off the request path.
+
+    Requests only enqueue a conversation ID after a turn; a worker task
+    drains the queue one conversation at a time with its own database
+    session and decides whether enough messages have piled up behind the
+    most recent ones to be worth summarizing. The queue is bounded and a
+    conversation already waiting is not queued twice, so a burst of turns
+    never grows memory or the LLM bill; anything dropped is picked up on
+    the conversation's next turn.
+    """
+
+    def __init__(
+        self,
+        ai_service: AIService,
+        context_builder: ContextBuilder,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        every_messages: Optional[int] = None,
+        keep_recent_messages: Optional[int] = None,
+        max_messages: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ):
+        self.ai_service = ai_service
+        self.context_builder = context_builder
+        self.session_factory = session_factory
+        self.every_messages = every_messages or settings.summary_every_messages
+        self.keep_recent_messages = (
+            keep_recent_messages
+            if keep_recent_messages is not None
+            else settings.summary_keep_recent_messages
+        )
+        self.max_messages = max_messages or settings.summary_max_messages
+        self.queue_size = queue_size or settings.summary_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._pending: Set[UUID] = set()
+        self._worker: Optional[asyncio.Task] = None
+        self.summarized = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the worker task on the running event loop."""
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the worker; queued conversations are summarized on a later turn."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            self._queue = None
+            self._pending.clear()
+
+    def enqueue(self, conversation_id: UUID) -> bool:
+        """
+        Ask for the conversation to be summarized if it has grown enough.
+        Never waits; returns False if the request was dropped because the
+        worker is not running or the queue is full.
+        """
+        if self._queue is None:
+            return False
+        if conversation_id in self._pending:
+            return True
+        try:
+            self._queue.put_nowait(conversation_id)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self._pending.add(conversation_id)
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued conversation has been processed."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _run(self) -> None:
+        while True:
+            conversation_id = await self._queue.get()
+            self._pending.discard(conversation_id)
+            try:
+                if await self.summarize(conversation_id):
+                    # More unsummarized messages than one pass takes; go on
+                    self.enqueue(conversation_id)
+            except Exception as e:
+                self.failed += 1
+                print(f"Error summarizing conversation {conversation_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def summarize(self, conversation_id: UUID) -> bool:
+        """
+        Fold the messages after the current summary, except the most recent
+        ones, into a new summary if at least `every_messages` of them are
+        waiting. Returns whether older messages are still left unsummarized.
+        """
+        async with self.session_factory() as session:
+            summary = await SummaryRepository(session, session).get_summary(
+                conversation_id
+            )
+            covered = SummaryRepository.covered_cursor(summary) if summary else None
+            limit = self.max_messages + self.keep_recent_messages
+            rows = await MessageRepository(session, session).get_oldest_messages(
+                conversation_id, limit + 1, after=covered
+            )
+        has_more = len(rows) > limit
+        older_count = min(len(rows) - self.keep_recent_messages, self.max_messages)
+        older = rows[: max(older_count, 0)]
+        if len(older) < self.every_messages:
+            return False
+
+        # No connection is held while the LLM call is in flight
+        summary_text = await self.ai_service.summarize_conversation(
+            [
+                {
+                    "role": "user" if row.is_human else "assistant",
+                    "content": row.content,
+                }
+                for row in older
+            ],
+            previous_summary=summary.summary_text if summary else None,
+        )
+        if not summary_text:
+            self.failed += 1
+            return False
+
+        async with self.session_factory() as session:
+            await SummaryRepository(session, session).save_summary(
+                conversation_id, summary_text, MessageCursor.of(older[-1])
+            )
+            await session.commit()
+
+        self.summarized += 1
+        # The next turn rebuilds its history around the new summary
+        self.context_builder.invalidate(conversation_id)
+        return has_more
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "running": self._worker is not None,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "summarized": self.summarized,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
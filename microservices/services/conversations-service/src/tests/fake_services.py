@@ -3,7 +3,7 @@ Fake implementations for testing using dependency overrides.
 """
 
 from uuid import UUID
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, List, Optional
 
 
 class FakeUsersClient:
@@ -33,12 +33,55 @@ class FakeAIService:
         # Track calls for verification
         self.calls = []
 
-    async def get_career_advice(self, user_profile: dict, question: str) -> dict:
+    async def get_career_advice(
+        self,
+        user_profile: dict,
+        question: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        related: Optional[List[Dict[str, str]]] = None,
+    ) -> dict:
         """Return fake AI response."""
         # Record the call for test verification
-        self.calls.append({"user_profile": user_profile, "question": question})
+        self.calls.append(
+            {
+                "user_profile": user_profile,
+                "question": question,
+                "history": history,
+                "related": related,
+            }
+        )
         return self.default_response
 
+    async def stream_career_advice(
+        self,
+        user_profile: dict,
+        question: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        related: Optional[List[Dict[str, str]]] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the fake AI response word by word, or raise if it is a failure."""
+        self.calls.append(
+            {
+                "user_profile": user_profile,
+                "question": question,
+                "history": history,
+                "related": related,
+            }
+        )
+        if not self.default_response.get("success", False):
+            raise RuntimeError(self.default_response.get("error", "AI failure"))
+        for index, word in enumerate(self.default_response["response"].split(" ")):
+            yield word if index == 0 else " " + word
+
+    async def summarize_conversation(
+        self, messages: List[Dict[str, str]], previous_summary: Optional[str] = None
+    ) -> Optional[str]:
+        """Return a fake summary naming how many messages it covers."""
+        self.calls.append({"messages": messages, "previous_summary": previous_summary})
+        if not self.default_response.get("success", False):
+            return None
+        return f"Summary of {len(messages)} messages."
+
     def set_response(self, response: dict):
         """Set the response for testing."""
         self.default_response = response
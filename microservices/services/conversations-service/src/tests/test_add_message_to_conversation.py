@@ -7,6 +7,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
+from sqlalchemy import event
 from models import Conversation, Message
 from dependencies import get_users_client, get_ai_service
 from tests.fake_services import FakeUsersClient, FakeAIService
@@ -79,6 +80,55 @@ class TestAddMessageToConversation:
         assert last_ai_call["user_profile"] == fake_user_profile
         assert last_ai_call["question"] == "How can I become a tech lead?"
 
+    @pytest.mark.asyncio
+    async def test_add_message_round_trips(self, client, db_session):
+        """Test a chat turn checks ownership while inserting, loads the summary
+        and history (nothing is cached yet), searches past messages in a
+        savepoint and commits twice."""
+        user_id = uuid4()
+        conversation = Conversation(id=uuid4(), user_id=user_id, title="Round trips")
+        db_session.add(conversation)
+        await db_session.commit()
+
+        fake_users_client = FakeUsersClient()
+        fake_users_client.set_user_profile(user_id, {"skills": ["Python"]})
+        app.dependency_overrides[get_users_client] = lambda: fake_users_client
+        app.dependency_overrides[get_ai_service] = lambda: FakeAIService()
+
+        sent = []
+        sync_engine = db_session.bind.engine.sync_engine
+
+        def on_statement(conn, cursor, statement, parameters, context, executemany):
+            sent.append(statement.lstrip().split(None, 1)[0].upper())
+
+        def on_commit(conn):
+            sent.append("COMMIT")
+
+        event.listen(sync_engine, "before_cursor_execute", on_statement)
+        event.listen(sync_engine, "commit", on_commit)
+        try:
+            response = await client.post(
+                f"/api/users/{user_id}/conversations/{conversation.id}/message",
+                json={"message": "How can I become a tech lead?"},
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", on_statement)
+            event.remove(sync_engine, "commit", on_commit)
+
+        assert response.status_code == 200
+        assert sent == [
+            "INSERT",
+            "COMMIT",
+            "SELECT",
+            "SELECT",
+            "SAVEPOINT",
+            "SET",
+            "SELECT",
+            "RELEASE",
+            "INSERT",
+            "COMMIT",
+        ]
+
     @pytest.mark.asyncio
     async def test_add_message_conversation_not_found(self, client):
         """Test adding message to non-existent conversation."""
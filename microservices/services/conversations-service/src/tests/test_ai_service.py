@@ -0,0 +1,303 @@
+import asyncio
+import json
+import time
+import pytest
+import httpx
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from openai import AsyncOpenAI
+from concurrency import AdaptiveConcurrencyLimiter
+from resilience import CircuitBreaker, CircuitOpenError, RetryPolicy
+from services.ai_service import AIService
+
+UPSTREAM_LATENCY = 0.2
+
+
+def fake_completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "fake-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def fake_stream(deltas: list) -> bytes:
+    chunks = [
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "fake-model",
+            "choices": [{"index": 0, "delta": {"content": delta}}],
+        }
+        for delta in deltas
+    ]
+    events = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks]
+    return ("".join(events) + "data: [DONE]\n\n").encode()
+
+
+def make_ai_service(handler, **options) -> AIService:
+    """Build an AIService whose client talks to an in-process fake provider."""
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://fake-llm/v1",
+        http_client=http_client,
+        max_retries=0,
+    )
+    return AIService(client, **options)
+
+
+class TestAIService:
+    """Tests for the async LLM client used by the conversations service."""
+
+    @pytest.mark.asyncio
+    async def test_get_career_advice_success(self):
+        """Test the completion content is returned as the advice."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, json=fake_completion("Learn system design."))
+
+        ai_service = make_ai_service(handler)
+        result = await ai_service.get_career_advice({"skills": ["Python"]}, "Next?")
+        await ai_service.close()
+
+        assert result == {"success": True, "response": "Learn system design."}
+
+    @pytest.mark.asyncio
+    async def test_get_career_advice_upstream_error(self):
+        """Test upstream failures are reported instead of raised."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+        ai_service = make_ai_service(handler)
+        result = await ai_service.get_career_advice({"skills": []}, "Next?")
+        await ai_service.close()
+
+        assert result["success"] is False
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_stream_career_advice_yields_deltas(self):
+        """Test streamed completions are relayed delta by delta."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(
+                200,
+                content=fake_stream(["Learn", " system", " design."]),
+                headers={"content-type": "text/event-stream"},
+            )
+
+        ai_service = make_ai_service(handler)
+        deltas = [
+            delta
+            async for delta in ai_service.stream_career_advice({"skills": []}, "Next?")
+        ]
+        await ai_service.close()
+
+        assert deltas == ["Learn", " system", " design."]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_do_not_queue(self):
+        """Test in-flight completions overlap instead of blocking the event loop."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(UPSTREAM_LATENCY)
+            return httpx.Response(200, json=fake_completion("ok"))
+
+        ai_service = make_ai_service(handler)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(ai_service.get_career_advice({"skills": []}, f"Q{i}") for i in range(10))
+        )
+        elapsed = time.perf_counter() - start
+        await ai_service.close()
+
+        assert all(result["success"] for result in results)
+        # Ten serialized calls would take 10 * UPSTREAM_LATENCY
+        assert elapsed < UPSTREAM_LATENCY * 4
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_shrink_the_concurrency_limit(self):
+        """Test a provider 429 backs the limiter off and calls over the
+        limit wait for a slot instead of reaching the provider."""
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if json.loads(request.content)["messages"][-1]["content"].endswith("429"):
+                return httpx.Response(429, json={"error": {"message": "slow down"}})
+            return httpx.Response(200, json=fake_completion("ok"))
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, backoff_ratio=0.5)
+        ai_service = make_ai_service(
+            handler, limiter=limiter, retry_policy=RetryPolicy(max_attempts=1)
+        )
+        result = await ai_service.get_career_advice({"skills": []}, "429")
+        assert result["success"] is False
+        assert limiter.stats()["limit"] == 2
+
+        results = await asyncio.gather(
+            *(ai_service.get_career_advice({"skills": []}, f"Q{i}") for i in range(6))
+        )
+        await ai_service.close()
+
+        assert all(result["success"] for result in results)
+        assert peak == 2
+        assert limiter.stats()["overloads"] == 1
+
+
+def record_sleeps(delays: list):
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    return sleep
+
+
+class TestAIServiceResilience:
+    """Tests for retries and the circuit breaker around provider calls."""
+
+    @pytest.mark.asyncio
+    async def test_transient_errors_are_retried(self):
+        statuses = [503, 500, 200]
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            status = statuses.pop(0)
+            if status != 200:
+                return httpx.Response(status, json={"error": {"message": "blip"}})
+            return httpx.Response(200, json=fake_completion("Recovered."))
+
+        delays = []
+        ai_service = make_ai_service(
+            handler, retry_policy=RetryPolicy(sleep=record_sleeps(delays))
+        )
+        result = await ai_service.get_career_advice({"skills": []}, "Next?")
+        await ai_service.close()
+
+        assert result == {"success": True, "response": "Recovered."}
+        assert len(delays) == 2
+        assert ai_service.circuit_breaker.stats()["consecutive_failures"] == 0
+
+    @pytest.mark.asyncio
+    async def test_backoff_holds_no_concurrency_slot(self):
+        """Test each attempt has its own slot and backoff is not latency."""
+        clock = [0.0]
+        statuses = [503, 200]
+        in_flight_during_backoff = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            clock[0] += 1.0
+            if statuses.pop(0) != 200:
+                return httpx.Response(503, json={"error": {"message": "blip"}})
+            return httpx.Response(200, json=fake_completion("Recovered."))
+
+        async def sleep(delay: float) -> None:
+            in_flight_during_backoff.append(limiter.stats()["in_flight"])
+            clock[0] += 10.0
+
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, clock=lambda: clock[0])
+        ai_service = make_ai_service(
+            handler, limiter=limiter, retry_policy=RetryPolicy(sleep=sleep)
+        )
+        result = await ai_service.get_career_advice({"skills": []}, "Next?")
+        await ai_service.close()
+
+        assert result["success"] is True
+        assert in_flight_during_backoff == [0]
+        assert limiter.stats()["successes"] == 1
+        assert limiter.stats()["recent_latency_seconds"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honored_within_budget(self):
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            retry_after = "3" if calls == 1 else "60"
+            return httpx.Response(
+                429,
+                json={"error": {"message": "slow down"}},
+                headers={"retry-after": retry_after},
+            )
+
+        delays = []
+        ai_service = make_ai_service(
+            handler,
+            retry_policy=RetryPolicy(budget=20.0, sleep=record_sleeps(delays)),
+        )
+        result = await ai_service.get_career_advice({"skills": []}, "Next?")
+        await ai_service.close()
+
+        # The second Retry-After would overrun the budget, so it gives up
+        assert result["success"] is False
+        assert calls == 2
+        assert delays == [3.0]
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            return httpx.Response(400, json={"error": {"message": "bad request"}})
+
+        ai_service = make_ai_service(
+            handler, retry_policy=RetryPolicy(sleep=record_sleeps([]))
+        )
+        result = await ai_service.get_career_advice({"skills": []}, "Next?")
+        await ai_service.close()
+
+        assert result["success"] is False
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        calls = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            calls += 1
+            raise httpx.ConnectError("connection refused", request=request)
+
+        ai_service = make_ai_service(
+            handler,
+            retry_policy=RetryPolicy(max_attempts=2, sleep=record_sleeps([])),
+            circuit_breaker=CircuitBreaker(failure_threshold=3, recovery_timeout=60),
+        )
+        first = await ai_service.get_career_advice({"skills": []}, "Q1")
+        second = await ai_service.get_career_advice({"skills": []}, "Q2")
+        third = await ai_service.get_career_advice({"skills": []}, "Q3")
+
+        assert [r["success"] for r in (first, second, third)] == [False] * 3
+        # Two attempts for the first call, one more opens the circuit
+        assert calls == 3
+        assert "Circuit open" in third["error"]
+        assert ai_service.circuit_breaker.stats()["state"] == "open"
+
+        with pytest.raises(CircuitOpenError):
+            async for _ in ai_service.stream_career_advice({"skills": []}, "Q4"):
+                pass
+        await ai_service.close()
+        assert calls == 3
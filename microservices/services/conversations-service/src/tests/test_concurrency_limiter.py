@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from concurrency import AdaptiveConcurrencyLimiter, ConcurrencyLimitExceeded
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def hold(limiter, release: asyncio.Event, log: list, name: str):
+    async with limiter.acquire():
+        log.append(name)
+        await release.wait()
+
+
+class TestAdaptiveConcurrencyLimiter:
+    """Tests for the AIMD limiter around upstream LLM calls."""
+
+    @pytest.mark.asyncio
+    async def test_calls_over_the_limit_wait_in_order(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        release = asyncio.Event()
+        log = []
+        tasks = [
+            asyncio.ensure_future(hold(limiter, release, log, name))
+            for name in ["a", "b", "c", "d"]
+        ]
+        await asyncio.sleep(0)
+
+        assert log == ["a", "b"]
+        assert limiter.stats()["in_flight"] == 2
+        assert limiter.stats()["queued"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert log == ["a", "b", "c", "d"]
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full_or_wait_times_out(self):
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=1, max_limit=1, max_queue=1, queue_timeout=0.05
+        )
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(limiter, release, [], "a"))
+        waiter = asyncio.ensure_future(hold(limiter, release, [], "b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            async with limiter.acquire():
+                pass
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await waiter
+
+        release.set()
+        await holder
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.stats()["timeouts"] == 1
+        assert limiter.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        release = asyncio.Event()
+        holder = asyncio.ensure_future(hold(limiter, release, [], "a"))
+        waiter = asyncio.ensure_future(hold(limiter, release, [], "b"))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+        assert limiter.stats()["queued"] == 0
+        assert limiter.stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout_racing_with_a_release(self):
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=1, max_limit=1, queue_timeout=0.01
+        )
+        holder = limiter.acquire()
+        await holder.__aenter__()
+        waiter = asyncio.ensure_future(hold(limiter, asyncio.Event(), [], "b"))
+        await asyncio.sleep(0)
+        queued = limiter._waiters[0]
+
+        # The wait times out, and the slot is released before the waiter
+        # gets to leave the queue
+        while not queued.done():
+            await asyncio.sleep(0)
+        await holder.__aexit__(None, None, None)
+
+        with pytest.raises(ConcurrencyLimitExceeded):
+            await waiter
+        assert limiter.stats()["queued"] == 0
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_overload_backs_off_once_per_round(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=20, backoff_ratio=0.5, clock=clock
+        )
+
+        async def rate_limited():
+            async with limiter.acquire() as slot:
+                await asyncio.sleep(0)
+                clock.now += 1
+                slot.overloaded()
+
+        # Calls in flight together see the same overload; only one counts
+        await asyncio.gather(*(rate_limited() for _ in range(5)))
+        assert limiter.stats()["limit"] == 10
+        assert limiter.stats()["overloads"] == 5
+
+        await rate_limited()
+        assert limiter.stats()["limit"] == 5
+        assert limiter.stats()["decreases"] == 2
+
+    @pytest.mark.asyncio
+    async def test_grows_while_calls_succeed_at_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=3)
+
+        async def call():
+            async with limiter.acquire():
+                await asyncio.sleep(0)
+
+        for _ in range(20):
+            await asyncio.gather(call(), call())
+
+        assert limiter.stats()["limit"] == 3
+        assert limiter.stats()["successes"] == 40
+
+    @pytest.mark.asyncio
+    async def test_backs_off_when_latency_grows(self):
+        clock = FakeClock()
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=10, backoff_ratio=0.5, latency_tolerance=2.0, clock=clock
+        )
+
+        async def call(latency):
+            async with limiter.acquire():
+                clock.now += latency
+
+        for _ in range(20):
+            await call(1.0)
+        assert limiter.stats()["limit"] == 10
+
+        for _ in range(10):
+            await call(5.0)
+        assert limiter.stats()["limit"] < 10
+        assert limiter.stats()["overloads"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_other_than_overload_do_not_change_the_limit(self):
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4)
+
+        with pytest.raises(ValueError):
+            async with limiter.acquire():
+                raise ValueError("bad request")
+
+        assert limiter.stats()["limit"] == 4
+        assert limiter.stats()["in_flight"] == 0
+        assert limiter.stats()["successes"] == 0
@@ -0,0 +1,164 @@
+import asyncio
+import pytest
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event, func, select
+from concurrency import gather_or_cancel
+from models import Conversation, Message
+from dependencies import get_users_client, get_ai_service
+from tests.fake_services import FakeUsersClient, FakeAIService
+from main import app
+
+
+class SlowUsersClient(FakeUsersClient):
+    """FakeUsersClient that records when each profile lookup starts and ends."""
+
+    def __init__(self, delay: float, timeline: list):
+        super().__init__()
+        self.delay = delay
+        self.timeline = timeline
+
+    async def get_user_profile(self, user_id):
+        self.timeline.append("profile started")
+        await asyncio.sleep(self.delay)
+        self.timeline.append("profile finished")
+        return await super().get_user_profile(user_id)
+
+
+class TestConcurrentTurnSetup:
+    """Tests for persisting the user message while the profile is fetched."""
+
+    def override(self, db_session, user_id, delay=0.05):
+        timeline = []
+        users_client = SlowUsersClient(delay, timeline)
+        users_client.set_user_profile(user_id, {"skills": ["Python"]})
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: FakeAIService()
+
+        def on_statement(conn, cursor, statement, parameters, context, executemany):
+            timeline.append(statement.lstrip().split(None, 1)[0].upper())
+
+        sync_engine = db_session.bind.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", on_statement)
+        return timeline, lambda: event.remove(
+            sync_engine, "before_cursor_execute", on_statement
+        )
+
+    @pytest.mark.asyncio
+    async def test_message_insert_overlaps_profile_fetch(self, client, db_session):
+        """Test the user message is written while the profile lookup is in flight."""
+        user_id = uuid4()
+        conversation = Conversation(id=uuid4(), user_id=user_id, title="Overlap")
+        db_session.add(conversation)
+        await db_session.commit()
+        timeline, stop_recording = self.override(db_session, user_id)
+
+        try:
+            response = await client.post(
+                f"/api/users/{user_id}/conversations/{conversation.id}/message",
+                json={"message": "Hello"},
+            )
+        finally:
+            stop_recording()
+
+        assert response.status_code == 200
+        assert timeline.index("INSERT") < timeline.index("profile finished")
+
+    @pytest.mark.asyncio
+    async def test_first_turn_overlaps_profile_fetch(self, client, db_session):
+        """Test the new conversation and first message are written during the lookup."""
+        user_id = uuid4()
+        timeline, stop_recording = self.override(db_session, user_id)
+
+        try:
+            response = await client.post(
+                f"/api/users/{user_id}/messages", json={"message": "Hello"}
+            )
+        finally:
+            stop_recording()
+
+        assert response.status_code == 200
+        profile_finished = timeline.index("profile finished")
+        assert timeline[:profile_finished].count("INSERT") == 2
+
+    @pytest.mark.asyncio
+    async def test_other_users_conversation_gets_no_message(self, client, db_session):
+        """Test the fused insert writes nothing to a conversation of another user."""
+        owner_id, other_id = uuid4(), uuid4()
+        conversation = Conversation(id=uuid4(), user_id=owner_id, title="Not yours")
+        db_session.add(conversation)
+        await db_session.commit()
+        timeline, stop_recording = self.override(db_session, other_id)
+
+        try:
+            response = await client.post(
+                f"/api/users/{other_id}/conversations/{conversation.id}/message",
+                json={"message": "Hello"},
+            )
+        finally:
+            stop_recording()
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Conversation not found"
+        count = await db_session.scalar(
+            select(func.count())
+            .select_from(Message)
+            .where(Message.conversation_id == conversation.id)
+        )
+        assert count == 0
+
+
+class TestGatherOrCancel:
+    """Unit tests for gather_or_cancel error and cancellation semantics."""
+
+    @pytest.mark.asyncio
+    async def test_returns_results_in_order(self):
+        async def value(v, delay):
+            await asyncio.sleep(delay)
+            return v
+
+        assert await gather_or_cancel(value("a", 0.02), value("b", 0)) == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_the_others(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError("users service down")
+
+        with pytest.raises(RuntimeError):
+            await gather_or_cancel(slow(), failing())
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_caller_cancellation_cancels_children(self):
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        task = asyncio.ensure_future(gather_or_cancel(slow(), slow()))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled.is_set()
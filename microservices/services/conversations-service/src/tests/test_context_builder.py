@@ -0,0 +1,158 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event
+from models import Conversation, Message
+from repositories import MessageRepository
+from services.context_builder import ContextBuilder, estimate_tokens
+from dependencies import get_users_client, get_ai_service, get_context_builder
+from tests.fake_services import FakeUsersClient, FakeAIService
+from main import app
+
+
+async def add_conversation(db_session, contents):
+    """Create a conversation with alternating user/assistant messages."""
+    conversation = Conversation(id=uuid4(), user_id=uuid4(), title="History")
+    db_session.add(conversation)
+    start = datetime.now(timezone.utc) - timedelta(minutes=len(contents))
+    for i, content in enumerate(contents):
+        db_session.add(
+            Message(
+                conversation_id=conversation.id,
+                is_human=i % 2 == 0,
+                content=content,
+                created_at=start + timedelta(seconds=i),
+            )
+        )
+    await db_session.commit()
+    return conversation
+
+
+class TestContextBuilder:
+    """Tests for assembling conversation history within a token budget."""
+
+    @pytest.mark.asyncio
+    async def test_history_is_chronological_with_roles(self, db_session):
+        conversation = await add_conversation(db_session, ["Hi", "Hello!", "Thanks"])
+        builder = ContextBuilder(token_budget=1000)
+
+        history = await builder.build(
+            MessageRepository(db_session, db_session), conversation.id
+        )
+
+        assert history == [
+            {"role": "user", "content": "Hi"},
+            {"role": "assistant", "content": "Hello!"},
+            {"role": "user", "content": "Thanks"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_keeps_newest_messages_within_budget(self, db_session):
+        contents = [f"Message {i}: " + "x" * 200 for i in range(10)]
+        conversation = await add_conversation(db_session, contents)
+        builder = ContextBuilder(token_budget=200)
+
+        history = await builder.build(
+            MessageRepository(db_session, db_session), conversation.id
+        )
+
+        total = sum(estimate_tokens(entry["content"]) + 4 for entry in history)
+        assert total <= 200
+        assert history[-1]["content"] == contents[-1]
+        assert history[-2]["content"] == contents[-2]
+        # The oldest kept message only partly fit and was cut short
+        assert history[0]["content"].endswith("[...]")
+        assert len(history) < len(contents)
+
+    @pytest.mark.asyncio
+    async def test_excludes_current_message(self, db_session):
+        conversation = await add_conversation(db_session, ["Hi", "Hello!", "Thanks"])
+        repository = MessageRepository(db_session, db_session)
+        rows, _ = await repository.get_messages_page(conversation.id, 10)
+        builder = ContextBuilder(token_budget=1000)
+
+        history = await builder.build(
+            repository, conversation.id, exclude_message_id=rows[-1].id
+        )
+
+        assert [entry["content"] for entry in history] == ["Hi", "Hello!"]
+
+    @pytest.mark.asyncio
+    async def test_cached_history_loads_only_new_messages(self, db_session):
+        conversation = await add_conversation(db_session, ["Hi", "Hello!"])
+        repository = MessageRepository(db_session, db_session)
+        builder = ContextBuilder(token_budget=1000)
+        await builder.build(repository, conversation.id)
+
+        await repository.create_message(conversation.id, True, "What next?")
+        await db_session.commit()
+
+        loaded = []
+
+        def on_statement(conn, cursor, statement, parameters, context, executemany):
+            loaded.append(statement)
+
+        sync_engine = db_session.bind.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", on_statement)
+        try:
+            history = await builder.build(repository, conversation.id)
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", on_statement)
+
+        assert [entry["content"] for entry in history] == ["Hi", "Hello!", "What next?"]
+        # One keyset query from the cached cursor, not a full reload
+        assert len(loaded) == 1
+        assert "messages.created_at, messages.seq) >" in loaded[0]
+
+
+class TestFollowUpTurnHistory:
+    """Tests that follow-up turns send earlier messages to the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_follow_up_turn_sends_history(self, client, db_session):
+        conversation = await add_conversation(
+            db_session, ["How do I learn Rust?", "Start with the book."]
+        )
+        users_client = FakeUsersClient()
+        users_client.set_user_profile(conversation.user_id, {"skills": ["Python"]})
+        ai_service = FakeAIService()
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: ai_service
+        app.dependency_overrides[get_context_builder] = lambda: ContextBuilder(
+            token_budget=1000
+        )
+
+        response = await client.post(
+            f"/api/users/{conversation.user_id}/conversations/{conversation.id}/message",
+            json={"message": "And after that?"},
+        )
+
+        assert response.status_code == 200
+        assert ai_service.get_last_call()["question"] == "And after that?"
+        assert ai_service.get_last_call()["history"] == [
+            {"role": "user", "content": "How do I learn Rust?"},
+            {"role": "assistant", "content": "Start with the book."},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_first_turn_sends_no_history(self, client, db_session):
+        user_id = uuid4()
+        users_client = FakeUsersClient()
+        users_client.set_user_profile(user_id, {"skills": ["Python"]})
+        ai_service = FakeAIService()
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: ai_service
+
+        response = await client.post(
+            f"/api/users/{user_id}/messages", json={"message": "Hello"}
+        )
+
+        assert response.status_code == 200
+        assert ai_service.get_last_call()["history"] is None
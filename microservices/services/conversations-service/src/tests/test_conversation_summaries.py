@@ -0,0 +1,200 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Conversation, Message
+from repositories import MessageRepository, SummaryRepository
+from services.context_builder import ContextBuilder
+from services.summarizer import ConversationSummarizer
+from dependencies import (
+    get_users_client,
+    get_ai_service,
+    get_context_builder,
+    get_summarizer,
+)
+from tests.fake_services import FakeUsersClient, FakeAIService
+from main import app
+
+
+async def add_conversation(db_session, count):
+    """Create a conversation with `count` alternating user/assistant messages."""
+    conversation = Conversation(id=uuid4(), user_id=uuid4(), title="Long thread")
+    db_session.add(conversation)
+    start = datetime.now(timezone.utc) - timedelta(minutes=count)
+    for i in range(count):
+        db_session.add(
+            Message(
+                conversation_id=conversation.id,
+                is_human=i % 2 == 0,
+                content=f"Message {i}",
+                created_at=start + timedelta(seconds=i),
+            )
+        )
+    await db_session.commit()
+    return conversation
+
+
+def make_summarizer(db_session, ai_service, context_builder=None, **kwargs):
+    """Summarizer whose worker sessions share the test connection."""
+    return ConversationSummarizer(
+        ai_service,
+        context_builder or ContextBuilder(token_budget=1000),
+        session_factory=lambda: AsyncSession(
+            bind=db_session.bind, expire_on_commit=False
+        ),
+        every_messages=kwargs.pop("every_messages", 10),
+        keep_recent_messages=kwargs.pop("keep_recent_messages", 6),
+        **kwargs,
+    )
+
+
+class TestConversationSummarizer:
+    """Tests for folding older messages into a rolling summary."""
+
+    @pytest.mark.asyncio
+    async def test_summarizes_all_but_recent_messages(self, db_session):
+        conversation = await add_conversation(db_session, 20)
+        ai_service = FakeAIService()
+        summarizer = make_summarizer(db_session, ai_service)
+
+        assert await summarizer.summarize(conversation.id) is False
+
+        summary = await SummaryRepository(db_session, db_session).get_summary(
+            conversation.id
+        )
+        assert summary.summary_text == "Summary of 14 messages."
+        assert ai_service.get_last_call()["messages"][-1]["content"] == "Message 13"
+        assert ai_service.get_last_call()["previous_summary"] is None
+
+    @pytest.mark.asyncio
+    async def test_waits_for_enough_new_messages(self, db_session):
+        conversation = await add_conversation(db_session, 15)
+        ai_service = FakeAIService()
+        summarizer = make_summarizer(db_session, ai_service)
+
+        await summarizer.summarize(conversation.id)
+
+        assert ai_service.calls == []
+        summary = await SummaryRepository(db_session, db_session).get_summary(
+            conversation.id
+        )
+        assert summary is None
+
+    @pytest.mark.asyncio
+    async def test_next_summary_extends_the_previous_one(self, db_session):
+        conversation = await add_conversation(db_session, 16)
+        ai_service = FakeAIService()
+        summarizer = make_summarizer(db_session, ai_service)
+        await summarizer.summarize(conversation.id)
+
+        repository = MessageRepository(db_session, db_session)
+        for i in range(10):
+            await repository.create_message(conversation.id, i % 2 == 0, f"More {i}")
+        await db_session.commit()
+        await summarizer.summarize(conversation.id)
+
+        last_call = ai_service.get_last_call()
+        assert last_call["previous_summary"] == "Summary of 10 messages."
+        assert [m["content"] for m in last_call["messages"]][:2] == [
+            "Message 10",
+            "Message 11",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_history_is_summary_plus_recent_turns(self, db_session):
+        conversation = await add_conversation(db_session, 20)
+        context_builder = ContextBuilder(token_budget=1000)
+        summarizer = make_summarizer(db_session, FakeAIService(), context_builder)
+        messages = MessageRepository(db_session, db_session)
+        summaries = SummaryRepository(db_session, db_session)
+        # Cache the history before the summary exists
+        await context_builder.build(
+            messages, conversation.id, summary_repository=summaries
+        )
+
+        await summarizer.summarize(conversation.id)
+        history = await context_builder.build(
+            messages, conversation.id, summary_repository=summaries
+        )
+
+        assert history[0]["role"] == "system"
+        assert history[0]["content"].endswith("Summary of 14 messages.")
+        assert [entry["content"] for entry in history[1:]] == [
+            f"Message {i}" for i in range(14, 20)
+        ]
+
+
+class TestSummarizerQueue:
+    """Tests for the background worker queue."""
+
+    @pytest.mark.asyncio
+    async def test_worker_summarizes_queued_conversations(self, db_session):
+        conversation = await add_conversation(db_session, 20)
+        summarizer = make_summarizer(db_session, FakeAIService())
+        summarizer.start()
+        try:
+            assert summarizer.enqueue(conversation.id) is True
+            assert summarizer.enqueue(conversation.id) is True  # already queued
+            assert summarizer.stats()["queued"] == 1
+            await summarizer.drain()
+        finally:
+            await summarizer.stop()
+
+        assert summarizer.stats()["summarized"] == 1
+
+    @pytest.mark.asyncio
+    async def test_enqueue_drops_when_not_running_or_full(self, db_session):
+        summarizer = make_summarizer(db_session, FakeAIService(), queue_size=1)
+        assert summarizer.enqueue(uuid4()) is False
+
+        summarizer.start()
+        try:
+            summarizer.enqueue(uuid4())
+            assert summarizer.enqueue(uuid4()) is False
+            assert summarizer.stats()["dropped"] == 1
+        finally:
+            await summarizer.stop()
+
+    @pytest.mark.asyncio
+    async def test_chat_turn_does_not_wait_for_summary(self, client, db_session):
+        """Test the response is sent while the summary LLM call is still running."""
+        conversation = await add_conversation(db_session, 20)
+        release = asyncio.Event()
+
+        class SlowSummaryAIService(FakeAIService):
+            async def summarize_conversation(self, messages, previous_summary=None):
+                await release.wait()
+                return await super().summarize_conversation(messages, previous_summary)
+
+        ai_service = SlowSummaryAIService()
+        summarizer = make_summarizer(db_session, ai_service)
+        users_client = FakeUsersClient()
+        users_client.set_user_profile(conversation.user_id, {"skills": ["Python"]})
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: ai_service
+        app.dependency_overrides[get_context_builder] = lambda: ContextBuilder()
+        app.dependency_overrides[get_summarizer] = lambda: summarizer
+        summarizer.start()
+        try:
+            response = await client.post(
+                f"/api/users/{conversation.user_id}"
+                f"/conversations/{conversation.id}/message",
+                json={"message": "And then?"},
+            )
+            assert response.status_code == 200
+            assert summarizer.stats()["summarized"] == 0
+
+            release.set()
+            await summarizer.drain()
+        finally:
+            await summarizer.stop()
+
+        assert summarizer.stats()["summarized"] == 1
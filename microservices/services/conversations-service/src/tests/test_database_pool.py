@@ -0,0 +1,34 @@
+import pytest
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from config import settings
+from database import engine
+
+
+class TestDatabasePool:
+    """Tests for the settings-driven engine pool and its metrics."""
+
+    def test_engine_uses_pool_settings(self):
+        """Test the shared engine is built from Settings rather than defaults."""
+        assert engine.echo is settings.db_echo
+        assert engine.pool.size() == settings.db_pool_size
+        assert engine.pool._max_overflow == settings.db_max_overflow
+        assert engine.pool._pre_ping is settings.db_pool_pre_ping
+        assert engine.pool._recycle == settings.db_pool_recycle
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_exposes_pool_saturation(self, client):
+        """Test /metrics reports connection pool usage."""
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        stats = response.json()["db_pool"]
+        assert stats["pool_size"] == settings.db_pool_size
+        assert stats["capacity"] == settings.db_pool_size + settings.db_max_overflow
+        for gauge in ["checked_in", "checked_out", "overflow", "utilization"]:
+            assert gauge in stats
@@ -8,6 +8,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from models import Conversation, Message
+from repositories import ConversationRepository
 
 # Fixtures are automatically discovered from conftest.py
 # No need to import client, db_session - pytest will find them
@@ -172,3 +173,20 @@ class TestGetConversations:
         # Test with invalid UUID format
         response = await client.get("/api/users/invalid-uuid/conversations")
         assert response.status_code == 422  # Validation Error
+
+    @pytest.mark.asyncio
+    async def test_get_conversations_loads_projected_rows(self, db_session):
+        """Test the list query returns plain column rows, not tracked entities."""
+        user_id = uuid4()
+        db_session.add(Conversation(id=uuid4(), user_id=user_id, title="Projected"))
+        await db_session.flush()
+        db_session.expunge_all()
+
+        conversations = await ConversationRepository(
+            db_session, db_session
+        ).get_conversations(user_id)
+
+        assert len(conversations) == 1
+        assert not isinstance(conversations[0], Conversation)
+        assert conversations[0]._fields == ("id", "title", "created_at", "user_id")
+        assert len(db_session.identity_map) == 0
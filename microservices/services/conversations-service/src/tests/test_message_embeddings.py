@@ -0,0 +1,273 @@
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Conversation, Message
+from repositories import EmbeddingRepository
+from services.embeddings import HashingEmbedder, chunk_text
+from services.embedding_indexer import MessageIndexer
+from services.retrieval import PastMessageRetriever
+from dependencies import (
+    get_users_client,
+    get_ai_service,
+    get_message_indexer,
+    get_retriever,
+)
+from tests.fake_services import FakeUsersClient, FakeAIService
+from main import app
+
+
+def make_indexer(db_session, **kwargs):
+    """Indexer whose worker sessions share the test connection."""
+    return MessageIndexer(
+        HashingEmbedder(),
+        session_factory=lambda: AsyncSession(
+            bind=db_session.bind, expire_on_commit=False
+        ),
+        **kwargs,
+    )
+
+
+def past_message(user_id, content, conversation_id=None, is_human=True):
+    return SimpleNamespace(
+        id=uuid4(),
+        conversation_id=conversation_id or uuid4(),
+        is_human=is_human,
+        content=content,
+    )
+
+
+async def index_messages(db_session, user_id, messages):
+    indexer = make_indexer(db_session)
+    await indexer.index(
+        [
+            {
+                "message_id": message.id,
+                "conversation_id": message.conversation_id,
+                "user_id": user_id,
+                "is_human": message.is_human,
+                "content": message.content,
+            }
+            for message in messages
+        ]
+    )
+    return indexer
+
+
+class TestEmbeddings:
+    """Tests for chunking and the fallback embedder."""
+
+    def test_short_text_is_one_chunk(self):
+        assert chunk_text("  How do I become a data engineer?  ") == [
+            "How do I become a data engineer?"
+        ]
+        assert chunk_text("   ") == []
+
+    def test_long_text_is_split_at_whitespace_with_overlap(self):
+        text = " ".join(f"word{i}" for i in range(100))
+        chunks = chunk_text(text, max_chars=100, overlap=20)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert all(chunk.split()[0] in text.split() for chunk in chunks)
+        # Each chunk starts inside the previous one
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.split()[0] in previous.split()
+        assert chunks[-1].endswith("word99")
+
+    def test_hashing_embedder_ranks_by_word_overlap(self):
+        embedder = HashingEmbedder()
+        question, close, far = embedder.embed(
+            [
+                "How do I move from data analysis into data engineering?",
+                "I want to move into data engineering from analysis",
+                "What salary should I ask for as a nurse?",
+            ]
+        )
+
+        def similarity(a, b):
+            return sum(x * y for x, y in zip(a, b))
+
+        assert len(question) == embedder.dimensions
+        assert similarity(question, question) == pytest.approx(1.0)
+        assert similarity(question, close) > similarity(question, far)
+
+
+class TestMessageRetrieval:
+    """Tests for indexing messages and searching them per user."""
+
+    @pytest.mark.asyncio
+    async def test_index_stores_one_row_per_chunk(self, db_session):
+        user_id = uuid4()
+        indexer = await index_messages(
+            db_session,
+            user_id,
+            [past_message(user_id, "Short one"), past_message(user_id, "x " * 1500)],
+        )
+
+        assert indexer.stats()["indexed_messages"] == 2
+        assert indexer.stats()["indexed_chunks"] > 2
+        assert indexer.stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retrieves_nearest_messages_of_the_same_user(self, db_session):
+        user_id = uuid4()
+        current = uuid4()
+        await index_messages(
+            db_session,
+            user_id,
+            [
+                past_message(user_id, "I am learning Spark for data engineering"),
+                past_message(
+                    user_id,
+                    "Data engineering roles want Spark and Airflow",
+                    is_human=False,
+                ),
+                past_message(user_id, "My cat likes to sleep all day"),
+                past_message(
+                    user_id, "Spark for data engineering again", conversation_id=current
+                ),
+            ],
+        )
+        other_user = uuid4()
+        await index_messages(
+            db_session,
+            other_user,
+            [past_message(other_user, "I am learning Spark for data engineering")],
+        )
+
+        retriever = PastMessageRetriever(HashingEmbedder(), top_k=5, max_distance=0.9)
+        related = await retriever.retrieve(
+            EmbeddingRepository(db_session, db_session),
+            user_id,
+            "Should I learn Spark for data engineering?",
+            exclude_conversation_id=current,
+        )
+
+        assert related == [
+            {"role": "user", "content": "I am learning Spark for data engineering"},
+            {
+                "role": "assistant",
+                "content": "Data engineering roles want Spark and Airflow",
+            },
+        ]
+
+    @pytest.mark.asyncio
+    async def test_only_matches_chunks_of_the_same_embedder(self, db_session):
+        """Test vectors from another embedder are never compared."""
+        user_id = uuid4()
+        await index_messages(
+            db_session, user_id, [past_message(user_id, "I am learning Spark")]
+        )
+        other_model = HashingEmbedder()
+        other_model.name = "other-model"
+        repository = EmbeddingRepository(db_session, db_session)
+
+        for embedder, expected in ((HashingEmbedder(), 1), (other_model, 0)):
+            retriever = PastMessageRetriever(embedder, max_distance=0.9)
+            related = await retriever.retrieve(repository, user_id, "Learning Spark?")
+            assert len(related) == expected
+
+    @pytest.mark.asyncio
+    async def test_worker_indexes_queued_messages(self, db_session):
+        user_id = uuid4()
+        indexer = make_indexer(db_session)
+        assert indexer.enqueue(past_message(user_id, "Not started"), user_id) is False
+
+        indexer.start()
+        try:
+            for i in range(3):
+                assert indexer.enqueue(past_message(user_id, f"Message {i}"), user_id)
+            await indexer.drain()
+        finally:
+            await indexer.stop()
+
+        assert indexer.stats()["indexed_messages"] == 3
+        assert indexer.stats()["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_chat_turn_sends_related_messages(self, client, db_session):
+        conversation = Conversation(id=uuid4(), user_id=uuid4(), title="New thread")
+        db_session.add(conversation)
+        db_session.add(
+            Message(conversation_id=conversation.id, is_human=True, content="Hi")
+        )
+        await db_session.commit()
+        await index_messages(
+            db_session,
+            conversation.user_id,
+            [past_message(conversation.user_id, "I want to become a data engineer")],
+        )
+
+        ai_service = FakeAIService()
+        users_client = FakeUsersClient()
+        users_client.set_user_profile(conversation.user_id, {"skills": ["SQL"]})
+        indexer = make_indexer(db_session)
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: ai_service
+        app.dependency_overrides[get_retriever] = lambda: PastMessageRetriever(
+            HashingEmbedder(), max_distance=0.9
+        )
+        app.dependency_overrides[get_message_indexer] = lambda: indexer
+        indexer.start()
+        try:
+            response = await client.post(
+                f"/api/users/{conversation.user_id}"
+                f"/conversations/{conversation.id}/message",
+                json={"message": "How do I become a data engineer?"},
+            )
+            assert response.status_code == 200
+            await indexer.drain()
+        finally:
+            await indexer.stop()
+
+        assert ai_service.get_last_call()["related"] == [
+            {"role": "user", "content": "I want to become a data engineer"}
+        ]
+        assert indexer.stats()["indexed_messages"] == 2
+
+    @pytest.mark.asyncio
+    async def test_chat_turn_is_answered_when_retrieval_fails(self, client, db_session):
+        """Test a failed search leaves out related messages, not the answer."""
+        conversation = Conversation(id=uuid4(), user_id=uuid4(), title="New thread")
+        db_session.add(conversation)
+        await db_session.commit()
+        await index_messages(
+            db_session,
+            conversation.user_id,
+            [past_message(conversation.user_id, "I want to become a data engineer")],
+        )
+
+        class WrongDimensionsEmbedder(HashingEmbedder):
+            def embed(self, texts):
+                # pgvector cannot compare it with the indexed vectors
+                return [[1.0, 0.0, 0.0] for _ in texts]
+
+        ai_service = FakeAIService()
+        users_client = FakeUsersClient()
+        users_client.set_user_profile(conversation.user_id, {"skills": ["SQL"]})
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: ai_service
+        app.dependency_overrides[get_retriever] = lambda: PastMessageRetriever(
+            WrongDimensionsEmbedder()
+        )
+        app.dependency_overrides[get_message_indexer] = lambda: make_indexer(
+            db_session
+        )
+
+        response = await client.post(
+            f"/api/users/{conversation.user_id}"
+            f"/conversations/{conversation.id}/message",
+            json={"message": "How do I become a data engineer?"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+        assert ai_service.get_last_call()["related"] is None
@@ -0,0 +1,183 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event
+from models import Conversation, Message
+
+# Fixtures are automatically discovered from conftest.py
+
+
+class TestPaginateConversationMessages:
+    """Integration tests for keyset pagination of conversation messages."""
+
+    async def seed_conversation(self, db_session, count: int):
+        """Create a conversation with `count` messages; pairs share a timestamp."""
+        user_id = uuid4()
+        conversation_id = uuid4()
+        db_session.add(
+            Conversation(id=conversation_id, user_id=user_id, title="Long Conversation")
+        )
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(count):
+            db_session.add(
+                Message(
+                    id=uuid4(),
+                    conversation_id=conversation_id,
+                    is_human=i % 2 == 0,
+                    content=f"message {i}",
+                    created_at=start + timedelta(seconds=i // 2),
+                )
+            )
+            await db_session.flush()
+        return user_id, conversation_id
+
+    def url(self, user_id, conversation_id) -> str:
+        return f"/api/users/{user_id}/conversations/{conversation_id}/messages"
+
+    @pytest.mark.asyncio
+    async def test_default_page_is_most_recent(self, client, db_session):
+        """Test the first page holds the latest messages, oldest first."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 7)
+
+        response = await client.get(
+            self.url(user_id, conversation_id), params={"limit": 3}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [m["content"] for m in data["messages"]] == [
+            "message 4",
+            "message 5",
+            "message 6",
+        ]
+        assert data["prev_cursor"] is not None
+        assert data["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_paging_backwards_visits_every_message_once(self, client, db_session):
+        """Test following prev_cursor walks the whole history without gaps."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 7)
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            data = (await client.get(self.url(user_id, conversation_id), params=params)).json()
+            seen = [m["content"] for m in data["messages"]] + seen
+            if data["prev_cursor"] is None:
+                break
+            params = {"limit": 2, "before": data["prev_cursor"]}
+
+        assert seen == [f"message {i}" for i in range(7)]
+
+    @pytest.mark.asyncio
+    async def test_paging_forwards_with_after(self, client, db_session):
+        """Test next_cursor returns the messages newer than a page."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 7)
+
+        latest = (
+            await client.get(self.url(user_id, conversation_id), params={"limit": 3})
+        ).json()
+        older = (
+            await client.get(
+                self.url(user_id, conversation_id),
+                params={"limit": 3, "before": latest["prev_cursor"]},
+            )
+        ).json()
+        assert [m["content"] for m in older["messages"]] == [
+            "message 1",
+            "message 2",
+            "message 3",
+        ]
+
+        newer = (
+            await client.get(
+                self.url(user_id, conversation_id),
+                params={"limit": 2, "after": older["next_cursor"]},
+            )
+        ).json()
+        assert [m["content"] for m in newer["messages"]] == ["message 4", "message 5"]
+        assert newer["prev_cursor"] is not None
+        assert newer["next_cursor"] is not None
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, client, db_session):
+        """Test malformed cursors and conflicting cursors are rejected."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 1)
+
+        response = await client.get(
+            self.url(user_id, conversation_id), params={"before": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            self.url(user_id, conversation_id), params={"before": "a", "after": "b"}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_limit_is_bounded(self, client, db_session):
+        """Test page sizes outside 1..200 are rejected."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 1)
+
+        for limit in [0, 201]:
+            response = await client.get(
+                self.url(user_id, conversation_id), params={"limit": limit}
+            )
+            assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_page_and_ownership_in_one_query(self, client, db_session):
+        """Test a page is served with a single SELECT that also checks ownership."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 3)
+        statements = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        sync_engine = db_session.bind.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_selects)
+        try:
+            response = await client.get(self.url(user_id, conversation_id))
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_selects)
+
+        assert response.status_code == 200
+        assert len(response.json()["messages"]) == 3
+        assert len(statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_other_users_conversation_is_not_found(self, client, db_session):
+        """Test the fused query hides messages of conversations owned by others."""
+        _, conversation_id = await self.seed_conversation(db_session, 3)
+
+        response = await client.get(self.url(uuid4(), conversation_id))
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Conversation not found"
+
+    @pytest.mark.asyncio
+    async def test_page_past_the_end_is_empty(self, client, db_session):
+        """Test an owned conversation with no messages past a cursor is an empty page."""
+        user_id, conversation_id = await self.seed_conversation(db_session, 2)
+        latest = (
+            await client.get(self.url(user_id, conversation_id), params={"limit": 1})
+        ).json()
+        assert [m["content"] for m in latest["messages"]] == ["message 1"]
+
+        # prev_cursor points at the newest message, so nothing comes after it
+        response = await client.get(
+            self.url(user_id, conversation_id),
+            params={"after": latest["prev_cursor"]},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["messages"] == []
+        assert response.json()["next_cursor"] is None
@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert, text
+from sqlalchemy.dialects import postgresql
+from models import Conversation, Message
+from repositories import ConversationRepository, MessageRepository
+
+USERS = 500
+CONVERSATIONS_PER_USER = 10
+MESSAGES_PER_CONVERSATION = 20
+
+
+def index_names(plan: dict) -> set:
+    """Collect every index referenced anywhere in an EXPLAIN (FORMAT JSON) plan."""
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= index_names(child)
+    return names
+
+
+class RecordingSession:
+    """Read session that keeps every statement a repository executes on it."""
+
+    def __init__(self, session):
+        self.session = session
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return await self.session.execute(statement, *args, **kwargs)
+
+
+async def explain(db_session, statement) -> dict:
+    """EXPLAIN a SQLAlchemy statement as compiled for PostgreSQL."""
+    sql = statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    connection = await db_session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+    return result.scalar()[0]["Plan"]
+
+
+class TestQueryPlans:
+    """EXPLAIN-based checks that the hot list queries use their composite indexes."""
+
+    async def seed(self, db_session):
+        """Seed enough users, conversations and messages for the planner to prefer indexes."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        conversations, messages = [], []
+        for u in range(USERS):
+            user_id = uuid4()
+            for c in range(CONVERSATIONS_PER_USER):
+                conversation_id = uuid4()
+                created_at = start + timedelta(minutes=u * CONVERSATIONS_PER_USER + c)
+                conversations.append(
+                    {
+                        "id": conversation_id,
+                        "user_id": user_id,
+                        "title": "Seeded",
+                        "created_at": created_at,
+                    }
+                )
+                if c == 0:
+                    messages.extend(
+                        {
+                            "id": uuid4(),
+                            "conversation_id": conversation_id,
+                            "is_human": m % 2 == 0,
+                            "content": f"message {m}",
+                            "created_at": created_at + timedelta(seconds=m),
+                        }
+                        for m in range(MESSAGES_PER_CONVERSATION)
+                    )
+
+        await db_session.execute(insert(Conversation), conversations)
+        await db_session.execute(insert(Message), messages)
+        await db_session.execute(text("ANALYZE conversations"))
+        await db_session.execute(text("ANALYZE messages"))
+        return conversations[0]
+
+    @pytest.mark.asyncio
+    async def test_query_plans_use_composite_indexes(self, db_session):
+        """Test the conversations list and message page queries are index scans."""
+        conversation = await self.seed(db_session)
+        read_db = RecordingSession(db_session)
+
+        # EXPLAIN the statements the repositories build, as they execute them
+        await ConversationRepository(db_session, read_db).get_conversations(
+            conversation["user_id"]
+        )
+        await MessageRepository(db_session, read_db).get_owned_messages_page(
+            conversation["id"], conversation["user_id"], limit=50
+        )
+        conversations_query, messages_query = read_db.statements
+
+        conversations_plan = await explain(db_session, conversations_query)
+        assert "ix_conversations_user_id_created_at" in index_names(conversations_plan)
+
+        messages_plan = await explain(db_session, messages_query)
+        assert "ix_messages_conversation_id_created_at_seq" in index_names(messages_plan)
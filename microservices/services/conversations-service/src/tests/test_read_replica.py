@@ -0,0 +1,83 @@
+import pytest
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+import database
+from database import HAS_WRITES, ReadSession, get_read_db
+from models import Conversation
+from repositories import ConversationRepository
+
+
+@pytest.fixture
+def replica(db_engine, monkeypatch):
+    """Stand in for a replica with separate sessions on the test database."""
+    sessions = []
+
+    def make_session():
+        session = AsyncSession(bind=db_engine, expire_on_commit=False)
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(database, "AsyncReadSessionLocal", make_session)
+    return sessions
+
+
+class TestReadReplica:
+    """Tests for routing read-only queries to a replica session."""
+
+    @pytest.mark.asyncio
+    async def test_without_replica_reads_use_primary_session(self, db_session):
+        """Test get_read_db yields the request's own session when unconfigured."""
+        dependency = get_read_db(db_session)
+        assert await dependency.__anext__() is db_session
+
+    @pytest.mark.asyncio
+    async def test_reads_go_to_replica_until_primary_writes(self, db_session, replica):
+        """Test the replica serves reads until the request writes, then the primary."""
+        dependency = get_read_db(db_session)
+        read_db = await dependency.__anext__()
+        assert isinstance(read_db, ReadSession)
+
+        assert read_db.session is not db_session
+        assert len(replica) == 1
+
+        repository = ConversationRepository(db_session, read_db)
+        conversation = await repository.create_conversation(uuid4(), "Fresh")
+
+        assert db_session.info[HAS_WRITES] is True
+        assert read_db.session is db_session
+        # The uncommitted row is only visible because the read hit the primary
+        conversations = await repository.get_conversations(conversation.user_id)
+        assert [c.id for c in conversations] == [conversation.id]
+
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_core_dml_marks_session_as_written(self, db_session, replica):
+        """Test INSERT statements executed without a flush also pin reads."""
+        read_db = ReadSession(db_session)
+        await db_session.execute(
+            insert(Conversation).values(id=uuid4(), user_id=uuid4(), title="Core")
+        )
+
+        assert read_db.session is db_session
+        assert replica == []
+
+    @pytest.mark.asyncio
+    async def test_selects_do_not_mark_session_as_written(self, db_session, replica):
+        """Test plain reads on the primary keep later reads on the replica."""
+        read_db = ReadSession(db_session)
+        await db_session.execute(select(Conversation).limit(1))
+
+        assert HAS_WRITES not in db_session.info
+        await read_db.execute(select(Conversation).limit(1))
+        assert len(replica) == 1
+        await read_db.close()
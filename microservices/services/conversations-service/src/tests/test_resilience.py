@@ -0,0 +1,195 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgePolicy,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Transient(Exception):
+    pass
+
+
+def failing(errors: list, result="ok"):
+    """Callable raising the given errors in turn, then returning `result`."""
+    calls = []
+
+    async def fn():
+        calls.append(len(calls))
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    return fn, calls
+
+
+async def no_sleep(delay: float) -> None:
+    pass
+
+
+class TestRetryPolicy:
+    """Tests for jittered exponential backoff retries."""
+
+    def test_parse_retry_after(self):
+        in_ten_seconds = datetime.now(timezone.utc) + timedelta(seconds=10)
+
+        assert parse_retry_after("2") == 2.0
+        assert 8 < parse_retry_after(format_datetime(in_ten_seconds, usegmt=True)) <= 10
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_backoff_is_jittered_and_capped(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=4.0, rng=lambda: 1.0)
+        assert [policy.backoff(n) for n in range(5)] == [0.5, 1.0, 2.0, 4.0, 4.0]
+
+        policy = RetryPolicy(base_delay=0.5, rng=lambda: 0.25)
+        assert policy.backoff(2) == 0.5
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        fn, calls = failing([Transient(), Transient()])
+        policy = RetryPolicy(max_attempts=3, sleep=no_sleep)
+
+        assert await policy.call(fn, lambda e: isinstance(e, Transient)) == "ok"
+        assert len(calls) == 3
+        assert policy.stats()["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts_or_budget(self):
+        retryable = lambda e: isinstance(e, Transient)  # noqa: E731
+        fn, calls = failing([Transient()] * 5)
+        with pytest.raises(Transient):
+            await RetryPolicy(max_attempts=3, sleep=no_sleep).call(fn, retryable)
+        assert len(calls) == 3
+
+        fn, calls = failing([Transient()] * 5)
+        policy = RetryPolicy(max_attempts=5, budget=1.0, sleep=no_sleep)
+        with pytest.raises(Transient):
+            await policy.call(fn, retryable, retry_after=lambda e: 0.6)
+        assert len(calls) == 2
+        assert policy.stats()["exhausted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_raised_at_once(self):
+        fn, calls = failing([ValueError("bad request")])
+        with pytest.raises(ValueError):
+            await RetryPolicy(sleep=no_sleep).call(
+                fn, lambda e: isinstance(e, Transient)
+            )
+        assert len(calls) == 1
+
+
+class TestHedgePolicy:
+    """Tests for hedged requests to slow dependencies."""
+
+    def test_hedge_delay_follows_recent_latencies(self):
+        policy = HedgePolicy(initial_delay=0.2, min_delay=0.02, min_samples=10)
+        assert policy.hedge_delay() == 0.2
+
+        policy._latencies.extend([0.01] * 9 + [0.5])
+        assert policy.hedge_delay() == 0.5
+
+        policy._latencies.extend([0.001] * 200)
+        assert policy.hedge_delay() == 0.02
+
+    @pytest.mark.asyncio
+    async def test_fast_calls_are_not_hedged(self):
+        policy = HedgePolicy(initial_delay=0.5)
+        fn, calls = failing([])
+
+        assert await policy.call(fn) == "ok"
+        assert len(calls) == 1
+        assert policy.stats()["hedges"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_attempt_is_hedged_at_once(self):
+        policy = HedgePolicy(initial_delay=10)
+        fn, calls = failing([Transient()])
+
+        assert await asyncio.wait_for(policy.call(fn), 1) == "ok"
+        assert len(calls) == 2
+        assert policy.stats()["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_raises_when_every_attempt_fails_or_times_out(self):
+        policy = HedgePolicy(attempt_timeout=0.05, initial_delay=0.01)
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await policy.call(hang)
+        assert policy.stats()["attempt_timeouts"] == 2
+
+        fn, _ = failing([Transient(), Transient()])
+        with pytest.raises(Transient):
+            await policy.call(fn)
+
+
+class TestCircuitBreaker:
+    """Tests for failing fast while a dependency is down."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_consecutive_failures(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30, clock=clock)
+        fn, calls = failing([Transient()] * 3)
+
+        for _ in range(3):
+            with pytest.raises(Transient):
+                await breaker.call(fn)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(fn)
+
+        assert len(calls) == 3
+        assert breaker.stats()["state"] == "open"
+        assert breaker.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_half_open_trial_closes_or_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30, clock=clock)
+        with pytest.raises(Transient):
+            await breaker.call(failing([Transient()])[0])
+
+        clock.now = 30
+        assert breaker.state == "half_open"
+        with pytest.raises(Transient):
+            await breaker.call(failing([Transient()])[0])
+        assert breaker.state == "open"
+
+        clock.now = 60
+        assert await breaker.call(failing([])[0]) == "ok"
+        assert breaker.state == "closed"
+        assert breaker.stats()["opened"] == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_that_are_not_failures_do_not_count(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        fn, _ = failing([ValueError("bad request")] * 3)
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await breaker.call(fn, is_failure=lambda e: isinstance(e, Transient))
+
+        assert breaker.state == "closed"
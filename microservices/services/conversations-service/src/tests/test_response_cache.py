@@ -0,0 +1,141 @@
+import asyncio
+import time
+import pytest
+import httpx
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from openai import AsyncOpenAI
+from resilience import RetryPolicy
+from career_prompts import CAREER_ADVISOR_SYSTEM_PROMPT
+from services.ai_service import AIService
+from services.response_cache import ResponseCache
+from tests.test_ai_service import fake_completion
+
+UPSTREAM_LATENCY = 0.1
+PROFILE = {
+    "skills": ["Python", "SQL"],
+    "years_experience": "3",
+    "career_goals": "Lead",
+}
+VOCABULARY = ["become", "tech", "lead", "how", "do", "i", "salary", "negotiate"]
+
+
+def bag_of_words(text: str) -> list:
+    """Toy embedder: word counts over a tiny vocabulary."""
+    words = text.lower().replace("?", "").split()
+    return [float(words.count(word)) for word in VOCABULARY]
+
+
+def make_cached_ai_service(status=200, embedder=None):
+    """AIService with a response cache whose fake provider counts requests."""
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        if status != 200:
+            return httpx.Response(status, json={"error": {"message": "unavailable"}})
+        return httpx.Response(200, json=fake_completion(f"Answer {len(requests)}"))
+
+    client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://fake-llm/v1",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        max_retries=0,
+    )
+    response_cache = ResponseCache(CAREER_ADVISOR_SYSTEM_PROMPT, embedder=embedder)
+    ai_service = AIService(
+        client, response_cache=response_cache, retry_policy=RetryPolicy(max_attempts=1)
+    )
+    return ai_service, requests
+
+
+class TestResponseCache:
+    """Tests for caching career advice answers in front of the LLM."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_is_served_from_cache(self):
+        ai_service, requests = make_cached_ai_service()
+        first = await ai_service.get_career_advice(PROFILE, "How do I become a lead?")
+
+        start = time.perf_counter()
+        second = await ai_service.get_career_advice(
+            {
+                "skills": ["sql", "python"],
+                "years_experience": 3,
+                "career_goals": "lead",
+            },
+            "  how do I become a LEAD ",
+        )
+        elapsed = time.perf_counter() - start
+        await ai_service.close()
+
+        assert second == first
+        assert len(requests) == 1
+        assert elapsed < UPSTREAM_LATENCY / 10
+        assert ai_service.response_cache.stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_different_profile_or_question_misses(self):
+        ai_service, requests = make_cached_ai_service()
+        await ai_service.get_career_advice(PROFILE, "How do I become a lead?")
+        await ai_service.get_career_advice(
+            {**PROFILE, "skills": ["Go"]}, "How do I become a lead?"
+        )
+        await ai_service.get_career_advice(PROFILE, "How do I negotiate salary?")
+        await ai_service.close()
+
+        assert len(requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_questions_share_one_call(self):
+        ai_service, requests = make_cached_ai_service()
+        results = await asyncio.gather(
+            *(ai_service.get_career_advice(PROFILE, "Next?") for _ in range(5))
+        )
+        await ai_service.close()
+
+        assert len(requests) == 1
+        assert all(result == results[0] for result in results)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        ai_service, requests = make_cached_ai_service(status=503)
+        first = await ai_service.get_career_advice(PROFILE, "Next?")
+        second = await ai_service.get_career_advice(PROFILE, "Next?")
+        await ai_service.close()
+
+        assert first["success"] is False and second["success"] is False
+        assert len(requests) == 2
+        assert len(ai_service.response_cache.cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_questions_with_history_bypass_cache(self):
+        ai_service, requests = make_cached_ai_service()
+        history = [{"role": "user", "content": "Hi"}]
+        await ai_service.get_career_advice(PROFILE, "Next?", history=history)
+        await ai_service.get_career_advice(PROFILE, "Next?", history=history)
+        await ai_service.close()
+
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_similar_question_is_served_by_similarity_tier(self):
+        ai_service, requests = make_cached_ai_service(embedder=bag_of_words)
+        ask = ai_service.get_career_advice
+        first = await ask(PROFILE, "How do I become tech lead?")
+        similar = await ask(PROFILE, "How do I become a tech lead")
+        other = await ask(PROFILE, "How do I negotiate salary?")
+        await ai_service.close()
+
+        assert similar == first
+        assert other != first
+        assert len(requests) == 2
+        stats = ai_service.response_cache.stats()
+        assert stats["similar_hits"] == 1
+        assert stats["similarity_tier"] is True
@@ -0,0 +1,127 @@
+import json
+import pytest
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from models import Conversation
+from dependencies import get_users_client, get_ai_service
+from tests.fake_services import FakeUsersClient, FakeAIService
+from main import app
+
+# Fixtures are automatically discovered from conftest.py
+
+
+def parse_sse(body: str) -> list:
+    """Parse a text/event-stream body into (event, data) tuples."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestStreamConversationMessage:
+    """Integration tests for the POST /users/{user_id}/conversations/{conversation_id}/message/stream endpoint."""
+
+    def setup_method(self):
+        """Set up fake services for all tests in this class."""
+        self.user_id = uuid4()
+        self.fake_users_client = FakeUsersClient()
+        self.fake_users_client.set_user_profile(
+            self.user_id,
+            {"skills": ["Python"], "years_experience": "3", "career_goals": "Tech Lead"},
+        )
+        self.fake_ai_service = FakeAIService(
+            {"success": True, "response": "Focus on system design first."}
+        )
+        app.dependency_overrides[get_users_client] = lambda: self.fake_users_client
+        app.dependency_overrides[get_ai_service] = lambda: self.fake_ai_service
+
+    async def create_conversation(self, db_session):
+        conversation = Conversation(user_id=self.user_id, title="Test Conversation")
+        db_session.add(conversation)
+        await db_session.commit()
+        await db_session.refresh(conversation)
+        return conversation.id
+
+    @pytest.mark.asyncio
+    async def test_stream_message_success(self, client, db_session):
+        """Test tokens are streamed and the full answer is persisted."""
+        conversation_id = await self.create_conversation(db_session)
+
+        response = await client.post(
+            f"/api/users/{self.user_id}/conversations/{conversation_id}/message/stream",
+            json={"message": "How can I become a tech lead?"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+
+        events = parse_sse(response.text)
+        tokens = [data["content"] for event, data in events if event == "token"]
+        assert len(tokens) > 1
+        assert "".join(tokens) == "Focus on system design first."
+
+        event, data = events[-1]
+        assert event == "done"
+        assert data["success"] is True
+        assert data["message"]["is_human"] is False
+        assert data["message"]["content"] == "Focus on system design first."
+        assert data["message"]["conversation_id"] == str(conversation_id)
+
+        # Both the user message and the streamed answer are persisted
+        messages_response = await client.get(
+            f"/api/users/{self.user_id}/conversations/{conversation_id}/messages"
+        )
+        messages = messages_response.json()["messages"]
+        assert [m["is_human"] for m in messages] == [True, False]
+        assert messages[1]["content"] == "Focus on system design first."
+
+    @pytest.mark.asyncio
+    async def test_stream_message_ai_failure(self, client, db_session):
+        """Test a failing stream ends with an error event and an apology message."""
+        conversation_id = await self.create_conversation(db_session)
+        self.fake_ai_service.set_response(
+            {"success": False, "response": "", "error": "API timeout"}
+        )
+
+        response = await client.post(
+            f"/api/users/{self.user_id}/conversations/{conversation_id}/message/stream",
+            json={"message": "What should I learn next?"},
+        )
+
+        assert response.status_code == 200
+        event, data = parse_sse(response.text)[-1]
+        assert event == "error"
+        assert data["success"] is False
+        assert "having trouble generating a response" in data["message"]["content"]
+
+    @pytest.mark.asyncio
+    async def test_stream_message_conversation_not_found(self, client):
+        """Test streaming to a non-existent conversation returns 404 before streaming."""
+        response = await client.post(
+            f"/api/users/{self.user_id}/conversations/{uuid4()}/message/stream",
+            json={"message": "This should fail"},
+        )
+
+        assert response.status_code == 404
+        assert "Conversation not found" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_stream_message_user_profile_not_found(self, client, db_session):
+        """Test streaming without a user profile returns 404."""
+        conversation_id = await self.create_conversation(db_session)
+        self.fake_users_client.user_profiles.clear()
+
+        response = await client.post(
+            f"/api/users/{self.user_id}/conversations/{conversation_id}/message/stream",
+            json={"message": "This should fail due to missing profile"},
+        )
+
+        assert response.status_code == 404
+        assert "User profile not found" in response.json()["detail"]
@@ -0,0 +1,177 @@
+import asyncio
+import pytest
+import httpx
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from cache import TTLCache
+from feign_clients.users_client import UsersClient
+from dependencies import get_users_client
+from main import app
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingUsersService:
+    """In-process fake of the Users Service profile endpoint counting requests."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        user_id = request.url.path.split("/")[3]
+        return httpx.Response(
+            200,
+            json={"success": True, "profile": {"user_id": user_id, "skills": ["Go"]}},
+        )
+
+
+def make_users_client(handler, **cache_kwargs) -> UsersClient:
+    cache = TTLCache(max_size=cache_kwargs.pop("max_size", 100), ttl=60, **cache_kwargs)
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return UsersClient(http_client, profile_cache=cache)
+
+
+class TestTTLCache:
+    """Unit tests for the shared TTL + LRU cache."""
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_after_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(max_size=10, ttl=5, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 4.9
+        assert cache.get("a") == 1
+        clock.now = 5.0
+        assert cache.get("a") is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        cache = TTLCache(max_size=10, ttl=60)
+        loads = 0
+
+        async def loader():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.05)
+            return "value"
+
+        results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+
+        assert results == ["value"] * 5
+        assert loads == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_failed_load_is_not_cached(self):
+        cache = TTLCache(max_size=10, ttl=60)
+
+        async def failing_loader():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", failing_loader)
+
+        async def loader():
+            return "value"
+
+        assert await cache.get_or_load("k", loader) == "value"
+
+
+class TestUserProfileCache:
+    """Tests for profile caching in UsersClient and its invalidation endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookups_hit_the_cache(self):
+        users_service = CountingUsersService()
+        users_client = make_users_client(users_service)
+        user_id = uuid4()
+
+        first = await users_client.get_user_profile(user_id)
+        second = await users_client.get_user_profile(user_id)
+
+        assert first == second == {"user_id": str(user_id), "skills": ["Go"]}
+        assert users_service.requests == 1
+        assert users_client.profile_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_are_deduplicated(self):
+        users_service = CountingUsersService(delay=0.05)
+        users_client = make_users_client(users_service)
+        user_id = uuid4()
+
+        await asyncio.gather(*(users_client.get_user_profile(user_id) for _ in range(10)))
+
+        assert users_service.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_profile_is_not_cached(self):
+        requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            return httpx.Response(200, json={"success": True, "profile": None})
+
+        users_client = make_users_client(handler)
+        user_id = uuid4()
+
+        assert await users_client.get_user_profile(user_id) is None
+        assert await users_client.get_user_profile(user_id) is None
+        assert requests == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_endpoint_drops_cached_profile(self, client):
+        users_service = CountingUsersService()
+        users_client = make_users_client(users_service)
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        user_id = uuid4()
+
+        await users_client.get_user_profile(user_id)
+        response = await client.delete(f"/internal/users/{user_id}/profile-cache")
+
+        assert response.status_code == 200
+        assert response.json() == {"success": True, "invalidated": True}
+
+        await users_client.get_user_profile(user_id)
+        assert users_service.requests == 2
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_exposes_cache_counters(self, client):
+        response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        stats = response.json()["user_profile_cache"]
+        for counter in ["hits", "misses", "coalesced", "evictions", "hit_rate", "size"]:
+            assert counter in stats
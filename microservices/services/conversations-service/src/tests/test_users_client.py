@@ -0,0 +1,270 @@
+import asyncio
+import json
+import time
+import pytest
+import httpx
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from batching import BatchLoader
+from feign_clients.http_client import get_http_client, close_http_client
+from feign_clients.users_client import UsersClient
+from models import Conversation
+from resilience import CircuitBreaker, HedgePolicy
+from dependencies import get_users_client, get_ai_service
+from tests.fake_services import FakeAIService
+from main import app
+
+
+def make_users_client(handler, **options) -> UsersClient:
+    """Build a UsersClient whose pooled client talks to an in-process fake."""
+    return UsersClient(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler)), **options
+    )
+
+
+class TestUsersClient:
+    """Tests for the pooled Users Service feign client."""
+
+    @pytest.mark.asyncio
+    async def test_get_user_profile_returns_profile(self):
+        """Test the profile object is unwrapped from the Users Service response."""
+        user_id = uuid4()
+        profile = {"user_id": str(user_id), "skills": ["Python"]}
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path == f"/api/users/{user_id}/profile"
+            return httpx.Response(200, json={"success": True, "profile": profile})
+
+        users_client = make_users_client(handler)
+
+        assert await users_client.get_user_profile(user_id) == profile
+
+    @pytest.mark.asyncio
+    async def test_get_user_profile_missing(self):
+        """Test unknown users and users without a profile both return None."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path.startswith("/api/users/00000000"):
+                return httpx.Response(404, json={"detail": "User not found"})
+            return httpx.Response(200, json={"success": True, "profile": None})
+
+        users_client = make_users_client(handler)
+
+        assert await users_client.get_user_profile(uuid4()) is None
+        assert (
+            await users_client.get_user_profile(
+                "00000000-0000-0000-0000-000000000000"
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_are_batched(self):
+        """Test concurrent single lookups for different users share one batchGet."""
+        user_ids = [str(uuid4()) for _ in range(5)]
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            assert request.url.path == "/api/users/profiles:batchGet"
+            ids = json.loads(request.content)["user_ids"]
+            # The last user has no profile and is omitted from the response
+            profiles = [{"user_id": u, "skills": []} for u in ids if u != user_ids[-1]]
+            return httpx.Response(200, json={"success": True, "profiles": profiles})
+
+        users_client = make_users_client(handler)
+
+        profiles = await asyncio.gather(
+            *(users_client.get_user_profile(u) for u in user_ids)
+        )
+
+        assert len(requests) == 1
+        assert [p["user_id"] for p in profiles[:-1]] == user_ids[:-1]
+        assert profiles[-1] is None
+
+    @pytest.mark.asyncio
+    async def test_rejected_batch_degrades_instead_of_not_found(self):
+        """Test a failed batchGet is an outage, not users without profiles."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(422, json={"detail": "Too many user_ids"})
+
+        users_client = make_users_client(handler)
+
+        profiles = await asyncio.gather(
+            *(users_client.get_user_profile(uuid4()) for _ in range(3))
+        )
+
+        assert profiles == [{}, {}, {}]
+        assert users_client.stats()["degraded"] == 3
+
+    @pytest.mark.asyncio
+    async def test_get_user_profiles_uses_cache_and_batches(self):
+        """Test get_user_profiles only fetches uncached users, in one request."""
+        cached, fresh = str(uuid4()), [str(uuid4()), str(uuid4())]
+        batches = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "GET":
+                user_id = request.url.path.split("/")[3]
+                return httpx.Response(
+                    200, json={"success": True, "profile": {"user_id": user_id}}
+                )
+            ids = json.loads(request.content)["user_ids"]
+            batches.append(ids)
+            profiles = [{"user_id": u} for u in ids]
+            return httpx.Response(200, json={"success": True, "profiles": profiles})
+
+        users_client = make_users_client(handler)
+        await users_client.get_user_profile(cached)
+
+        profiles = await users_client.get_user_profiles([cached, *fresh, cached])
+
+        assert batches == [fresh]
+        assert list(profiles) == [cached, *fresh]
+        assert all(profiles[u] == {"user_id": u} for u in profiles)
+
+    @pytest.mark.asyncio
+    async def test_batch_loader_splits_at_max_batch_size(self):
+        """Test a BatchLoader never sends more than max_batch_size keys at once."""
+        batches = []
+
+        async def batch_fn(keys):
+            batches.append(keys)
+            return {key: key * 2 for key in keys}
+
+        loader = BatchLoader(batch_fn, max_batch_size=3)
+        results = await asyncio.gather(*(loader.load(i) for i in range(7)))
+
+        assert results == [i * 2 for i in range(7)]
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+
+    @pytest.mark.asyncio
+    async def test_batch_loader_propagates_errors(self):
+        """Test a failing batch fails every caller waiting on it."""
+
+        async def batch_fn(keys):
+            raise RuntimeError("users service down")
+
+        loader = BatchLoader(batch_fn)
+        results = await asyncio.gather(
+            loader.load("a"), loader.load("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_shared_http_client_is_reused(self):
+        """Test every UsersClient shares one pooled client until it is closed."""
+        first = UsersClient().http_client
+        second = UsersClient().http_client
+
+        assert first is second
+        assert first is get_http_client()
+
+        await close_http_client()
+        assert first.is_closed
+        assert get_http_client() is not first
+        await close_http_client()
+
+
+class TestUsersClientResilience:
+    """Tests for timeouts, hedging and the circuit breaker on profile lookups."""
+
+    @pytest.mark.asyncio
+    async def test_slow_lookup_is_hedged(self):
+        """Test a second request is sent after the hedge delay and wins."""
+        requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            if requests == 1:
+                await asyncio.sleep(1.0)
+            return httpx.Response(200, json={"success": True, "profile": {"n": requests}})
+
+        users_client = make_users_client(
+            handler, hedge_policy=HedgePolicy(attempt_timeout=2.0, initial_delay=0.05)
+        )
+        start = time.perf_counter()
+        profile = await users_client.get_user_profile(uuid4())
+
+        assert profile == {"n": 2}
+        assert time.perf_counter() - start < 0.5
+        assert users_client.stats()["hedging"]["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hanging_service_degrades_within_budget(self):
+        """Test lookups give up after the budget with an uncached empty profile."""
+        requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            await asyncio.sleep(10)
+
+        users_client = make_users_client(
+            handler,
+            hedge_policy=HedgePolicy(attempt_timeout=0.1, initial_delay=0.05),
+            timeout_budget=0.3,
+        )
+        user_id = uuid4()
+        start = time.perf_counter()
+
+        assert await users_client.get_user_profile(user_id) == {}
+        assert time.perf_counter() - start < 0.5
+        assert requests == 2
+        assert users_client.stats()["degraded"] == 1
+        # The degraded profile is not cached
+        assert users_client.profile_cache.peek(str(user_id)) is None
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self):
+        """Test repeated server errors open the circuit and stop the requests."""
+        requests = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal requests
+            requests += 1
+            return httpx.Response(503, text="unavailable")
+
+        users_client = make_users_client(
+            handler,
+            hedge_policy=HedgePolicy(max_attempts=1),
+            circuit_breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60),
+        )
+        profiles = [await users_client.get_user_profile(uuid4()) for _ in range(4)]
+
+        assert profiles == [{}] * 4
+        assert requests == 2
+        assert users_client.stats()["circuit"]["state"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_chat_turn_proceeds_on_degraded_profile(self, client, db_session):
+        """Test a chat turn is answered while the Users Service is down."""
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        conversation = Conversation(user_id=uuid4(), title="Test Conversation")
+        db_session.add(conversation)
+        await db_session.commit()
+        ai_service = FakeAIService()
+        users_client = make_users_client(handler)
+        app.dependency_overrides[get_users_client] = lambda: users_client
+        app.dependency_overrides[get_ai_service] = lambda: ai_service
+
+        response = await client.post(
+            f"/api/users/{conversation.user_id}/conversations/{conversation.id}/message",
+            json={"message": "What next?"},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["success"] is True
+        assert ai_service.get_last_call()["user_profile"] == {}
@@ -0,0 +1,42 @@
+"""
+Dependency injection functions for the LLM service.
+"""
+
+import sys
+import os
+from typing import Optional
+
+# Add shared directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../shared"))
+
+from gateway import LLMGateway
+from service import AIService
+
+
+_gateway: Optional[LLMGateway] = None
+_ai_service: Optional[AIService] = None
+
+
+def get_gateway() -> LLMGateway:
+    """Dependency to get the process-wide LLMGateway instance."""
+    global _gateway
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
+
+
+def get_ai_service() -> AIService:
+    """Dependency to get the process-wide AIService instance."""
+    global _ai_service
+    if _ai_service is None:
+        _ai_service = AIService(get_gateway())
+    return _ai_service
+
+
+async def close_gateway() -> None:
+    """Close the shared upstream connection pool, if it was created."""
+    global _gateway, _ai_service
+    if _gateway is not None:
+        await _gateway.close()
+        _gateway = None
+        _ai_service = None
@@ -0,0 +1,187 @@
+import asyncio
+import time
+import httpx
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from config import settings
+from providers import STREAM, UNARY, Provider, ProviderRegistry, default_providers
+from resilience import CircuitBreaker, CircuitOpenError
+
+# Upstream statuses after which the next provider is tried; other
+# responses, including client errors, are relayed as they are
+FAILOVER_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class NoProviderAvailable(Exception):
+    """Raised when every provider's circuit is open."""
+
+
+class FailoverResponse(Exception):
+    """A provider answered with one of FAILOVER_STATUSES."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"LLM provider answered {response.status_code}")
+        self.response = response
+
+
+class LLMGateway:
+    """
+    Single upstream connection point for the cluster's LLM traffic.
+
+    Holds one pooled HTTP client per OpenAI-compatible provider, shared by
+    every request this pod serves, and a semaphore bounding how many
+    completions are in flight upstream at once; requests beyond it wait
+    for a slot. Each request goes to the fastest healthy provider in the
+    registry and fails over to the next one on 429s, 5xx and connection
+    errors. Request and response bodies are otherwise passed through
+    unchanged, so any OpenAI client can use the gateway as its base URL.
+    """
+
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: Optional[int] = None,
+        registry: Optional[ProviderRegistry] = None,
+    ):
+        # A bare client is a single provider serving the configured model
+        self.registry = registry or ProviderRegistry(
+            [Provider("default", http_client, settings.xai_model)]
+            if http_client is not None
+            else default_providers()
+        )
+        self.max_concurrency = max_concurrency or settings.llm_gateway_max_concurrency
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.upstream_errors = 0
+        self.failovers = 0
+
+    async def close(self) -> None:
+        """Close the upstream connection pools."""
+        await self.registry.close()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one of the upstream concurrency slots."""
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.requests += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _attempt(
+        self, provider: Provider, body: Dict[str, Any], stream: bool
+    ) -> httpx.Response:
+        """Send the request to one provider and record how it went. Unary
+        requests are timed to the full body and streams to their headers,
+        so each mode has its own latency average."""
+        mode = STREAM if stream else UNARY
+        payload = {**body, "model": provider.model}
+        if stream:
+            payload["stream"] = True
+        request = provider.http_client.build_request(
+            "POST", "/chat/completions", json=payload
+        )
+        start = time.perf_counter()
+        try:
+            response = await provider.http_client.send(request, stream=stream)
+        except httpx.RequestError:
+            self.upstream_errors += 1
+            self.registry.record_failure(provider, mode, time.perf_counter() - start)
+            raise
+        latency = time.perf_counter() - start
+        if response.status_code in FAILOVER_STATUSES:
+            if stream:
+                try:
+                    await response.aread()
+                finally:
+                    await response.aclose()
+            self.registry.record_failure(provider, mode, latency)
+            raise FailoverResponse(response)
+        self.registry.record_success(provider, mode, latency)
+        return response
+
+    async def _send(self, body: Dict[str, Any], stream: bool = False) -> httpx.Response:
+        """
+        Try the providers in ranked order until one answers. If none does,
+        the last provider's error response is returned, or its connection
+        error raised.
+        """
+        last_response: Optional[httpx.Response] = None
+        last_error: Optional[httpx.RequestError] = None
+        for provider in self.registry.ranked(STREAM if stream else UNARY):
+            try:
+                response = await provider.circuit_breaker.call(
+                    lambda: self._attempt(provider, body, stream),
+                    # A 429 means busy, not down
+                    is_failure=lambda e: not (
+                        isinstance(e, FailoverResponse)
+                        and e.response.status_code == 429
+                    ),
+                )
+            except CircuitOpenError:
+                continue
+            except FailoverResponse as e:
+                last_response, last_error = e.response, None
+            except httpx.RequestError as e:
+                last_response, last_error = None, e
+            else:
+                if last_response is not None or last_error is not None:
+                    self.failovers += 1
+                return response
+            if provider.circuit_breaker.state == CircuitBreaker.OPEN:
+                self.registry.record_open(provider)
+
+        if last_response is not None:
+            return last_response
+        if last_error is not None:
+            raise last_error
+        raise NoProviderAvailable("Every LLM provider's circuit is open")
+
+    async def chat_completion(self, body: Dict[str, Any]) -> httpx.Response:
+        """
+        Send a chat completion request upstream and return the provider's
+        response, read in full. The provider's model replaces the requested
+        one, since callers cannot know which provider serves them. Raises
+        httpx.RequestError if no provider could be reached, and
+        NoProviderAvailable if none was tried.
+        """
+        async with self._slot():
+            return await self._send(body)
+
+    @asynccontextmanager
+    async def stream_chat_completion(
+        self, body: Dict[str, Any]
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streaming chat completion upstream; the response body is read
+        by the caller (e.g. with aiter_bytes) while the slot is held. Only
+        opening the stream fails over; once it is relayed it is not retried.
+        """
+        async with self._slot():
+            response = await self._send(body, stream=True)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "requests": self.requests,
+            "upstream_errors": self.upstream_errors,
+            "failovers": self.failovers,
+            **self.registry.stats(),
+        }
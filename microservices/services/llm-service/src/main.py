@@ -9,15 +9,19 @@ sys.path.append(os.path.dirname(__file__))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import close_engine
-from router import router as ai_service_router
+from database import close_engine, pool_stats
+from metrics import register_metrics, router as metrics_router
+from router import router as ai_service_router, gateway_router
+from dependencies import close_gateway, get_gateway
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Database migrations are handled by alembic upgrade head in startup script
+    get_gateway()  # Open the shared upstream connection pool
     yield
+    await close_gateway()
     await close_engine()  # Properly close the database engine
 
 
@@ -37,8 +41,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include AI service router (existing code, no modifications)
+# Include AI service router
 app.include_router(ai_service_router, prefix="/api", tags=["llm-service"])
+# OpenAI-compatible gateway for the other services' LLM clients
+app.include_router(gateway_router, prefix="/v1", tags=["llm-gateway"])
+app.include_router(metrics_router, tags=["metrics"])
+
+register_metrics("db_pool", pool_stats)
+register_metrics("llm_gateway", lambda: get_gateway().stats())
 
 
 @app.get("/health")
@@ -0,0 +1,203 @@
+import os
+import random
+import httpx
+from typing import Any, Callable, Dict, List, Optional
+
+from config import settings
+from resilience import CircuitBreaker
+
+# Request modes with separate latency averages: a unary completion is
+# timed until the whole answer arrived, a stream only until it opened
+UNARY = "unary"
+STREAM = "stream"
+
+# Lowest health a provider's score is divided by, so a provider that has
+# failed every recent call is ranked last instead of scored infinitely bad
+MIN_HEALTH = 0.05
+
+
+class Provider:
+    """
+    One OpenAI-compatible upstream endpoint with its routing state: an EWMA
+    of its response latency per request mode, an EWMA of its success rate
+    (health) and a circuit breaker that takes it out of rotation while it
+    is down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        http_client: httpx.AsyncClient,
+        model: str,
+        weight: float = 1.0,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.name = name
+        self.http_client = http_client
+        self.model = model
+        self.weight = weight
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=settings.llm_provider_failure_threshold,
+            recovery_timeout=settings.llm_provider_recovery_timeout,
+        )
+        # None until measured; unmeasured providers are tried first
+        self.latency: Dict[str, Optional[float]] = {UNARY: None, STREAM: None}
+        self.health = 1.0
+        self.requests = 0
+        self.failures = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Provider":
+        """
+        Build a provider from one LLM_PROVIDERS entry: name, base_url, model,
+        and optionally weight, timeout and api_key_env, the environment
+        variable holding its API key (XAI_API_KEY by default).
+        """
+        api_key = (
+            os.environ.get(config["api_key_env"], "")
+            if config.get("api_key_env")
+            else settings.xai_api_key
+        )
+        return cls(
+            name=config["name"],
+            http_client=httpx.AsyncClient(
+                base_url=config["base_url"],
+                headers={"Authorization": f"Bearer {api_key}"},
+                timeout=config.get("timeout", settings.xai_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.xai_max_connections,
+                    max_keepalive_connections=settings.xai_max_connections,
+                ),
+            ),
+            model=config["model"],
+            weight=config.get("weight", 1.0),
+        )
+
+    @property
+    def available(self) -> bool:
+        return self.circuit_breaker.state != CircuitBreaker.OPEN
+
+    def score(self, mode: str = UNARY) -> float:
+        """Routing cost for a request of `mode`: expected latency, discounted
+        by weight and health."""
+        latency = self.latency[mode]
+        if latency is None:
+            return 0.0
+        return latency / (self.weight * max(self.health, MIN_HEALTH))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "weight": self.weight,
+            "latency_ms": {
+                mode: None if latency is None else latency * 1000
+                for mode, latency in self.latency.items()
+            },
+            "health": self.health,
+            "circuit": self.circuit_breaker.state,
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+def default_providers() -> List[Provider]:
+    """Providers from LLM_PROVIDERS, or the single xai_* provider."""
+    if settings.llm_providers:
+        return [Provider.from_config(config) for config in settings.llm_providers]
+    return [
+        Provider.from_config(
+            {
+                "name": "xai",
+                "base_url": settings.xai_base_url,
+                "model": settings.xai_model,
+            }
+        )
+    ]
+
+
+class ProviderRegistry:
+    """
+    Latency-based routing over the configured providers.
+
+    Providers are ranked by score, fastest healthy first, with providers
+    whose circuit is open at the end; the gateway tries them in that order
+    until one answers, so an outage costs the failed attempt instead of the
+    request. A small share of requests (`explore_ratio`) goes to a random
+    other provider first, so a provider that was slow once is measured
+    again. When a provider's circuit opens its latency is forgotten, so the
+    trial request after `recovery_timeout` goes to it first.
+    """
+
+    def __init__(
+        self,
+        providers: List[Provider],
+        latency_alpha: Optional[float] = None,
+        health_alpha: Optional[float] = None,
+        explore_ratio: Optional[float] = None,
+        rng: Callable[[], float] = random.random,
+    ):
+        if not providers:
+            raise ValueError("At least one LLM provider is required")
+        self.providers = providers
+        self.latency_alpha = latency_alpha or settings.llm_routing_latency_alpha
+        self.health_alpha = health_alpha or settings.llm_routing_health_alpha
+        self.explore_ratio = (
+            settings.llm_routing_explore_ratio
+            if explore_ratio is None
+            else explore_ratio
+        )
+        self._rng = rng
+        self.explorations = 0
+
+    def ranked(self, mode: str = UNARY) -> List[Provider]:
+        """Providers in the order to try them for one request of `mode`."""
+        available = sorted(
+            (provider for provider in self.providers if provider.available),
+            key=lambda provider: provider.score(mode),
+        )
+        if len(available) > 1 and self._rng() < self.explore_ratio:
+            self.explorations += 1
+            explored = available.pop(1 + int(self._rng() * (len(available) - 1)))
+            available.insert(0, explored)
+        return available + [
+            provider for provider in self.providers if not provider.available
+        ]
+
+    def record_success(self, provider: Provider, mode: str, latency: float) -> None:
+        provider.requests += 1
+        provider.latency[mode] = self._ewma(
+            provider.latency[mode], latency, self.latency_alpha
+        )
+        provider.health += self.health_alpha * (1.0 - provider.health)
+
+    def record_failure(self, provider: Provider, mode: str, latency: float) -> None:
+        """A failed call. Its latency counts if it is slower than usual, so a
+        provider that times out ranks slower, but a provider that fails fast
+        does not look faster."""
+        provider.requests += 1
+        provider.failures += 1
+        average = provider.latency[mode]
+        provider.latency[mode] = self._ewma(
+            average, max(latency, average or 0.0), self.latency_alpha
+        )
+        provider.health -= self.health_alpha * provider.health
+
+    def record_open(self, provider: Provider) -> None:
+        """The provider's circuit opened: measure it afresh when it is back."""
+        provider.latency = {mode: None for mode in provider.latency}
+
+    @staticmethod
+    def _ewma(average: Optional[float], sample: float, alpha: float) -> float:
+        return sample if average is None else average + alpha * (sample - average)
+
+    async def close(self) -> None:
+        for provider in self.providers:
+            await provider.http_client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "explorations": self.explorations,
+            "providers": {
+                provider.name: provider.stats() for provider in self.providers
+            },
+        }
@@ -1,19 +1,33 @@
-from fastapi import APIRouter, HTTPException
+import httpx
+from contextlib import AsyncExitStack
+from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from typing import Dict, Any
 
 from schemas import CareerAdviceRequest, CareerAdviceResponse
+from gateway import LLMGateway, NoProviderAvailable
 from service import AIService
+from dependencies import get_ai_service, get_gateway
 
 router = APIRouter()
 
+# OpenAI-compatible endpoints, mounted at /v1 so OpenAI clients can use
+# this service as their base URL
+gateway_router = APIRouter()
+
+# Upstream response headers worth relaying to the caller
+PASSTHROUGH_HEADERS = ("retry-after",)
+
 
 @router.post("/ai/career-advice")
-async def get_career_advice(request: CareerAdviceRequest) -> CareerAdviceResponse:
+async def get_career_advice(
+    request: CareerAdviceRequest,
+    ai_service: AIService = Depends(get_ai_service),
+) -> CareerAdviceResponse:
     """
     Get AI-powered career advice based on user profile and optional question
     """
     try:
-        ai_service = AIService()
         result = await ai_service.get_career_advice(
             user_profile=request.user_profile, question=request.question
         )
@@ -28,3 +42,76 @@ async def get_career_advice(request: CareerAdviceRequest) -> CareerAdviceRespons
         raise HTTPException(
             status_code=500, detail=f"Error getting career advice: {str(e)}"
         )
+
+
+def upstream_error_response(error: Exception) -> JSONResponse:
+    """OpenAI-style error for a request no provider could answer."""
+    print(f"LLM upstream error: {error!r}")
+    if isinstance(error, NoProviderAvailable):
+        status_code, message = 503, "No LLM provider available"
+    elif isinstance(error, httpx.TimeoutException):
+        status_code, message = 504, "LLM provider timed out"
+    else:
+        status_code, message = 502, "LLM provider unreachable"
+    return JSONResponse(
+        status_code=status_code,
+        content={"error": {"message": message, "type": "upstream_error"}},
+    )
+
+
+def relay_response(upstream: httpx.Response) -> Response:
+    """Copy a fully read upstream response."""
+    return Response(
+        content=upstream.content,
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type", "application/json"),
+        headers={
+            name: upstream.headers[name]
+            for name in PASSTHROUGH_HEADERS
+            if name in upstream.headers
+        },
+    )
+
+
+@gateway_router.post("/chat/completions")
+async def create_chat_completion(
+    body: Dict[str, Any] = Body(...),
+    gateway: LLMGateway = Depends(get_gateway),
+) -> Response:
+    """
+    Chat completion passthrough to the fastest healthy provider. With
+    `"stream": true` the provider's server-sent events are relayed as they
+    arrive; upstream errors keep their status code and body.
+    """
+    if not body.get("stream"):
+        try:
+            return relay_response(await gateway.chat_completion(body))
+        except (httpx.RequestError, NoProviderAvailable) as e:
+            return upstream_error_response(e)
+
+    # The stream outlives this function: the response body closes it
+    stack = AsyncExitStack()
+    try:
+        upstream = await stack.enter_async_context(
+            gateway.stream_chat_completion(body)
+        )
+    except (httpx.RequestError, NoProviderAvailable) as e:
+        return upstream_error_response(e)
+
+    if upstream.status_code != 200:
+        try:
+            await upstream.aread()
+        finally:
+            await stack.aclose()
+        return relay_response(upstream)
+
+    async def relay():
+        try:
+            async for chunk in upstream.aiter_bytes():
+                yield chunk
+        except httpx.HTTPError as e:
+            print(f"LLM upstream stream error: {e!r}")
+        finally:
+            await stack.aclose()
+
+    return StreamingResponse(relay(), media_type="text/event-stream")
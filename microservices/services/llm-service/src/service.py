@@ -0,0 +1,47 @@
+from typing import Dict, Any, List, Optional
+
+from career_prompts import CAREER_ADVISOR_SYSTEM_PROMPT, build_career_prompt
+from gateway import LLMGateway
+
+class AIService:
+    """Service class for handling AI-powered career advice requests"""
+
+    def __init__(self, gateway: LLMGateway):
+        # Completions go through the gateway's shared upstream client and
+        # concurrency limit, like passthrough requests
+        self.gateway = gateway
+
+    async def get_career_advice(
+        self, user_profile: Dict[str, Any], question: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get career advice from AI based on user profile and optional question"""
+        try:
+            response = await self.gateway.chat_completion(
+                {
+                    "messages": self._build_messages(user_profile, question),
+                    "temperature": 0.7,
+                }
+            )
+            response.raise_for_status()
+
+            return {
+                "success": True,
+                "response": response.json()["choices"][0]["message"]["content"],
+            }
+
+        except Exception as e:
+            print(f"AI Service error: {str(e)}")
+            return {
+                "success": False,
+                "response": "Sorry, I couldn't generate a response at this time.",
+                "error": str(e),
+            }
+
+    def _build_messages(
+        self, user_profile: Dict[str, Any], question: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the model"""
+        return [
+            {"role": "system", "content": CAREER_ADVISOR_SYSTEM_PROMPT},
+            {"role": "user", "content": build_career_prompt(user_profile, question)},
+        ]
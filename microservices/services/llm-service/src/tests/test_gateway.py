@@ -0,0 +1,224 @@
+import asyncio
+import json
+import pytest
+import httpx
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from openai import AsyncOpenAI
+from config import settings
+from gateway import LLMGateway
+from service import AIService
+from dependencies import get_ai_service, get_gateway
+from main import app
+
+
+def fake_completion(content: str) -> dict:
+    return {
+        "id": "chatcmpl-test",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "fake-model",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def fake_stream(deltas: list) -> bytes:
+    chunks = [
+        {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "fake-model",
+            "choices": [{"index": 0, "delta": {"content": delta}}],
+        }
+        for delta in deltas
+    ]
+    events = [f"data: {json.dumps(chunk)}\n\n" for chunk in chunks]
+    return ("".join(events) + "data: [DONE]\n\n").encode()
+
+
+def use_gateway(handler, **kwargs) -> LLMGateway:
+    """Route the app's gateway to an in-process fake provider."""
+    gateway = LLMGateway(
+        http_client=httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://fake-llm/v1"
+        ),
+        **kwargs,
+    )
+    app.dependency_overrides[get_gateway] = lambda: gateway
+    app.dependency_overrides[get_ai_service] = lambda: AIService(gateway)
+    return gateway
+
+
+class TestChatCompletions:
+    """Tests for the OpenAI-compatible passthrough."""
+
+    @pytest.mark.asyncio
+    async def test_relays_completion_with_default_model(self, client):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json=fake_completion("Learn Go."))
+
+        use_gateway(handler)
+        response = await client.post(
+            "/v1/chat/completions",
+            json={"messages": [{"role": "user", "content": "Next step?"}]},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == fake_completion("Learn Go.")
+        assert requests == [
+            {
+                "model": settings.xai_model,
+                "messages": [{"role": "user", "content": "Next step?"}],
+            }
+        ]
+
+    @pytest.mark.asyncio
+    async def test_openai_client_streams_through_gateway(self, client):
+        """Test an OpenAI client pointed at the gateway receives the deltas."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            assert json.loads(request.content)["stream"] is True
+            return httpx.Response(
+                200,
+                content=fake_stream(["Learn ", "Kubernetes."]),
+                headers={"content-type": "text/event-stream"},
+            )
+
+        gateway = use_gateway(handler)
+        openai_client = AsyncOpenAI(
+            api_key="unused", base_url="http://test/v1", http_client=client
+        )
+        stream = await openai_client.chat.completions.create(
+            model="grok-test",
+            messages=[{"role": "user", "content": "Next step?"}],
+            stream=True,
+        )
+        deltas = [chunk.choices[0].delta.content async for chunk in stream]
+
+        assert deltas == ["Learn ", "Kubernetes."]
+        assert gateway.stats()["in_flight"] == 0
+        assert gateway.stats()["requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_relays_upstream_errors(self, client):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                429,
+                json={"error": {"message": "rate limited"}},
+                headers={"retry-after": "2"},
+            )
+
+        use_gateway(handler)
+        for stream in (False, True):
+            response = await client.post(
+                "/v1/chat/completions",
+                json={"messages": [], "stream": stream},
+            )
+
+            assert response.status_code == 429
+            assert response.headers["retry-after"] == "2"
+            assert response.json() == {"error": {"message": "rate limited"}}
+
+    @pytest.mark.asyncio
+    async def test_unreachable_provider_is_bad_gateway(self, client):
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("connection refused", request=request)
+
+        gateway = use_gateway(handler)
+        response = await client.post("/v1/chat/completions", json={"messages": []})
+
+        assert response.status_code == 502
+        assert response.json()["error"]["type"] == "upstream_error"
+        assert gateway.stats()["upstream_errors"] == 1
+
+
+class TestGatewayConcurrency:
+    """Tests for the upstream concurrency limit."""
+
+    @pytest.mark.asyncio
+    async def test_requests_beyond_the_limit_wait(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return httpx.Response(200, json=fake_completion("ok"))
+
+        gateway = LLMGateway(
+            http_client=httpx.AsyncClient(
+                transport=httpx.MockTransport(handler), base_url="http://fake-llm/v1"
+            ),
+            max_concurrency=2,
+        )
+        calls = [
+            asyncio.ensure_future(gateway.chat_completion({"messages": []}))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        assert gateway.stats()["in_flight"] == 2
+        assert gateway.stats()["waiting"] == 3
+
+        responses = await asyncio.gather(*calls)
+
+        assert [response.status_code for response in responses] == [200] * 5
+        assert peak == 2
+        assert gateway.stats()["waiting"] == 0
+        await gateway.close()
+
+
+class TestCareerAdvice:
+    """Tests for the career advice endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_career_advice_goes_through_gateway(self, client):
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, json=fake_completion("Learn Rust."))
+
+        use_gateway(handler)
+        response = await client.post(
+            "/api/ai/career-advice",
+            json={"user_profile": {"skills": ["Python"]}, "question": "What next?"},
+        )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "success": True,
+            "response": "Learn Rust.",
+            "error": None,
+        }
+        assert "What next?" in requests[0]["messages"][-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_career_advice_reports_provider_errors(self, client):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, json={"error": {"message": "unavailable"}})
+
+        use_gateway(handler)
+        response = await client.post(
+            "/api/ai/career-advice", json={"user_profile": {}}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["success"] is False
@@ -0,0 +1,208 @@
+import asyncio
+import json
+import pytest
+import httpx
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from gateway import LLMGateway
+from providers import Provider, ProviderRegistry
+from resilience import CircuitBreaker
+from dependencies import get_gateway
+from main import app
+from tests.test_gateway import fake_completion, fake_stream
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeProvider:
+    """In-process OpenAI-compatible provider with a latency and a failure mode."""
+
+    def __init__(self, name: str, latency: float = 0.0):
+        self.name = name
+        self.latency = latency
+        # None, "down" (connection refused), or a status code to answer with
+        self.failure = None
+        self.requests = []
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        if self.failure == "down":
+            raise httpx.ConnectError("connection refused", request=request)
+        await asyncio.sleep(self.latency)
+        if self.failure:
+            return httpx.Response(
+                self.failure, json={"error": {"message": f"{self.name} failed"}}
+            )
+        if json.loads(request.content).get("stream"):
+            return httpx.Response(
+                200,
+                content=fake_stream([f"From {self.name}."]),
+                headers={"content-type": "text/event-stream"},
+            )
+        return httpx.Response(200, json=fake_completion(f"From {self.name}."))
+
+    def provider(self, clock=None, **kwargs) -> Provider:
+        return Provider(
+            self.name,
+            httpx.AsyncClient(
+                transport=httpx.MockTransport(self.handler),
+                base_url=f"http://{self.name}/v1",
+            ),
+            model=f"{self.name}-model",
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=2, recovery_timeout=10, clock=clock or FakeClock()
+            ),
+            **kwargs,
+        )
+
+
+def make_gateway(*providers: Provider, **kwargs) -> LLMGateway:
+    return LLMGateway(
+        registry=ProviderRegistry(list(providers), explore_ratio=0, **kwargs)
+    )
+
+
+async def served_by(gateway: LLMGateway) -> str:
+    response = await gateway.chat_completion({"messages": []})
+    return response.json()["choices"][0]["message"]["content"]
+
+
+class TestLatencyRouting:
+    """Tests for picking the fastest healthy provider."""
+
+    @pytest.mark.asyncio
+    async def test_routes_to_the_fastest_provider(self):
+        slow, fast = FakeProvider("slow", 0.05), FakeProvider("fast", 0.0)
+        gateway = make_gateway(slow.provider(), fast.provider())
+
+        # Each provider is measured once, then the fast one takes the traffic
+        answers = [await served_by(gateway) for _ in range(6)]
+
+        assert answers[:2] == ["From slow.", "From fast."]
+        assert answers[2:] == ["From fast."] * 4
+        assert fast.requests[0]["model"] == "fast-model"
+        providers = gateway.stats()["providers"]
+        assert (
+            providers["slow"]["latency_ms"]["unary"]
+            > providers["fast"]["latency_ms"]["unary"]
+        )
+        assert providers["fast"]["latency_ms"]["stream"] is None
+
+    @pytest.mark.asyncio
+    async def test_weight_and_health_scale_the_latency(self):
+        primary = FakeProvider("primary").provider(weight=2.0)
+        backup = FakeProvider("backup").provider()
+        registry = ProviderRegistry([backup, primary], explore_ratio=0)
+        primary.latency["unary"], backup.latency["unary"] = 0.3, 0.2
+
+        assert registry.ranked() == [primary, backup]
+
+        registry.record_failure(primary, "unary", 0.3)
+        registry.record_failure(primary, "unary", 0.3)
+        assert registry.ranked() == [backup, primary]
+
+    @pytest.mark.asyncio
+    async def test_streams_and_unary_calls_are_ranked_separately(self):
+        """Test time to a stream's headers is not compared with full answers."""
+        unary = FakeProvider("unary").provider()
+        streaming = FakeProvider("streaming").provider()
+        registry = ProviderRegistry([unary, streaming], explore_ratio=0)
+        registry.record_success(unary, "unary", 2.0)
+        registry.record_success(streaming, "unary", 3.0)
+        registry.record_success(streaming, "stream", 0.2)
+        registry.record_success(unary, "stream", 0.3)
+
+        assert registry.ranked("unary") == [unary, streaming]
+        assert registry.ranked("stream") == [streaming, unary]
+
+    @pytest.mark.asyncio
+    async def test_explores_other_providers(self):
+        fast, slow = FakeProvider("fast").provider(), FakeProvider("slow").provider()
+        fast.latency["unary"], slow.latency["unary"] = 0.1, 0.5
+        registry = ProviderRegistry([fast, slow], explore_ratio=0.1, rng=lambda: 0.05)
+
+        assert registry.ranked() == [slow, fast]
+        assert registry.stats()["explorations"] == 1
+
+
+class TestFailover:
+    """Tests for failing over between providers during an outage."""
+
+    @pytest.mark.asyncio
+    async def test_fails_over_mid_outage_and_recovers(self):
+        clock = FakeClock()
+        primary, backup = FakeProvider("primary"), FakeProvider("backup", 0.01)
+        gateway = make_gateway(primary.provider(clock), backup.provider(clock))
+        assert await served_by(gateway) == "From primary."
+        assert await served_by(gateway) == "From backup."
+
+        primary.failure = 503
+        answers = [await served_by(gateway) for _ in range(4)]
+
+        # Two failed attempts open the primary's circuit; then it is skipped
+        assert answers == ["From backup."] * 4
+        assert len(primary.requests) == 3
+        assert gateway.stats()["failovers"] == 2
+        assert gateway.stats()["providers"]["primary"]["circuit"] == "open"
+
+        primary.failure = None
+        clock.now = 10
+        # The trial request goes to the recovered provider first
+        assert await served_by(gateway) == "From primary."
+        assert gateway.stats()["providers"]["primary"]["circuit"] == "closed"
+
+    @pytest.mark.asyncio
+    async def test_rate_limits_fail_over_without_opening_the_circuit(self):
+        primary, backup = FakeProvider("primary"), FakeProvider("backup", 0.01)
+        gateway = make_gateway(primary.provider(), backup.provider())
+        primary.failure = 429
+
+        answers = [await served_by(gateway) for _ in range(3)]
+
+        assert answers == ["From backup."] * 3
+        stats = gateway.stats()["providers"]["primary"]
+        assert stats["circuit"] == "closed"
+        assert stats["health"] < 1.0
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_before_it_opens(self):
+        primary, backup = FakeProvider("primary"), FakeProvider("backup")
+        gateway = make_gateway(primary.provider(), backup.provider())
+        primary.failure = "down"
+
+        async with gateway.stream_chat_completion({"messages": []}) as response:
+            body = await response.aread()
+
+        assert response.status_code == 200
+        assert b"From backup." in body
+        assert backup.requests[0]["stream"] is True
+        assert gateway.stats()["upstream_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_relays_the_last_error_when_every_provider_fails(self, client):
+        primary, backup = FakeProvider("primary"), FakeProvider("backup")
+        primary.failure, backup.failure = "down", 503
+        gateway = make_gateway(primary.provider(), backup.provider())
+        app.dependency_overrides[get_gateway] = lambda: gateway
+
+        response = await client.post("/v1/chat/completions", json={"messages": []})
+        assert response.status_code == 503
+        assert response.json() == {"error": {"message": "backup failed"}}
+
+        # Both circuits open after two failures; nothing is tried then
+        await client.post("/v1/chat/completions", json={"messages": []})
+        response = await client.post("/v1/chat/completions", json={"messages": []})
+        assert response.status_code == 503
+        assert response.json()["error"]["message"] == "No LLM provider available"
+        assert len(primary.requests) == len(backup.requests) == 2
@@ -0,0 +1,46 @@
+"""notify on prompts change
+
+Revision ID: d3a104e711b3
+Revises: bec9ffef74c4
+Create Date: 2026-10-17 22:03:41.118240
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3a104e711b3"
+down_revision: Union[str, None] = "bec9ffef74c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tell listening prompts-service instances to drop their cached catalog.
+    # NOTIFY is delivered on commit, so rolled back changes never invalidate.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_prompts_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('prompts_changed', TG_OP);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER prompts_changed
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON prompts
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_prompts_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS prompts_changed ON prompts")
+    op.execute("DROP FUNCTION IF EXISTS notify_prompts_changed()")
@@ -9,15 +9,19 @@ sys.path.append(os.path.dirname(__file__))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import close_engine
+from database import close_engine, pool_stats
+from metrics import register_metrics, router as metrics_router
 from router import router as prompts_router
+from prompts_cache import prompts_cache
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handle startup and shutdown events."""
     # Database migrations are handled by alembic upgrade head in startup script
+    await prompts_cache.start_listener()
     yield
+    await prompts_cache.stop_listener()
     await close_engine()  # Properly close the database engine
 
 
@@ -39,6 +43,10 @@ app.add_middleware(
 
 # Include prompts router (existing code, no modifications)
 app.include_router(prompts_router, prefix="/api", tags=["prompts"])
+app.include_router(metrics_router, tags=["metrics"])
+
+register_metrics("db_pool", pool_stats)
+register_metrics("prompts_cache", prompts_cache.stats)
 
 
 @app.get("/health")
@@ -0,0 +1,209 @@
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../shared"))
+
+import asyncio
+import asyncpg
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy.engine import make_url
+
+from config import settings
+from resilience import RetryPolicy
+from schemas import PromptListResponse
+
+# Channel the prompts_changed trigger notifies on
+PROMPTS_CHANGED_CHANNEL = "prompts_changed"
+
+
+@dataclass(frozen=True)
+class CachedCatalog:
+    """Serialized GET /prompts response and the table version it was built from."""
+
+    version: Tuple[Any, ...]
+    body: bytes
+    etag: str
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class PromptCatalogCache:
+    """
+    In-process cache of the serialized active prompts catalog.
+
+    While the LISTEN connection is up, the catalog is served from memory until
+    a prompts_changed notification arrives, and is then reloaded from the
+    primary. Without it (startup failure, lost connection, tests), each
+    request runs a cheap count/max(updated_at) version query and rebuilds the
+    catalog only when the version moved. A failed or lost LISTEN connection
+    is reopened in the background with backoff.
+    """
+
+    def __init__(self, reconnect_policy: Optional[RetryPolicy] = None):
+        self._catalog: Optional[CachedCatalog] = None
+        # Bumped by every invalidation; the catalog is current while it
+        # matches the generation the last successful refresh started at
+        self._generation = 0
+        self._loaded_generation: Optional[int] = None
+        self._connection: Optional[asyncpg.Connection] = None
+        self._database_url: Optional[str] = None
+        self._reconnect_task: Optional["asyncio.Task[None]"] = None
+        self.reconnect_policy = reconnect_policy or RetryPolicy(
+            base_delay=settings.prompts_listener_reconnect_base_delay,
+            max_delay=settings.prompts_listener_reconnect_max_delay,
+        )
+        self.hits = 0
+        self.version_checks = 0
+        self.refreshes = 0
+        self.not_modified = 0
+        self.notifications = 0
+        self.reconnects = 0
+
+    @property
+    def listening(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    def invalidate(self) -> None:
+        self._generation += 1
+
+    async def get(self, repository) -> CachedCatalog:
+        """Get the current catalog, refreshing it from the repository if needed."""
+        catalog = self._catalog
+        listening = self.listening
+        if (
+            catalog is not None
+            and listening
+            and self._loaded_generation == self._generation
+        ):
+            self.hits += 1
+            return catalog
+
+        # A notification during the refresh bumps the generation past this
+        # one, and a failed refresh leaves it behind, so either way the next
+        # request refreshes again
+        generation = self._generation
+        if listening:
+            # Notified of a change: reload unconditionally, since an UPDATE
+            # that leaves updated_at alone fires the trigger without moving
+            # the version, and from the primary the NOTIFY came from, which a
+            # replica may not have caught up with yet
+            version = tuple(await repository.get_catalog_version(primary=True))
+            prompts = await repository.get_active_prompts(primary=True)
+        else:
+            self.version_checks += 1
+            version = tuple(await repository.get_catalog_version())
+            if catalog is not None and catalog.version == version:
+                self.hits += 1
+                return catalog
+            prompts = await repository.get_active_prompts()
+
+        body = (
+            PromptListResponse(success=True, prompts=prompts).model_dump_json().encode()
+        )
+        catalog = CachedCatalog(
+            version=version,
+            body=body,
+            etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        )
+        self._catalog = catalog
+        self._loaded_generation = generation
+        self.refreshes += 1
+        return catalog
+
+    async def start_listener(self, database_url: Optional[str] = None) -> None:
+        """LISTEN for prompts changes; until it is up requests fall back to version checks."""
+        url = make_url(database_url or settings.database_url).set(
+            drivername="postgresql"
+        )
+        self._database_url = url.render_as_string(hide_password=False)
+        try:
+            await self._listen()
+        except Exception as e:
+            print(f"Prompts cache listener unavailable, using version checks: {e}")
+            self._schedule_reconnect()
+
+    async def stop_listener(self) -> None:
+        self._database_url = None
+        task, self._reconnect_task = self._reconnect_task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(self._database_url)
+        try:
+            await connection.add_listener(
+                PROMPTS_CHANGED_CHANNEL, self._on_notification
+            )
+            connection.add_termination_listener(self._on_termination)
+        except BaseException:
+            await connection.close()
+            raise
+        self._connection = connection
+        # Anything cached before LISTEN started, or changed while it was
+        # down, may already be outdated
+        self.invalidate()
+
+    def _schedule_reconnect(self) -> None:
+        if self._database_url is not None and self._reconnect_task is None:
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        retry = 0
+        try:
+            while True:
+                retry += 1
+                await asyncio.sleep(self.reconnect_policy.backoff(retry))
+                try:
+                    await self._listen()
+                except Exception as e:
+                    print(f"Prompts cache listener reconnect failed: {e}")
+                    continue
+                self.reconnects += 1
+                print("Prompts cache listener reconnected")
+                return
+        finally:
+            self._reconnect_task = None
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.notifications += 1
+        self.invalidate()
+
+    def _on_termination(self, connection) -> None:
+        if connection is not self._connection:
+            # Closed by stop_listener
+            return
+        print("Prompts cache listener connection lost, using version checks")
+        self._connection = None
+        self.invalidate()
+        self._schedule_reconnect()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "listening": self.listening,
+            "cached": self._catalog is not None,
+            "hits": self.hits,
+            "version_checks": self.version_checks,
+            "refreshes": self.refreshes,
+            "not_modified": self.not_modified,
+            "notifications": self.notifications,
+            "reconnects": self.reconnects,
+        }
+
+
+# Shared by every request in this process
+prompts_cache = PromptCatalogCache()
@@ -4,11 +4,11 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../shared"))
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import func, select
+from typing import Any, List, Tuple
 from fastapi import Depends
 
-from database import get_db
+from database import get_db, get_read_db
 from models import Prompt
 from schemas import PromptBase
 
@@ -16,10 +16,31 @@ from schemas import PromptBase
 class PromptRepository:
     """Repository class for prompt-related business logic."""
 
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        read_db: AsyncSession = Depends(get_read_db),
+    ):
         self.db = db
+        self.read_db = read_db
 
-    async def get_active_prompts(self) -> List[PromptBase]:
-        """Get all active prompts from the database."""
-        prompts = await self.db.scalars(select(Prompt).where(Prompt.is_active == True))
+    async def get_active_prompts(self, primary: bool = False) -> List[PromptBase]:
+        """Get all active prompts from the database (the replica unless
+        `primary`, for reads that must see a change just committed)."""
+        db = self.db if primary else self.read_db
+        prompts = await db.scalars(select(Prompt).where(Prompt.is_active == True))
         return [PromptBase.model_validate(prompt) for prompt in prompts]
+
+    async def get_catalog_version(self, primary: bool = False) -> Tuple[Any, ...]:
+        """
+        Cheap fingerprint of the prompts table: row count and latest change.
+        It moves whenever a prompt is inserted, deleted or updated via the ORM.
+        """
+        db = self.db if primary else self.read_db
+        result = await db.execute(
+            select(
+                func.count(Prompt.id),
+                func.max(func.coalesce(Prompt.updated_at, Prompt.created_at)),
+            )
+        )
+        return tuple(result.one())
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from repository import PromptRepository
 from schemas import PromptListResponse
+from prompts_cache import prompts_cache, etag_matches
 
 router = APIRouter()
 
 
 @router.get("/prompts", response_model=PromptListResponse)
-async def get_prompts(repository: PromptRepository = Depends()):
+async def get_prompts(request: Request, repository: PromptRepository = Depends()):
     """
     Get predefined career advice prompts to help users get started
     """
     try:
-        prompts = await repository.get_active_prompts()
-        return PromptListResponse(success=True, prompts=prompts)
+        catalog = await prompts_cache.get(repository)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    # Clients may keep the catalog but must revalidate it with If-None-Match
+    headers = {"ETag": catalog.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), catalog.etag):
+        prompts_cache.not_modified += 1
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=catalog.body, media_type="application/json", headers=headers
+    )
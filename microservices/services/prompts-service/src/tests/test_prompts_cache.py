@@ -0,0 +1,231 @@
+import asyncio
+import pytest
+from uuid import uuid4
+import sys
+import os
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import text
+from models import Prompt
+from prompts_cache import PromptCatalogCache, etag_matches
+from repository import PromptRepository
+from resilience import RetryPolicy
+from tests.conftest import TEST_DATABASE_URL
+
+
+class CountingRepository:
+    """Wraps PromptRepository to count the queries the cache issues."""
+
+    def __init__(self, repository):
+        self.repository = repository
+        self.version_queries = 0
+        self.catalog_queries = 0
+        self.primary_queries = 0
+        self.failures = 0
+
+    async def get_catalog_version(self, primary=False):
+        self.version_queries += 1
+        self.primary_queries += primary
+        return await self.repository.get_catalog_version(primary=primary)
+
+    async def get_active_prompts(self, primary=False):
+        self.catalog_queries += 1
+        self.primary_queries += primary
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database unavailable")
+        return await self.repository.get_active_prompts(primary=primary)
+
+
+async def notify_change(db_engine, cache, statement, **params):
+    """Commit a statement on prompts and wait for the cache to be notified."""
+    notifications = cache.notifications
+    async with db_engine.begin() as conn:
+        await conn.execute(text(statement), params)
+    for _ in range(50):
+        if cache.notifications > notifications:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("No prompts_changed notification")
+
+
+@pytest.fixture
+def repository(db_session):
+    return CountingRepository(PromptRepository(db_session, db_session))
+
+
+class TestPromptsCache:
+    """Tests for the cached prompts catalog and conditional GETs."""
+
+    @pytest.mark.asyncio
+    async def test_conditional_get_returns_304(self, client):
+        """Test a matching If-None-Match gets 304 with no body."""
+        first = await client.get("/api/prompts")
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+
+        response = await client.get("/api/prompts", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+        response = await client.get(
+            "/api/prompts", headers={"If-None-Match": '"stale", W/' + etag}
+        )
+        assert response.status_code == 304
+
+        response = await client.get("/api/prompts", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert len(response.json()["prompts"]) == 6
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_with_catalog(self, client, db_session):
+        """Test a new prompt changes the ETag so old copies are not revalidated."""
+        etag = (await client.get("/api/prompts")).headers["etag"]
+
+        db_session.add(Prompt(id=uuid4(), title="Test ETag", prompt_text="New?"))
+        await db_session.flush()
+
+        response = await client.get("/api/prompts", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert "Test ETag" in [p["title"] for p in response.json()["prompts"]]
+
+    @pytest.mark.asyncio
+    async def test_version_check_skips_rebuild(self, repository):
+        """Test without a listener only the version query runs while unchanged."""
+        cache = PromptCatalogCache()
+
+        first = await cache.get(repository)
+        second = await cache.get(repository)
+
+        assert first is second
+        assert repository.version_queries == 2
+        assert repository.catalog_queries == 1
+
+    @pytest.mark.asyncio
+    async def test_listener_serves_from_memory_until_notified(
+        self, repository, db_engine
+    ):
+        """Test with LISTEN running there are no queries until the trigger fires."""
+        cache = PromptCatalogCache()
+        await cache.start_listener(TEST_DATABASE_URL)
+        try:
+            assert cache.listening
+            await cache.get(repository)
+            for _ in range(5):
+                await cache.get(repository)
+            assert repository.version_queries == 1
+            assert repository.catalog_queries == 1
+
+            # A committed statement on prompts fires the trigger even when no
+            # row changes, which keeps the seeded catalog intact
+            await notify_change(
+                db_engine, cache, "UPDATE prompts SET title = title WHERE false"
+            )
+            assert cache.notifications == 1
+
+            await cache.get(repository)
+            # Reloaded from the primary even though the version did not move
+            assert repository.catalog_queries == 2
+            assert repository.primary_queries == 4
+        finally:
+            await cache.stop_listener()
+        assert not cache.listening
+
+    @pytest.mark.asyncio
+    async def test_raw_update_reloads_catalog(self, repository, db_engine):
+        """Test an UPDATE that leaves updated_at alone still changes the catalog."""
+        async with db_engine.connect() as conn:
+            prompt_id, prompt_text = (
+                await conn.execute(
+                    text("SELECT id, prompt_text FROM prompts ORDER BY title LIMIT 1")
+                )
+            ).one()
+        update = "UPDATE prompts SET prompt_text = :prompt_text WHERE id = :id"
+        cache = PromptCatalogCache()
+        await cache.start_listener(TEST_DATABASE_URL)
+        try:
+            before = await cache.get(repository)
+            await notify_change(
+                db_engine, cache, update, prompt_text="Rewritten?", id=prompt_id
+            )
+
+            after = await cache.get(repository)
+
+            assert b"Rewritten?" in after.body
+            assert after.etag != before.etag
+        finally:
+            await cache.stop_listener()
+            async with db_engine.begin() as conn:
+                await conn.execute(
+                    text(update), {"prompt_text": prompt_text, "id": prompt_id}
+                )
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_stays_stale(self, repository, db_engine):
+        """Test a notified refresh that raises is retried by the next request."""
+        cache = PromptCatalogCache()
+        await cache.start_listener(TEST_DATABASE_URL)
+        try:
+            await cache.get(repository)
+            await notify_change(
+                db_engine, cache, "UPDATE prompts SET title = title WHERE false"
+            )
+            repository.failures = 1
+            with pytest.raises(RuntimeError):
+                await cache.get(repository)
+
+            catalog = await cache.get(repository)
+            assert await cache.get(repository) is catalog
+            assert repository.catalog_queries == 3
+        finally:
+            await cache.stop_listener()
+
+    @pytest.mark.asyncio
+    async def test_listener_reconnects_after_connection_loss(
+        self, repository, db_engine
+    ):
+        """Test a lost LISTEN connection is reopened and the catalog reloaded."""
+        cache = PromptCatalogCache(
+            reconnect_policy=RetryPolicy(base_delay=0.01, max_delay=0.05)
+        )
+        await cache.start_listener(TEST_DATABASE_URL)
+        try:
+            await cache.get(repository)
+            async with db_engine.begin() as conn:
+                await conn.execute(
+                    text("SELECT pg_terminate_backend(:pid)"),
+                    {"pid": cache._connection.get_server_pid()},
+                )
+
+            for _ in range(100):
+                if cache.stats()["reconnects"]:
+                    break
+                await asyncio.sleep(0.01)
+            assert cache.listening
+            assert cache.stats()["reconnects"] == 1
+
+            # Changes missed while disconnected are picked up, and new ones
+            # are notified on the new connection
+            await cache.get(repository)
+            assert repository.catalog_queries == 2
+            await notify_change(
+                db_engine, cache, "UPDATE prompts SET title = title WHERE false"
+            )
+            await cache.get(repository)
+            assert repository.catalog_queries == 3
+        finally:
+            await cache.stop_listener()
+        assert not cache.listening
+
+    def test_etag_matches(self):
+        """Test If-None-Match parsing for lists, weak tags and wildcards."""
+        assert etag_matches('"a"', '"a"')
+        assert etag_matches('W/"a"', '"a"')
+        assert etag_matches("*", '"a"')
+        assert not etag_matches(None, '"a"')
+        assert not etag_matches('"b"', '"a"')
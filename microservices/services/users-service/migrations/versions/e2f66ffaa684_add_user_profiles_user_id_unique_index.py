@@ -0,0 +1,43 @@
+"""add user_profiles user_id unique index
+
+Revision ID: e2f66ffaa684
+Revises: 1eda9181f560
+Create Date: 2026-10-17 21:14:03.527961
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f66ffaa684"
+down_revision: Union[str, None] = "1eda9181f560"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One profile per user; also serves the profile lookup join by user_id.
+    # Built concurrently so profile reads and writes continue meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_user_profiles_user_id",
+            "user_profiles",
+            ["user_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_user_profiles_user_id",
+            table_name="user_profiles",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
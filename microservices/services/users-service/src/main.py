@@ -9,7 +9,8 @@ sys.path.append(os.path.dirname(__file__))
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import close_engine
+from database import close_engine, pool_stats
+from metrics import register_metrics, router as metrics_router
 from router import router as users_router
 
 
@@ -39,6 +40,9 @@ app.add_middleware(
 
 # Include users router (existing code, no modifications)
 app.include_router(users_router, prefix="/api", tags=["users"])
+app.include_router(metrics_router, tags=["metrics"])
+
+register_metrics("db_pool", pool_stats)
 
 
 @app.get("/health")
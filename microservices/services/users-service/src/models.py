@@ -14,7 +14,7 @@ class UserProfile(BaseModel):
     __tablename__ = "user_profiles"
 
     user_id = Column(
-        UUID(as_uuid=True), nullable=False
+        UUID(as_uuid=True), nullable=False, unique=True, index=True
     )  # No foreign key for microservices
     years_experience = Column(Integer)
     skills = Column(JSON)  # JSON field for flexible skills storage
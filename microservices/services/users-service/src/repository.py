@@ -4,27 +4,51 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../shared"))
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
 from uuid import UUID
-from typing import List
+from typing import List, Optional, Tuple
 from fastapi import Depends
 
-from database import get_db
+from database import get_db, get_read_db
 from models import User, UserProfile
 
 
 class UserRepository:
-    def __init__(self, db: AsyncSession = Depends(get_db)):
+    def __init__(
+        self,
+        db: AsyncSession = Depends(get_db),
+        read_db: AsyncSession = Depends(get_read_db),
+    ):
         self.db = db
+        self.read_db = read_db
 
-    async def get_user_by_id(self, user_id: UUID) -> User | None:
-        """Get a user by ID."""
-        result = await self.db.execute(select(User).where(User.id == user_id))
-        return result.scalars().first()
+    async def get_user_profiles(self, user_ids: List[UUID]) -> List[UserProfile]:
+        """
+        Get the profiles of several users in one query. The IDs are bound as a
+        single array parameter, so every batch size shares one statement.
+        """
+        user_ids_param = bindparam(
+            "user_ids", list(user_ids), type_=ARRAY(PG_UUID(as_uuid=True))
+        )
+        result = await self.read_db.execute(
+            select(UserProfile).where(UserProfile.user_id == any_(user_ids_param))
+        )
+        return result.scalars().all()
 
-    async def get_user_profile(self, user_id: UUID) -> UserProfile | None:
-        """Get user profile by user ID."""
-        result = await self.db.execute(
-            select(UserProfile).where(UserProfile.user_id == user_id)
+    async def get_user_with_profile(
+        self, user_id: UUID
+    ) -> Tuple[bool, Optional[UserProfile]]:
+        """
+        Resolve whether a user exists and get their profile in one query.
+        Returns (user_exists, profile); profile is None if the user has none.
+        """
+        result = await self.read_db.execute(
+            select(User.id, UserProfile)
+            .outerjoin(UserProfile, UserProfile.user_id == User.id)
+            .where(User.id == user_id)
         )
-        return result.scalars().first()
+        row = result.first()
+        if row is None:
+            return False, None
+        return True, row.UserProfile
@@ -1,25 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException
 from uuid import UUID
 
-from schemas import UserProfileResponse, UserProfileBase
+from schemas import (
+    UserProfileResponse,
+    UserProfileBase,
+    BatchGetUserProfilesRequest,
+    BatchGetUserProfilesResponse,
+)
 from repository import UserRepository
 
 router = APIRouter()
 
 
+@router.post("/users/profiles:batchGet")
+async def batch_get_user_profiles(
+    request: BatchGetUserProfilesRequest, repository: UserRepository = Depends()
+) -> BatchGetUserProfilesResponse:
+    """Get the profiles of up to users_profile_batch_max_size users; users without a profile are omitted."""
+    try:
+        profiles = await repository.get_user_profiles(
+            list(dict.fromkeys(request.user_ids))
+        )
+        return BatchGetUserProfilesResponse(
+            success=True,
+            profiles=[UserProfileBase.model_validate(p) for p in profiles],
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/users/{user_id}/profile")
 async def get_user_profile(
     user_id: UUID, repository: UserRepository = Depends()
 ) -> UserProfileResponse:
     """Get user profile by user ID."""
     try:
-        # First check if user exists
-        user = await repository.get_user_by_id(user_id)
-        if not user:
+        # Check the user exists and get the profile in a single round-trip
+        user_exists, profile = await repository.get_user_with_profile(user_id)
+        if not user_exists:
             raise HTTPException(status_code=404, detail="User not found")
 
-        # Get user profile
-        profile = await repository.get_user_profile(user_id)
         if not profile:
             return UserProfileResponse(
                 success=True, profile=None, message="User profile not found"
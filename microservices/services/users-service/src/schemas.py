@@ -1,7 +1,14 @@
-from pydantic import BaseModel, ConfigDict
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../shared"))
+
+from pydantic import BaseModel, ConfigDict, Field
 from uuid import UUID
 from typing import Optional, List, Any
 
+from config import settings
+
 
 class UserBase(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -26,3 +33,15 @@ class UserProfileResponse(BaseModel):
     success: bool
     profile: Optional[UserProfileBase] = None
     message: Optional[str] = None
+
+
+class BatchGetUserProfilesRequest(BaseModel):
+    # Same limit the UsersClient splits its batches by
+    user_ids: List[UUID] = Field(
+        min_length=1, max_length=settings.users_profile_batch_max_size
+    )
+
+
+class BatchGetUserProfilesResponse(BaseModel):
+    success: bool
+    profiles: List[UserProfileBase]
@@ -0,0 +1,91 @@
+import pytest
+import sys
+import os
+from uuid import uuid4
+
+# Add paths for microservices setup
+sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event
+from models import User, UserProfile
+from config import settings
+
+
+class TestBatchGetUserProfiles:
+    """Integration tests for the batch profile endpoint."""
+
+    async def create_user(self, db_session, with_profile: bool = True):
+        user_id = uuid4()
+        db_session.add(User(id=user_id, name="Test User", email=f"{user_id}@example.com"))
+        if with_profile:
+            db_session.add(
+                UserProfile(id=uuid4(), user_id=user_id, skills=["Python"])
+            )
+        return user_id
+
+    @pytest.mark.asyncio
+    async def test_batch_get_returns_existing_profiles(self, client, db_session):
+        """Test profiles are returned for users that have one, others are omitted."""
+        with_profiles = [await self.create_user(db_session) for _ in range(3)]
+        without_profile = await self.create_user(db_session, with_profile=False)
+        await db_session.commit()
+
+        response = await client.post(
+            "/api/users/profiles:batchGet",
+            json={
+                "user_ids": [str(u) for u in with_profiles]
+                + [str(without_profile), str(uuid4())]
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert {p["user_id"] for p in data["profiles"]} == {
+            str(u) for u in with_profiles
+        }
+
+    @pytest.mark.asyncio
+    async def test_batch_get_is_one_query(self, client, db_session):
+        """Test the whole batch is read with a single SELECT."""
+        user_ids = [await self.create_user(db_session) for _ in range(5)]
+        await db_session.commit()
+
+        statements = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        sync_engine = db_session.bind.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_selects)
+        try:
+            response = await client.post(
+                "/api/users/profiles:batchGet",
+                json={"user_ids": [str(u) for u in user_ids + user_ids]},
+            )
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_selects)
+
+        assert response.status_code == 200
+        assert len(response.json()["profiles"]) == 5
+        assert len(statements) == 1
+        assert "ANY" in statements[0].upper()
+
+    @pytest.mark.asyncio
+    async def test_batch_get_validates_size(self, client):
+        """Test empty and oversized batches are rejected."""
+        response = await client.post("/api/users/profiles:batchGet", json={"user_ids": []})
+        assert response.status_code == 422
+
+        response = await client.post(
+            "/api/users/profiles:batchGet",
+            json={
+                "user_ids": [
+                    str(uuid4())
+                    for _ in range(settings.users_profile_batch_max_size + 1)
+                ]
+            },
+        )
+        assert response.status_code == 422
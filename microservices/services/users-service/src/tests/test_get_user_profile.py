@@ -8,6 +8,7 @@ from uuid import uuid4
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../../../shared"))
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
+from sqlalchemy import event
 from models import User, UserProfile
 
 
@@ -132,3 +133,28 @@ class TestGetUserProfile:
         assert data["profile"]["skills"] is None
         assert data["profile"]["career_goals"] is None
         assert data["profile"]["preferred_work_style"] is None
+
+    @pytest.mark.asyncio
+    async def test_get_user_profile_single_query(self, client, db_session):
+        """Test user existence and profile are resolved in one SELECT."""
+        user_id = uuid4()
+        db_session.add(User(id=user_id, name="Ann Lee", email="ann@example.com"))
+        db_session.add(UserProfile(id=uuid4(), user_id=user_id, years_experience=3))
+        await db_session.commit()
+
+        statements = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        sync_engine = db_session.bind.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", count_selects)
+        try:
+            response = await client.get(f"/api/users/{user_id}/profile")
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_selects)
+
+        assert response.status_code == 200
+        assert response.json()["profile"]["years_experience"] == 3
+        assert len(statements) == 1
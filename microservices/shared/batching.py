@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class BatchLoader:
+    """
+    Dataloader-style batching: single-key loads issued in the same event loop
+    tick (or within `delay` seconds) are collected and resolved by one call to
+    `batch_fn`, which maps the requested keys to their values. Keys missing
+    from its result resolve to None; if it raises, every caller in the batch
+    gets the exception.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+        max_batch_size: int = 100,
+        delay: float = 0.0,
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.delay = delay
+        self._pending: List[Tuple[Hashable, "asyncio.Future[Any]"]] = []
+        self._scheduled: Optional[asyncio.Handle] = None
+        # The event loop only keeps weak references to tasks
+        self._running: Set["asyncio.Task[None]"] = set()
+        self.batches = 0
+        self.keys_loaded = 0
+
+    async def load(self, key: Hashable) -> Any:
+        """Queue a key for the next batch and wait for its value."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((key, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._scheduled is None:
+            if self.delay > 0:
+                self._scheduled = loop.call_later(self.delay, self._dispatch)
+            else:
+                self._scheduled = loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self) -> None:
+        if self._scheduled is not None:
+            self._scheduled.cancel()
+            self._scheduled = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Hashable, "asyncio.Future[Any]"]]):
+        keys = list(dict.fromkeys(key for key, _ in batch))
+        self.batches += 1
+        self.keys_loaded += len(keys)
+        try:
+            values = await self.batch_fn(keys)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, future in batch:
+            if not future.done():
+                future.set_result(values.get(key))
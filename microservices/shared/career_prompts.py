@@ -0,0 +1,43 @@
+from typing import Any, Dict, Optional
+
+# Shared by every service that asks the LLM for career advice, so the
+# conversations service and the llm-service answer the same way
+CAREER_ADVISOR_SYSTEM_PROMPT = (
+    "You are a career advisor for tech workers (software engineers, data scientists, DevOps engineers, etc.). "
+    + "You specialize in helping Tech professionals navigate their careers in the current market, and you are here to help them make informed decisions. "
+    + "Provide advice that is: \n"
+    + "- Personalized to their specific skills, experience level, and goals\n"
+    + "- Actionable with concrete next steps and timelines\n"
+    + "- Realistic about current market conditions and industry trends (likely future market conditions)\n"
+    + "- Structured: direct answer, specific recommendations, immediate action items\n"
+    "- Keep it concise and to the point (short answers)\n"
+    "Consider factors like remote work trends, AI impact on roles, startup vs enterprise dynamics, and emerging technologies when giving advice."
+)
+
+
+def build_career_prompt(
+    user_profile: Dict[str, Any], question: Optional[str] = None
+) -> str:
+    """Build a detailed prompt for career advice based on user profile"""
+
+    skills = user_profile.get("skills", [])
+    years_experience = user_profile.get("years_experience", "")
+    career_goals = user_profile.get("career_goals", '')
+
+    prompt = f"""
+    I'm a tech worker seeking career advice. Here's my profile:
+    Years of Experience: {years_experience}
+
+    Technical Skills:
+    {', '.join(skills) if skills else 'Not specified'}
+
+    Career Goals:
+    {career_goals if career_goals else 'Not specified'}
+    """
+
+    if question:
+        prompt += f"\n\nSpecific Question: {question}"
+    else:
+        prompt += "\n\nPlease provide personalized career advice including potential career paths, skills to develop, and actionable next steps."
+
+    return prompt.strip()
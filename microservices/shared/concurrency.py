@@ -0,0 +1,199 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Run awaitables concurrently and return their results in order. If one
+    fails, or the caller is cancelled, the others are cancelled and awaited
+    before the error propagates, as asyncio.TaskGroup does on Python 3.11+.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when a request could not get a slot: the queue was full or the wait timed out."""
+
+
+class LimiterSlot:
+    """A held slot of an AdaptiveConcurrencyLimiter, used to report the outcome."""
+
+    def __init__(self, clock: Callable[[], float]):
+        self._clock = clock
+        self.started_at = clock()
+        self.latency: Optional[float] = None
+        self.is_overloaded = False
+
+    def responded(self) -> None:
+        """Take the latency sample now (e.g. at the first streamed token)
+        instead of when the slot is released."""
+        if self.latency is None:
+            self.latency = self._clock() - self.started_at
+
+    def overloaded(self) -> None:
+        """Report that the upstream was overloaded (rate limited, timed out)."""
+        self.is_overloaded = True
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit for calls to an upstream whose capacity is not
+    known in advance, such as an LLM provider.
+
+    Each successful call that found the limit at least half used raises it
+    by 1/limit, so about one per limit's worth of calls (additive
+    increase). A call reported as overloaded, or recent latency rising
+    above `latency_tolerance` times the long-term average, multiplies it by
+    `backoff_ratio` (multiplicative decrease), at most once per round: calls
+    that started before the last decrease do not decrease it again.
+
+    Calls beyond the limit wait in a FIFO queue of at most `max_queue`
+    entries for up to `queue_timeout` seconds, then get
+    ConcurrencyLimitExceeded, so excess load fails fast instead of piling
+    onto a saturated upstream.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        backoff_ratio: float = 0.75,
+        latency_tolerance: float = 2.0,
+        max_queue: int = 100,
+        queue_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._clock = clock
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._last_decrease_at = float("-inf")
+        self.in_flight = 0
+        # Long- and short-term moving averages of call latency; completion
+        # times vary with answer length, so single calls are not compared
+        self.baseline_latency: Optional[float] = None
+        self.recent_latency: Optional[float] = None
+        self.successes = 0
+        self.overloads = 0
+        self.decreases = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[LimiterSlot]:
+        """
+        Hold a slot for the duration of the block. Leaving it normally is a
+        success; leaving with an exception counts neither way unless the
+        slot was marked overloaded.
+        """
+        await self._acquire()
+        slot = LimiterSlot(self._clock)
+        try:
+            yield slot
+        except BaseException:
+            if slot.is_overloaded:
+                self._on_overload(slot)
+            raise
+        else:
+            if slot.is_overloaded:
+                self._on_overload(slot)
+            else:
+                self._on_success(slot)
+        finally:
+            self.in_flight -= 1
+            self._wake()
+
+    async def _acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise ConcurrencyLimitExceeded(
+                f"Concurrency limit {int(self.limit)} reached and queue full"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the wait ended; pass it on
+                self.in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                # A release may have dequeued the cancelled waiter already
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+                raise ConcurrencyLimitExceeded(
+                    f"Waited {self.queue_timeout}s for a concurrency slot"
+                ) from None
+            raise
+
+    def _wake(self) -> None:
+        """Hand free slots to waiters, oldest first."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _on_success(self, slot: LimiterSlot) -> None:
+        self.successes += 1
+        slot.responded()
+        latency = slot.latency
+        if self.baseline_latency is None:
+            self.baseline_latency = self.recent_latency = latency
+        self.baseline_latency += (latency - self.baseline_latency) * 0.02
+        self.recent_latency += (latency - self.recent_latency) * 0.2
+
+        if self.recent_latency > self.baseline_latency * self.latency_tolerance:
+            self._decrease(slot)
+        elif self.in_flight >= self.limit / 2:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._wake()
+
+    def _on_overload(self, slot: LimiterSlot) -> None:
+        self.overloads += 1
+        self._decrease(slot)
+
+    def _decrease(self, slot: LimiterSlot) -> None:
+        if slot.started_at < self._last_decrease_at:
+            return
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        self._last_decrease_at = self._clock()
+        self.decreases += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and gauges for the metrics endpoint."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "baseline_latency_seconds": self.baseline_latency,
+            "recent_latency_seconds": self.recent_latency,
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "decreases": self.decreases,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
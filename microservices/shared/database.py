@@ -1,17 +1,62 @@
+from typing import Any, Dict, Optional
+from fastapi import Depends
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy import text
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
 from config import settings
 from base import Base
 
+# Session.info key set once a session has written to the primary
+HAS_WRITES = "has_writes"
+
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        echo=settings.db_echo,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_recycle=settings.db_pool_recycle,
+        connect_args={
+            # asyncpg's own statement cache and SQLAlchemy's prepared statement
+            # cache on top of it
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=True,  # Set to False in production
-)
+engine = _create_engine(settings.database_url)
 AsyncSessionLocal = async_sessionmaker(
     autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
 )
 
+# Read replica engine, only when one is configured
+read_engine = (
+    _create_engine(settings.database_read_url) if settings.database_read_url else None
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(
+        autocommit=False, autoflush=False, bind=read_engine, class_=AsyncSession
+    )
+    if read_engine is not None
+    else None
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_as_write(session, flush_context):
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml_as_write(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[HAS_WRITES] = True
+
 
 async def get_db():
     """Dependency to get database session"""
@@ -22,6 +67,83 @@ async def get_db():
             await session.close()
 
 
+class ReadSession:
+    """
+    Session facade for read-only queries. Queries go to the replica until the
+    request's primary session writes; from then on they go to the primary so
+    the request reads its own writes despite replication lag.
+    """
+
+    def __init__(self, primary: AsyncSession):
+        self.primary = primary
+        self._replica: Optional[AsyncSession] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if AsyncReadSessionLocal is None or self.primary.info.get(HAS_WRITES):
+            return self.primary
+        if self._replica is None:
+            self._replica = AsyncReadSessionLocal()
+        return self._replica
+
+    async def execute(self, *args, **kwargs):
+        return await self.session.execute(*args, **kwargs)
+
+    async def scalar(self, *args, **kwargs):
+        return await self.session.scalar(*args, **kwargs)
+
+    async def scalars(self, *args, **kwargs):
+        return await self.session.scalars(*args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        return await self.session.get(*args, **kwargs)
+
+    async def close(self):
+        if self._replica is not None:
+            await self._replica.close()
+            self._replica = None
+
+
+async def get_read_db(db: AsyncSession = Depends(get_db)):
+    """
+    Dependency to get a session for read-only queries: the request's primary
+    session when no replica is configured, a replica-routing ReadSession
+    otherwise.
+    """
+    if AsyncReadSessionLocal is None:
+        yield db
+        return
+
+    read_session = ReadSession(db)
+    try:
+        yield read_session
+    finally:
+        await read_session.close()
+
+
+def _pool_stats(pool_engine) -> Dict[str, Any]:
+    pool = pool_engine.pool
+    capacity = settings.db_pool_size + settings.db_max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "pool_size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "capacity": capacity,
+        "utilization": checked_out / capacity if capacity else 0.0,
+    }
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Connection pool saturation for the metrics endpoint."""
+    stats = _pool_stats(engine)
+    if read_engine is not None:
+        stats["replica"] = _pool_stats(read_engine)
+    return stats
+
+
 async def create_tables():
     """Create all tables"""
     async with engine.begin() as conn:
@@ -32,3 +154,5 @@ async def create_tables():
 
 async def close_engine():
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
@@ -0,0 +1,34 @@
+import httpx
+from typing import Optional
+from uuid import UUID
+import os
+from feign_clients.http_client import get_http_client
+
+
+class ConversationsClient:
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # Use Kubernetes service name when running in cluster, localhost for local development
+        self.base_url = os.getenv(
+            "CONVERSATIONS_SERVICE_URL", "http://conversations-service:8000"
+        )
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The injected client, or the shared pooled one."""
+        return self._http_client or get_http_client()
+
+    async def invalidate_user_profile(self, user_id: UUID) -> bool:
+        """
+        Ask the Conversations Service to drop its cached copy of a user profile.
+        Call after a profile write; the cache TTL bounds staleness on any
+        replica the request does not reach. Returns whether the call succeeded.
+        """
+        try:
+            response = await self.http_client.delete(
+                f"{self.base_url}/internal/users/{user_id}/profile-cache"
+            )
+            return response.status_code == 200
+        except httpx.RequestError as e:
+            print(f"Request error when invalidating user profile {user_id}: {e}")
+            return False
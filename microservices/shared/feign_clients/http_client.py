@@ -0,0 +1,38 @@
+import httpx
+from typing import Optional
+from config import settings
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP client for service-to-service calls."""
+    return httpx.AsyncClient(
+        timeout=settings.feign_client_timeout,
+        limits=httpx.Limits(
+            max_connections=settings.feign_client_max_connections,
+            max_keepalive_connections=settings.feign_client_max_keepalive_connections,
+            keepalive_expiry=settings.feign_client_keepalive_expiry,
+        ),
+        # HTTP/2 needs the h2 package and only applies to https:// upstreams
+        http2=settings.feign_client_http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide HTTP client shared by all feign clients.
+    It is opened in the service lifespan, or lazily on first use.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its keep-alive connections."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -1,44 +1,189 @@
+import asyncio
 import httpx
-from typing import Optional, Dict, Any
+from typing import Awaitable, Callable, Optional, Dict, Any, Iterable, List
 from uuid import UUID
 import os
+from batching import BatchLoader
+from cache import TTLCache
 from config import settings
+from feign_clients.http_client import get_http_client
+from resilience import CircuitBreaker, CircuitOpenError, HedgePolicy
+
+
+class UsersServiceUnavailable(Exception):
+    """The Users Service did not answer in time, failed, or its circuit is open."""
 
 
 class UsersClient:
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        profile_cache: Optional[TTLCache] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeout_budget: Optional[float] = None,
+    ):
         # Use Kubernetes service name when running in cluster, localhost for local development
         self.base_url = os.getenv('USERS_SERVICE_URL', 'http://users-service:8000')
-        self.timeout = settings.feign_client_timeout
+        self._http_client = http_client
+        # Profiles rarely change within a chat session, so serve them from
+        # memory; missing profiles are not cached so a new one shows up at once.
+        self.profile_cache = profile_cache or TTLCache(
+            max_size=settings.users_profile_cache_max_size,
+            ttl=settings.users_profile_cache_ttl,
+        )
+        # Cache misses from concurrent requests are fetched together in one
+        # batchGet call instead of one GET per user.
+        self.profile_loader = BatchLoader(
+            self._fetch_user_profiles,
+            max_batch_size=settings.users_profile_batch_max_size,
+        )
+        # A slow or failing Users Service must not stall chat turns: each
+        # attempt gets a short timeout, a slow one is hedged with a second
+        # request, the whole lookup gets `timeout_budget` seconds, and while
+        # the service is down lookups fail fast to a degraded profile.
+        self.hedge_policy = hedge_policy or HedgePolicy(
+            attempt_timeout=settings.users_client_attempt_timeout,
+            quantile=settings.users_client_hedge_quantile,
+            initial_delay=settings.users_client_hedge_initial_delay,
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_threshold=settings.users_client_circuit_failure_threshold,
+            recovery_timeout=settings.users_client_circuit_recovery_timeout,
+        )
+        self.timeout_budget = timeout_budget or settings.users_client_timeout_budget
+        self.degraded = 0
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """The injected client, or the shared pooled one."""
+        return self._http_client or get_http_client()
 
     async def get_user_profile(self, user_id: UUID) -> Optional[Dict[Any, Any]]:
         """
-        Get user profile by user ID from the Users Service.
-        Returns the user profile data if found, None otherwise.
+        Get user profile by user ID, from the profile cache or the Users Service.
+        Returns the profile data if the user has one, None otherwise. If the
+        Users Service is unavailable, returns an empty (degraded) profile so
+        the caller can carry on without the user's details.
+        """
+        key = str(user_id)
+        try:
+            return await self.profile_cache.get_or_load(
+                key, lambda: self.profile_loader.load(key)
+            )
+        except UsersServiceUnavailable as e:
+            # Not cached, so the real profile is used as soon as it is back
+            self.degraded += 1
+            print(f"Users Service unavailable, degraded profile for {user_id}: {e}")
+            return {}
+
+    async def get_user_profiles(
+        self, user_ids: Iterable[UUID]
+    ) -> Dict[str, Optional[Dict[Any, Any]]]:
+        """
+        Get the profiles of several users, keyed by user ID. Cached profiles
+        are served from memory and the rest are fetched in batched calls.
+        """
+        keys = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        profiles = await asyncio.gather(*(self.get_user_profile(key) for key in keys))
+        return dict(zip(keys, profiles))
+
+    def invalidate_user_profile(self, user_id: UUID) -> bool:
+        """Drop a cached profile. Returns whether an entry was cached."""
+        return self.profile_cache.invalidate(str(user_id))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "degraded": self.degraded,
+            "hedging": self.hedge_policy.stats(),
+            "circuit": self.circuit_breaker.stats(),
+        }
+
+    async def _request(
+        self, send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send an idempotent request through the circuit breaker, hedged and
+        within the timeout budget. Raises UsersServiceUnavailable on
+        timeouts, connection errors, 5xx responses and an open circuit.
         """
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                print(f"Fetching user profile")
-                print(f"GET: {self.base_url}/api/users/{user_id}/profile")
 
-                response = await client.get(
+        async def attempt() -> httpx.Response:
+            response = await send()
+            if response.status_code >= 500:
+                raise UsersServiceUnavailable(
+                    f"{response.status_code} - {response.text}"
+                )
+            return response
+
+        try:
+            return await self.circuit_breaker.call(
+                lambda: asyncio.wait_for(
+                    self.hedge_policy.call(attempt), self.timeout_budget
+                )
+            )
+        except UsersServiceUnavailable:
+            raise
+        except (CircuitOpenError, httpx.RequestError, asyncio.TimeoutError) as e:
+            raise UsersServiceUnavailable(str(e) or type(e).__name__) from e
+
+    async def _fetch_user_profile(self, user_id: UUID) -> Optional[Dict[Any, Any]]:
+        """Get user profile by user ID from the Users Service."""
+        try:
+            response = await self._request(
+                lambda: self.http_client.get(
                     f"{self.base_url}/api/users/{user_id}/profile"
                 )
+            )
 
-                if response.status_code == 200:
-                    return response.json()
-                elif response.status_code == 404:
-                    return None
-                else:
-                    # Log error but don't raise exception - let caller handle
-                    print(
-                        f"Error fetching user profile {user_id}: {response.status_code} - {response.text}"
-                    )
-                    return None
-
-            except httpx.RequestError as e:
-                print(f"Request error when fetching user profile {user_id}: {e}")
+            if response.status_code == 200:
+                return response.json().get("profile")
+            elif response.status_code == 404:
                 return None
-            except Exception as e:
-                print(f"Unexpected error when fetching user profile {user_id}: {e}")
+            else:
+                # Log error but don't raise exception - let caller handle
+                print(
+                    f"Error fetching user profile {user_id}: {response.status_code} - {response.text}"
+                )
                 return None
+
+        except UsersServiceUnavailable:
+            raise
+        except Exception as e:
+            print(f"Unexpected error when fetching user profile {user_id}: {e}")
+            return None
+
+    async def _fetch_user_profiles(
+        self, user_ids: List[str]
+    ) -> Dict[str, Optional[Dict[Any, Any]]]:
+        """Get the profiles of a batch of users from the Users Service."""
+        # A lone lookup keeps using the single-profile endpoint
+        if len(user_ids) == 1:
+            return {user_ids[0]: await self._fetch_user_profile(user_ids[0])}
+
+        try:
+            response = await self._request(
+                lambda: self.http_client.post(
+                    f"{self.base_url}/api/users/profiles:batchGet",
+                    json={"user_ids": user_ids},
+                )
+            )
+
+            if response.status_code == 200:
+                return {
+                    profile["user_id"]: profile
+                    for profile in response.json().get("profiles", [])
+                }
+            # Not "no profiles": the batch failed, so no user can be told
+            # their profile is missing
+            raise UsersServiceUnavailable(
+                f"Error fetching {len(user_ids)} user profiles: {response.status_code} - {response.text}"
+            )
+
+        except UsersServiceUnavailable:
+            raise
+        except Exception as e:
+            raise UsersServiceUnavailable(
+                f"Unexpected error when fetching {len(user_ids)} user profiles: {e}"
+            ) from e
@@ -0,0 +1,24 @@
+from typing import Any, Callable, Dict
+from fastapi import APIRouter
+
+# Named callables returning a snapshot of in-process counters and gauges
+_sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, source: Callable[[], Dict[str, Any]]) -> None:
+    """Expose a component's stats under `name` on the /metrics endpoint."""
+    _sources[name] = source
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    """Snapshot every registered metrics source."""
+    return {name: source() for name, source in _sources.items()}
+
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def get_metrics() -> Dict[str, Dict[str, Any]]:
+    """In-process metrics for this service instance."""
+    return collect_metrics()
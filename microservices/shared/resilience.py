@@ -0,0 +1,298 @@
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Retries of transient failures with exponential backoff and full jitter:
+    before retry n the delay is uniform in [0, min(max_delay, base_delay *
+    2**n)], or the server's Retry-After if that is longer. Each call gets at
+    most `max_attempts` attempts and `budget` seconds of waiting between
+    them; a retry that would overrun the budget is not attempted.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        budget: float = 20.0,
+        rng: Callable[[], float] = random.random,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self._rng = rng
+        self._sleep = sleep
+        self.retries = 0
+        self.exhausted = 0
+
+    def backoff(self, retry: int) -> float:
+        """Jittered delay before the given retry (0 for the first one)."""
+        return self._rng() * min(self.max_delay, self.base_delay * 2**retry)
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        is_retryable: Callable[[Exception], bool],
+        retry_after: Callable[[Exception], Optional[float]] = lambda e: None,
+    ) -> Any:
+        """Call `fn`, retrying the exceptions `is_retryable` accepts."""
+        waited = 0.0
+        for attempt in range(self.max_attempts):
+            try:
+                return await fn()
+            except Exception as e:
+                if not is_retryable(e):
+                    raise
+                if attempt + 1 >= self.max_attempts:
+                    self.exhausted += 1
+                    raise
+                delay = max(self.backoff(attempt), retry_after(e) or 0.0)
+                if waited + delay > self.budget:
+                    self.exhausted += 1
+                    raise
+            waited += delay
+            self.retries += 1
+            await self._sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "max_attempts": self.max_attempts,
+            "retries": self.retries,
+            "exhausted": self.exhausted,
+        }
+
+
+class HedgePolicy:
+    """
+    Hedged requests for idempotent calls: if an attempt has not answered
+    after the `quantile` of recent latencies (p95 by default), a second one
+    is sent and whichever succeeds first wins, so one slow backend instance
+    costs about the p95 instead of the timeout. An attempt that fails early
+    is hedged at once. Each attempt gets `attempt_timeout` seconds; the
+    overall deadline is the caller's.
+
+    Until `min_samples` latencies have been seen the delay is
+    `initial_delay`; it never drops below `min_delay`, which bounds the
+    extra load when latencies are uniformly low.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 2,
+        attempt_timeout: float = 1.0,
+        quantile: float = 0.95,
+        initial_delay: float = 0.2,
+        min_delay: float = 0.02,
+        window: int = 200,
+        min_samples: int = 20,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_attempts = max_attempts
+        self.attempt_timeout = attempt_timeout
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self._clock = clock
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.attempt_timeouts = 0
+
+    def hedge_delay(self) -> float:
+        """How long to wait for an attempt before sending the next one."""
+        if len(self._latencies) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            latencies = sorted(self._latencies)
+            delay = latencies[min(len(latencies) - 1, int(len(latencies) * self.quantile))]
+        return min(max(delay, self.min_delay), self.attempt_timeout)
+
+    async def _attempt(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        start = self._clock()
+        try:
+            result = await asyncio.wait_for(fn(), self.attempt_timeout)
+        except asyncio.TimeoutError:
+            self.attempt_timeouts += 1
+            raise
+        self._latencies.append(self._clock() - start)
+        return result
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Call `fn`, hedging slow or failed attempts; raises the last error
+        if every attempt fails."""
+        self.calls += 1
+        pending: Set["asyncio.Future[Any]"] = set()
+        first = None
+        error: Optional[BaseException] = None
+        try:
+            for attempt in range(self.max_attempts):
+                task = asyncio.ensure_future(self._attempt(fn))
+                pending.add(task)
+                if attempt == 0:
+                    first = task
+                else:
+                    self.hedges += 1
+                last = attempt + 1 == self.max_attempts
+                while pending:
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=None if last else self.hedge_delay(),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    errors = [task.exception() for task in done]
+                    for task, task_error in zip(done, errors):
+                        if task_error is None:
+                            if task is not first:
+                                self.hedge_wins += 1
+                            return task.result()
+                        error = task_error
+                    if not last:
+                        # Delay passed or an attempt failed: send another
+                        break
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "hedge_delay_seconds": self.hedge_delay(),
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "attempt_timeouts": self.attempt_timeouts,
+        }
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a dependency is down instead of letting every call wait
+    for its timeout.
+
+    Closed: calls go through; `failure_threshold` consecutive failures open
+    the circuit. Open: calls raise CircuitOpenError at once for
+    `recovery_timeout` seconds. Half-open: up to `half_open_max_calls`
+    trial calls go through; a success closes the circuit again, a failure
+    reopens it. Exceptions `is_failure` rejects (e.g. a bad request the
+    dependency answered) count neither way.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self.consecutive_failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and (
+            self._clock() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        is_failure: Callable[[Exception], bool] = lambda e: True,
+    ) -> Any:
+        """Call `fn` if the circuit allows it, recording the outcome."""
+        state = self.state
+        if state == self.OPEN or (
+            state == self.HALF_OPEN and self._trials >= self.half_open_max_calls
+        ):
+            self.rejected += 1
+            raise CircuitOpenError("Circuit open; failing fast")
+
+        trial = state == self.HALF_OPEN
+        if trial:
+            self._trials += 1
+        try:
+            result = await fn()
+        except Exception as e:
+            if is_failure(e):
+                self._on_failure()
+            elif trial:
+                self._trials -= 1
+            raise
+        except BaseException:
+            if trial:
+                self._trials -= 1
+            raise
+        self._on_success()
+        return result
+
+    def _on_success(self) -> None:
+        self.consecutive_failures = 0
+        self._state = self.CLOSED
+
+    def _on_failure(self) -> None:
+        self.consecutive_failures += 1
+        if (
+            self._state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self._state != self.OPEN:
+                self.opened += 1
+            self._state = self.OPEN
+            self._opened_at = self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the metrics endpoint."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
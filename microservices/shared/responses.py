@@ -0,0 +1,45 @@
+from typing import Any, Dict, Iterable, List, Tuple, Type
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    # asyncpg returns its own uuid.UUID subclass, which orjson doesn't serialize
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson. UUIDs, datetimes and dataclasses are
+    serialized natively, so handlers can return plain dicts of column values
+    without a jsonable_encoder or Pydantic pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def schema_fields(schema: Type[BaseModel]) -> Tuple[str, ...]:
+    """Field names of a response schema, in declaration order."""
+    return tuple(schema.model_fields)
+
+
+def project(row: Any, fields: Tuple[str, ...]) -> Dict[str, Any]:
+    """Copy the given attributes of an ORM row (or any object) into a dict."""
+    return {field: getattr(row, field) for field in fields}
+
+
+def project_all(rows: Iterable[Any], schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    Project rows onto a response schema's fields without validating them.
+    Only use this for rows whose columns already have the schema's types.
+    """
+    fields = schema_fields(schema)
+    return [project(row, fields) for row in rows]